@@ -0,0 +1,106 @@
+"""Benchmark parse_problem against a full BeautifulSoup parse.
+
+Usage: python benchmarks/parse_problem.py [PAGE.html ...]
+
+Saved problem pages can be given as arguments. Without arguments, a page
+shaped like a BOJ problem page is generated. BeautifulSoup must be installed
+to run the reference implementation, which is the parser used before the
+streaming extractor.
+"""
+
+from html import escape
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import re
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from boj_checker.boj_parser import _parse_number, parse_problem  # noqa: E402
+
+
+def parse_problem_bs4(html: str):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    sample_input_tags = soup.find_all(
+        "pre", id=lambda x: x != None and x.startswith("sample-input-")
+    )
+    sample_output_tags = soup.find_all(
+        "pre", id=lambda x: x != None and x.startswith("sample-output-")
+    )
+    sample_key = lambda x: int(re.sub(r"\D", "", x.get("id")))  # noqa: E731
+    sample_inputs = [x.text for x in sorted(sample_input_tags, key=sample_key)]
+    sample_outputs = [x.text for x in sorted(sample_output_tags, key=sample_key)]
+    cells = soup.find("table", id="problem-info").find_all("td")
+    return (
+        list(zip(sample_inputs, sample_outputs)),
+        _parse_number(cells[0].text),
+        int(_parse_number(cells[1].text)),
+    )
+
+
+def generate_page(
+    samples: int = 3, sample_data: Union[List[Tuple[str, str]], None] = None
+) -> str:
+    if sample_data == None:
+        sample_data = [
+            (f"{i} {i + 1}\n<{i}>\n", f"{2 * i + 1}\n") for i in range(1, samples + 1)
+        ]
+    nav = "".join(
+        f'<li><a href="/category/{i}">Category {i}</a></li>\n' for i in range(300)
+    )
+    description = "".join(
+        f"<p>Paragraph {i} with &lt;tags&gt; &amp; entities.</p>\n" for i in range(40)
+    )
+    sample_sections = "".join(
+        f'<div class="col-md-6"><section id="sampleinput{i}">'
+        f'<h2>예제 입력 {i}</h2><pre class="sampledata" id="sample-input-{i}">'
+        f"{escape(sample_input, quote=False)}</pre></section></div>\n"
+        f'<div class="col-md-6"><section id="sampleoutput{i}">'
+        f'<h2>예제 출력 {i}</h2><pre class="sampledata" id="sample-output-{i}">'
+        f"{escape(sample_output, quote=False)}</pre></section></div>\n"
+        for i, (sample_input, sample_output) in enumerate(sample_data, 1)
+    )
+    footer = "".join(
+        f'<script>var data{i} = "{"x" * 200}";</script>\n' for i in range(200)
+    )
+    return (
+        f"<html><head><title>Problem</title></head><body><ul>{nav}</ul>"
+        '<table class="table" id="problem-info"><thead><tr><th>시간 제한</th>'
+        "<th>메모리 제한</th></tr></thead><tbody><tr><td>1 초 </td>"
+        "<td>128 MB</td></tr></tbody></table>"
+        f'<section id="description">{description}</section>'
+        f"{sample_sections}"
+        '<section id="source"><p>Source</p></section>'
+        f"{footer}</body></html>"
+    )
+
+
+def main(args):
+    if args:
+        pages = [(x, Path(x).read_text()) for x in args]
+    else:
+        pages = [
+            ("generated (3 samples)", generate_page()),
+            ("generated (12 samples)", generate_page(12)),
+        ]
+    for name, html in pages:
+        problem = parse_problem(0, html)
+        reference = parse_problem_bs4(html)
+        same = (problem.samples, problem.time_limit, problem.memory_limit) == reference
+        print(f"{name}: {len(html)} characters, {len(problem.samples)} samples")
+        if not same:
+            print("  results differ from BeautifulSoup")
+        for label, func in [
+            ("parse_problem", lambda: parse_problem(0, html)),
+            ("BeautifulSoup", lambda: parse_problem_bs4(html)),
+        ]:
+            number, total = timeit.Timer(func).autorange()
+            print(f"  {label}: {total / number * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,18 @@
+#include <stdio.h>
+#include <stdlib.h>
+
+static int compare(const void *a, const void *b) {
+    int x = *(const int *)a, y = *(const int *)b;
+    return (x > y) - (x < y);
+}
+
+int main(void) {
+    int n;
+    scanf("%d", &n);
+    int *xs = malloc(sizeof(int) * n);
+    for (int i = 0; i < n; i++) scanf("%d", &xs[i]);
+    qsort(xs, n, sizeof(int), compare);
+    for (int i = 0; i < n; i++) printf("%d\n", xs[i]);
+    free(xs);
+    return 0;
+}
@@ -0,0 +1,14 @@
+#include <bits/stdc++.h>
+using namespace std;
+
+int main() {
+    ios::sync_with_stdio(false);
+    cin.tie(nullptr);
+    int n;
+    cin >> n;
+    vector<int> xs(n);
+    for (int &x : xs) cin >> x;
+    sort(xs.begin(), xs.end());
+    for (int x : xs) cout << x << '\n';
+    return 0;
+}
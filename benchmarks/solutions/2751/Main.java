@@ -0,0 +1,17 @@
+import java.io.BufferedReader;
+import java.io.InputStreamReader;
+import java.io.IOException;
+import java.util.Arrays;
+
+public class Main {
+    public static void main(String[] args) throws IOException {
+        BufferedReader br = new BufferedReader(new InputStreamReader(System.in));
+        int n = Integer.parseInt(br.readLine().trim());
+        int[] xs = new int[n];
+        for (int i = 0; i < n; i++) xs[i] = Integer.parseInt(br.readLine().trim());
+        Arrays.sort(xs);
+        StringBuilder sb = new StringBuilder();
+        for (int x : xs) sb.append(x).append('\n');
+        System.out.print(sb);
+    }
+}
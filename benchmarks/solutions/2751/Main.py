@@ -0,0 +1,5 @@
+import sys
+
+n, *xs = map(int, sys.stdin.buffer.read().split())
+xs.sort()
+sys.stdout.write("".join(f"{x}\n" for x in xs))
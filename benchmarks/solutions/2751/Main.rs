@@ -0,0 +1,16 @@
+use std::fmt::Write as FmtWrite;
+use std::io::{self, Read, Write};
+
+fn main() {
+    let mut input = String::new();
+    io::stdin().read_to_string(&mut input).unwrap();
+    let mut numbers = input.split_whitespace().map(|x| x.parse::<i32>().unwrap());
+    let n = numbers.next().unwrap() as usize;
+    let mut xs: Vec<i32> = numbers.take(n).collect();
+    xs.sort_unstable();
+    let mut output = String::new();
+    for x in xs {
+        writeln!(output, "{}", x).unwrap();
+    }
+    io::stdout().write_all(output.as_bytes()).unwrap();
+}
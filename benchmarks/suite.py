@@ -0,0 +1,355 @@
+"""End-to-end benchmarks of boj-checker against a local stand-in of BOJ.
+
+Usage: python benchmarks/suite.py [--repeat N] [--filter TEXT] [--save]
+                                  [--baseline FILE] [--threshold FRACTION]
+
+Problem pages recorded in benchmarks/pages, and a page of problem 2751 with a
+large generated sample, are served by a local HTTP server, so no benchmark
+touches the network. The solutions in
+benchmarks/solutions/PROB_ID/Main.EXT are compiled, run and checked for each
+language of `languageinfo.extension_lookup` whose compiler is installed.
+
+Each benchmark is run once to warm up and then --repeat times, and its median
+is reported. With --save the medians are stored as the baseline. Otherwise
+they are compared against the stored baseline, and the exit code is 1 if any
+benchmark got slower by more than the threshold. Baselines depend on the
+machine, so they are not committed.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Union
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = Path(__file__).resolve().parent
+SRC_DIR = ROOT.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from boj_checker.boj_parser import fetch_problem, parse_problem  # noqa: E402
+from parse_problem import generate_page  # noqa: E402
+from boj_checker.languageinfo import extension_lookup  # noqa: E402
+from boj_checker.runner import (  # noqa: E402
+    check_output,
+    compile_source_file,
+    judge,
+    remove_work_dir,
+    run_executable,
+)
+
+PAGES_DIR = ROOT / "pages"
+SOLUTIONS_DIR = ROOT / "solutions"
+DEFAULT_BASELINE = ROOT / "baseline.json"
+# Changes smaller than this many seconds are noise, whatever their ratio.
+MIN_REGRESSION = 0.001
+
+
+class Benchmark(NamedTuple):
+    name: str
+    function: Callable[[], None]
+    # Bytes processed by each call, to report throughput.
+    size: Union[int, None] = None
+
+
+def sorting_page(size: int) -> str:
+    # Problem 2751 sorts distinct numbers of absolute value at most 1,000,000.
+    numbers = random.Random(2751).sample(range(-1000000, 1000001), size)
+    large_sample = (
+        "".join(f"{x}\n" for x in [size] + numbers),
+        "".join(f"{x}\n" for x in sorted(numbers)),
+    )
+    return generate_page(
+        sample_data=[("5\n5\n4\n3\n2\n1\n", "1\n2\n3\n4\n5\n"), large_sample]
+    )
+
+
+def load_pages() -> Dict[int, str]:
+    pages = {int(x.stem): x.read_text() for x in PAGES_DIR.glob("*.html")}
+    pages[2751] = sorting_page(10000)
+    return pages
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    pages: Dict[int, bytes] = dict()
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if (
+            len(parts) != 2
+            or parts[0] != "problem"
+            or not parts[1].isdigit()
+            or int(parts[1]) not in self.pages
+        ):
+            self.send_error(404)
+            return
+        body = self.pages[int(parts[1])]
+        etag = f'"{hashlib.sha256(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in(pages: Dict[int, str]) -> ThreadingHTTPServer:
+    StandInHandler.pages = {x: y.encode("utf-8") for x, y in pages.items()}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def available_solutions(problem_id: int) -> List[Path]:
+    solutions = []
+    for extension, language_config in extension_lookup.items():
+        path = SOLUTIONS_DIR / str(problem_id) / f"Main.{extension}"
+        if not path.is_file():
+            continue
+        commands = [
+            language_config.compile_command_template,
+            language_config.run_command_template,
+        ]
+        programs = [x[0] for x in commands if x and "{" not in x[0]]
+        if all(shutil.which(x) != None for x in programs):
+            solutions.append(path)
+    return solutions
+
+
+def make_benchmarks(
+    pages: Dict[int, str], base_url: str, work_dir: Path
+) -> List[Benchmark]:
+    import requests
+
+    session = requests.Session()
+    benchmarks = []
+    for problem_id in sorted(pages):
+        html = pages[problem_id]
+        problem = parse_problem(problem_id, html)
+        page_size = len(html.encode("utf-8"))
+        benchmarks.append(
+            Benchmark(
+                f"fetch/{problem_id}",
+                lambda x=problem_id: fetch_problem(x, session=session, url=base_url),
+                page_size,
+            )
+        )
+        benchmarks.append(
+            Benchmark(
+                f"parse/{problem_id}",
+                lambda x=problem_id, y=html: parse_problem(x, y),
+                page_size,
+            )
+        )
+        expected = max((x[1] for x in problem.samples), key=len)
+        benchmarks.append(
+            Benchmark(
+                f"compare/{problem_id}",
+                lambda x=expected: check_output(x, x),
+                len(expected.encode("utf-8")),
+            )
+        )
+        for path in available_solutions(problem_id):
+            language = path.suffix[1:]
+            if extension_lookup[language].language_type != "scripted":
+                benchmarks.append(
+                    Benchmark(
+                        f"compile/{problem_id}/{language}",
+                        lambda x=path: remove_work_dir(
+                            compile_source_file(x, dict(), work_dir)
+                        ),
+                    )
+                )
+            benchmarks.append(
+                Benchmark(
+                    f"run/{problem_id}/{language}",
+                    run_samples(path, problem.samples, work_dir),
+                    sum(len(x.encode("utf-8")) for x, _ in problem.samples),
+                )
+            )
+            benchmarks.append(
+                Benchmark(
+                    f"check/{problem_id}/{language}",
+                    check_command(problem_id, path, base_url, work_dir),
+                )
+            )
+    return benchmarks
+
+
+def run_samples(path: Path, samples: list, work_dir: Path) -> Callable[[], None]:
+    executable = None
+
+    def run():
+        nonlocal executable
+        if executable == None:
+            executable = compile_source_file(path, dict(), work_dir)
+        for sample_input, sample_output in samples:
+            result = run_executable(
+                executable, sample_input, solution=sample_output, output_limit=None
+            )
+            verdict = judge(sample_output, result)
+            result.output.close()
+            if verdict != "AC":
+                raise RuntimeError(f"{path} got {verdict}")
+
+    return run
+
+
+def check_command(
+    problem_id: int, path: Path, base_url: str, work_dir: Path
+) -> Callable[[], None]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        x for x in [str(SRC_DIR), env.get("PYTHONPATH")] if x
+    )
+    env["BOJ_CHECKER_BASE_URL"] = base_url
+    env["XDG_CACHE_HOME"] = str(work_dir / "cache")
+    env["NO_COLOR"] = "1"
+    command = [
+        sys.executable,
+        "-m",
+        "boj_checker",
+        str(problem_id),
+        str(path),
+        "--no-config",
+    ]
+
+    def check():
+        process = subprocess.run(
+            command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        output = process.stdout.decode("utf-8", errors="replace")
+        verdicts = [x for x in output.splitlines() if x.startswith("Testing sample")]
+        # A change of the wording must not make the check pass without verdicts.
+        if (
+            process.returncode != 0
+            or not verdicts
+            or not all(": AC " in x for x in verdicts)
+        ):
+            raise RuntimeError(f"Checking {path} failed:\n{output}")
+
+    return check
+
+
+def measure(benchmark: Benchmark, repeat: int) -> float:
+    benchmark.function()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        benchmark.function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def format_result(
+    benchmark: Benchmark, median: float, baseline: Union[float, None]
+) -> str:
+    line = f"{benchmark.name:24} {median * 1000:>9.2f} ms"
+    if benchmark.size != None:
+        line += f" {benchmark.size / median / (1024 * 1024):>9.1f} MB/s"
+    else:
+        line += " " * 15
+    if baseline != None:
+        line += f" {baseline * 1000:>9.2f} ms {(median / baseline - 1) * 100:>+7.1f}%"
+    return line
+
+
+def main(args: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measured runs")
+    parser.add_argument(
+        "--filter", type=str, help="Only run benchmarks whose names contain this"
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Store the results as the baseline"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=str(DEFAULT_BASELINE),
+        help="The path of the baseline file",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Slowdown, as a fraction of the baseline, counted as a regression",
+    )
+    parsed_args = parser.parse_args(args)
+    baseline_path = Path(parsed_args.baseline)
+    baseline: Dict[str, float] = dict()
+    if not parsed_args.save and baseline_path.is_file():
+        with open(baseline_path) as f:
+            baseline = json.load(f)["benchmarks"]
+
+    pages = load_pages()
+    server = start_stand_in(pages)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    results: Dict[str, float] = dict()
+    regressions = []
+    header = f"{'benchmark':24} {'median':>12} {'throughput':>14}"
+    if baseline:
+        print(f"{header} {'baseline':>12} {'change':>8}")
+    else:
+        print(header)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for benchmark in make_benchmarks(pages, base_url, Path(temp_dir)):
+            if parsed_args.filter != None and parsed_args.filter not in benchmark.name:
+                continue
+            median = measure(benchmark, max(parsed_args.repeat, 1))
+            results[benchmark.name] = median
+            previous = baseline.get(benchmark.name)
+            print(format_result(benchmark, median, previous), flush=True)
+            if (
+                previous != None
+                and median > previous * (1 + parsed_args.threshold)
+                and median - previous > MIN_REGRESSION
+            ):
+                regressions.append(benchmark.name)
+    server.shutdown()
+
+    if parsed_args.save:
+        with open(baseline_path, "w") as f:
+            json.dump(
+                {
+                    "machine": platform.platform(),
+                    "python": platform.python_version(),
+                    "benchmarks": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"Saved baseline to {baseline_path}")
+    elif not baseline:
+        print(f"No baseline at {baseline_path}, run with --save to store one")
+    if regressions:
+        print(
+            f"Regressions beyond {parsed_args.threshold * 100:g}%: "
+            f"{', '.join(regressions)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,8 +1,19 @@
 """BOJ checker -- check solutions against IO samples"""
 __version__ = "1.0.0b3"
-from .cli import main
 import sys
 
 
+def __getattr__(name: str):
+    # The CLI is imported on first use, so that using the other modules as a
+    # library does not pay for its imports.
+    if name == "main":
+        from .cli import main
+
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def entry():
+    from .cli import main
+
     exit(main(sys.argv[1:]))
@@ -0,0 +1,307 @@
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Collection, Dict, List, NamedTuple, Union
+
+from .boj_parser import Problem, fetch_problem
+from .cache import ArtifactCache, SampleCache
+from .check import attach_fork_server, make_plan, output_diff, run_check
+from .config import CheckerConfig, LanguageConfig
+from .forkserver import ForkServer
+from .history import RunHistory, language_config_key
+from .report import check_report
+from .runner import (
+    DEFAULT_OUTPUT_LIMIT,
+    compile_source_file,
+    hash_file,
+    lookup_language_config,
+    remove_work_dir,
+)
+
+import os
+import sqlite3
+import threading
+
+
+class BatchJob(NamedTuple):
+    """A solution to check in a batch.
+
+    Attributes
+    ----------
+    problem_id : int
+        The ID of the problem.
+    source : pathlib.Path
+        The path of the solution.
+    """
+
+    problem_id: int
+    source: Path
+
+
+def read_manifest(path: Path) -> List[BatchJob]:
+    """Read the solutions to check from a manifest.
+
+    Each line of a manifest holds a problem ID and the path of a solution,
+    relative to the manifest, separated by whitespace. Empty lines and lines
+    starting with "#" are skipped.
+
+    Parameters
+    ----------
+    path
+        The path of the manifest.
+
+    Returns
+    -------
+    List[BatchJob]
+        The solutions, in the order of the manifest.
+
+    Raises
+    ------
+    ValueError
+        If a line is not a problem ID followed by a path.
+    """
+    jobs = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split(None, 1)
+            if len(fields) != 2 or not fields[0].isdigit():
+                raise ValueError(f"{path}:{number}: expected PROB_ID PATH")
+            jobs.append(BatchJob(int(fields[0]), path.parent / fields[1].strip()))
+    return jobs
+
+
+def discover_jobs(root: Path, extensions: Collection[str]) -> List[BatchJob]:
+    """Find solutions laid out as PROB_ID/FILE under a directory.
+
+    Parameters
+    ----------
+    root
+        The directory to search, at any depth. It may be a problem directory
+        itself.
+    extensions
+        Extensions of the files to check, without the leading dot.
+
+    Returns
+    -------
+    List[BatchJob]
+        The solutions, sorted by path.
+    """
+    jobs = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        directory = Path(dirpath)
+        if not directory.name.isdigit():
+            continue
+        for filename in sorted(filenames):
+            if filename.rpartition(".")[2] in extensions and "." in filename:
+                jobs.append(BatchJob(int(directory.name), directory / filename))
+    return jobs
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    config: CheckerConfig,
+    workers: int = os.cpu_count() or 1,
+    sample_cache: Union[SampleCache, None] = None,
+    offline: bool = False,
+    temp_dir: Union[Path, None] = None,
+    artifact_cache: Union[ArtifactCache, None] = None,
+    pch_cache: Union[ArtifactCache, None] = None,
+    use_fork_server: bool = False,
+    use_limits: bool = True,
+    output_limit: Union[int, None] = DEFAULT_OUTPUT_LIMIT,
+    diff_context: Union[int, None] = 3,
+    history: Union[RunHistory, None] = None,
+    progress: Union[Callable[[BatchJob, dict], None], None] = None,
+) -> List[dict]:
+    """Check many solutions, sharing a pool of workers.
+
+    Each problem is fetched once, over one HTTP session, before the solutions
+    are compiled and run. Every worker compiles and runs one solution at a
+    time, so at most `workers` compilers or solutions run at once.
+
+    Parameters
+    ----------
+    jobs
+        The solutions to check.
+    config
+        The loaded config.
+    workers
+        Number of solutions checked at once.
+    sample_cache
+        Passed to `fetch_problem`.
+    offline
+        Passed to `fetch_problem`.
+    temp_dir
+        Passed to `compile_source_file`.
+    artifact_cache
+        Passed to `compile_source_file`.
+    pch_cache
+        Passed to `compile_source_file`.
+    use_fork_server
+        If set to True, run Python solutions with fork servers, shared by all
+        solutions and closed at the end.
+    use_limits
+        If set to False, do not enforce the limits of the problems.
+    output_limit
+        Number of bytes of output after which each run is killed.
+    diff_context
+        Number of matching lines to show around differences on WA, or `None`
+        for no diffs.
+    history
+        The run history to record each check in. Defaults to `None`, which
+        records nothing. Failures to write the history are ignored.
+    progress
+        Called with each job and its report as soon as it is checked, in the
+        calling thread.
+
+    Returns
+    -------
+    List[dict]
+        The report of each solution as returned by `check_report`, in the
+        order of `jobs`.
+    """
+    import requests
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    fork_servers: Dict[str, ForkServer] = dict()
+    fork_server_lock = threading.Lock()
+
+    def record(
+        job: BatchJob,
+        language_config: LanguageConfig,
+        cases: List[dict],
+        compiled: bool = True,
+    ):
+        if history == None:
+            return
+        try:
+            history.record(
+                job.problem_id,
+                job.source,
+                hash_file(job.source),
+                language_config_key(language_config),
+                cases,
+                compiled,
+            )
+        except (OSError, sqlite3.Error):
+            pass
+
+    def check(job: BatchJob, problem_future: "Future[Problem]") -> dict:
+        try:
+            language_config = lookup_language_config(
+                job.source, config.languageconfig_table
+            )
+        except NotImplementedError:
+            return check_report(
+                job.problem_id, job.source, None, None, [], "Unknown language"
+            )
+        try:
+            executable = compile_source_file(
+                job.source,
+                config.languageconfig_table,
+                temp_dir,
+                artifact_cache,
+                pch_cache,
+            )
+        except ValueError:
+            record(job, language_config, [], compiled=False)
+            return check_report(
+                job.problem_id, job.source, None, None, [], "Compilation Error"
+            )
+        except OSError as error:
+            # Such as a missing source, or a compiler that is not installed.
+            return check_report(
+                job.problem_id,
+                job.source,
+                None,
+                None,
+                [],
+                f"Could not compile the solution: {error}",
+            )
+        try:
+            try:
+                problem = problem_future.result()
+            except LookupError:
+                return check_report(
+                    job.problem_id,
+                    job.source,
+                    None,
+                    None,
+                    [],
+                    f"Samples of problem {job.problem_id} are not cached",
+                )
+            except requests.RequestException:
+                return check_report(
+                    job.problem_id,
+                    job.source,
+                    None,
+                    None,
+                    [],
+                    f"Could not fetch problem {job.problem_id}",
+                )
+            plan = make_plan(problem, executable, language_config, None, use_limits)
+            if use_fork_server:
+                with fork_server_lock:
+                    try:
+                        plan = plan._replace(
+                            executable=attach_fork_server(executable, fork_servers)
+                        )
+                    except OSError:
+                        pass
+            cases = []
+            try:
+                for case_result in run_check(plan, output_limit=output_limit):
+                    case, result, verdict = case_result
+                    diff = None
+                    if verdict == "WA" and diff_context != None:
+                        diff = list(output_diff(result.output, case.output, diff_context))  # type: ignore
+                    result.output.close()
+                    cases.append(dict(case_result.todict(), diff=diff))
+            except OSError as error:
+                return check_report(
+                    job.problem_id,
+                    job.source,
+                    plan.time_limit,
+                    plan.memory_limit,
+                    cases,
+                    f"Could not run the solution: {error}",
+                )
+        finally:
+            remove_work_dir(executable)
+        record(job, language_config, cases)
+        return check_report(
+            job.problem_id, job.source, plan.time_limit, plan.memory_limit, cases
+        )
+
+    reports: List[Union[dict, None]] = [None] * len(jobs)
+    with session, ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        # Fetches are queued before the checks waiting for them, so that the
+        # workers never all wait for a fetch that has not started.
+        problem_futures: Dict[int, "Future[Problem]"] = dict()
+        for job in jobs:
+            if job.problem_id not in problem_futures:
+                problem_futures[job.problem_id] = executor.submit(
+                    fetch_problem, job.problem_id, sample_cache, offline, session
+                )
+        futures = {
+            executor.submit(check, x, problem_futures[x.problem_id]): i
+            for i, x in enumerate(jobs)
+        }
+        try:
+            for future in as_completed(futures):
+                i = futures[future]
+                reports[i] = future.result()
+                if progress != None:
+                    progress(jobs[i], reports[i])  # type: ignore
+        finally:
+            for future in futures:
+                future.cancel()
+            for fork_server in fork_servers.values():
+                fork_server.close()
+    return reports  # type: ignore
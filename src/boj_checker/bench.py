@@ -0,0 +1,268 @@
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Tuple, Union
+
+from .runner import Executable, run_executable
+from .stress import with_arguments
+
+import math
+import tempfile
+
+COMPLEXITY_CLASSES: List[Tuple[str, Callable[[float], float]]] = [
+    ("O(log N)", lambda n: math.log2(n)),
+    ("O(sqrt N)", lambda n: math.sqrt(n)),
+    ("O(N)", lambda n: n),
+    ("O(N log N)", lambda n: n * math.log2(n)),
+    ("O(N sqrt N)", lambda n: n * math.sqrt(n)),
+    ("O(N^2)", lambda n: n * n),
+    ("O(N^2 log N)", lambda n: n * n * math.log2(n)),
+    ("O(N^3)", lambda n: n * n * n),
+]
+
+
+class BenchPoint(NamedTuple):
+    """The timings of a solution on an input of one size.
+
+    Attributes
+    ----------
+    n : int
+        The size passed to the generator.
+    times : List[float]
+        Wall time of each measured run in seconds, excluding warmups.
+    max_rss : int
+        Peak resident set size over the runs, in KiB.
+    verdict : str
+        "OK" if every run succeeded, or "RTE" or "TLE" for the first run that
+        did not. "GEN" means that the generator failed.
+    """
+
+    n: int
+    times: List[float]
+    max_rss: int
+    verdict: str
+
+    @property
+    def median_time(self) -> float:
+        """The median run, in seconds."""
+        import statistics
+
+        return statistics.median(self.times)
+
+
+class ComplexityFit(NamedTuple):
+    """Timings fitted to `constant + coefficient * f(N)`.
+
+    Attributes
+    ----------
+    name : str
+        The complexity class of `f`, such as "O(N log N)".
+    function : Callable[[float], float]
+        The function `f`.
+    constant : float
+        The time not depending on N, such as the startup of an interpreter.
+    coefficient : float
+        The time per unit of `f(N)`.
+    error : float
+        Root mean square of the relative errors of the fit.
+    """
+
+    name: str
+    function: Callable[[float], float]
+    constant: float
+    coefficient: float
+    error: float
+
+    def predict(self, n: int) -> float:
+        """Predict the time for a size.
+
+        Parameters
+        ----------
+        n
+            The size.
+
+        Returns
+        -------
+        float
+            The predicted time, in seconds.
+        """
+        return self.constant + self.coefficient * self.function(n)
+
+
+def geometric_sizes(min_n: int, max_n: int, factor: float = 2) -> List[int]:
+    """Make a geometric series of sizes.
+
+    Parameters
+    ----------
+    min_n
+        The first size.
+    max_n
+        The largest size, always included.
+    factor
+        The ratio between consecutive sizes. Must be greater than 1.
+
+    Returns
+    -------
+    List[int]
+        Increasing sizes from `min_n` to `max_n`.
+    """
+    sizes = []
+    n = float(min_n)
+    while n < max_n:
+        if not sizes or round(n) > sizes[-1]:
+            sizes.append(round(n))
+        n *= factor
+    if not sizes or sizes[-1] != max_n:
+        sizes.append(max_n)
+    return sizes
+
+
+def _fit(
+    points: List[Tuple[float, float]], function: Callable[[float], float]
+) -> Tuple[float, float, float]:
+    # Weighted least squares of t = a + b * f(n) with weights 1 / t^2, which
+    # minimizes relative errors so that small sizes count as much as large
+    # ones. Both a and b are kept non-negative.
+    weights = [1 / max(t, 1e-9) ** 2 for _, t in points]
+    xs = [function(n) for n, _ in points]
+    ts = [t for _, t in points]
+    sw = sum(weights)
+    sx = sum(w * x for w, x in zip(weights, xs))
+    sxx = sum(w * x * x for w, x in zip(weights, xs))
+    st = sum(w * t for w, t in zip(weights, ts))
+    sxt = sum(w * x * t for w, x, t in zip(weights, xs, ts))
+    determinant = sw * sxx - sx * sx
+    if determinant > 0:
+        a = (sxx * st - sx * sxt) / determinant
+        b = (sw * sxt - sx * st) / determinant
+    else:
+        a, b = (-1.0, -1.0)
+    if a < 0 or b < 0:
+        candidates = [(0.0, sxt / sxx if sxx > 0 else 0.0), (st / sw, 0.0)]
+    else:
+        candidates = [(a, b)]
+    best = None
+    for a, b in candidates:
+        b = max(b, 0.0)
+        error = math.sqrt(
+            sum(((a + b * x) / t - 1) ** 2 for x, t in zip(xs, ts)) / len(ts)
+        )
+        if best == None or error < best[2]:
+            best = (a, b, error)
+    return best  # type: ignore
+
+
+def fit_complexity(points: List[BenchPoint]) -> List[ComplexityFit]:
+    """Fit timings to common complexity classes.
+
+    Parameters
+    ----------
+    points
+        Timings of successful runs, at no fewer than three sizes for a
+        meaningful fit.
+
+    Returns
+    -------
+    List[ComplexityFit]
+        A fit for each class in `COMPLEXITY_CLASSES`, best first.
+    """
+    data = [(float(x.n), x.median_time) for x in points]
+    fits = []
+    for name, function in COMPLEXITY_CLASSES:
+        constant, coefficient, error = _fit(data, function)
+        fits.append(ComplexityFit(name, function, constant, coefficient, error))
+    return sorted(fits, key=lambda x: x.error)
+
+
+def bench(
+    generator: Executable,
+    solution: Executable,
+    sizes: List[int],
+    warmup: int = 1,
+    repeat: int = 5,
+    run_limit: Union[float, None] = 10,
+    stop_time: Union[float, None] = None,
+    progress: Union[Callable[[BenchPoint], None], None] = None,
+) -> List[BenchPoint]:
+    """Time a solution on generated inputs of increasing sizes.
+
+    Parameters
+    ----------
+    generator
+        The generator. It is run with a size as its only argument, and its
+        output is used as the input.
+    solution
+        The solution to time.
+    sizes
+        The sizes to pass to the generator, in increasing order.
+    warmup
+        Number of runs at each size that are not measured, which fill the page
+        cache and CPU caches.
+    repeat
+        Number of measured runs at each size.
+    run_limit
+        Number of seconds after which each run is killed.
+    stop_time
+        Skip larger sizes once the median run at a size takes longer than this
+        many seconds. Defaults to `None`, which runs all sizes.
+    progress
+        Called with the result of each size.
+
+    Returns
+    -------
+    List[BenchPoint]
+        The timings at each size, up to the first size whose runs failed.
+    """
+    points = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = Path(temp_dir) / "input"
+        for n in sizes:
+            generated = run_executable(
+                with_arguments(generator, [str(n)]),
+                "",
+                run_limit,
+                output_limit=None,
+                discard_stderr=True,
+            )
+            if generated.exit_code != 0 or generated.timed_out:
+                generated.output.close()
+                point = BenchPoint(n, [], 0, "GEN")
+            else:
+                with open(input_path, "wb") as f:
+                    for line in generated.output.lines():
+                        f.write(line.encode("utf-8") + b"\n")
+                generated.output.close()
+                point = _time_solution(
+                    solution, n, input_path, warmup, repeat, run_limit
+                )
+            points.append(point)
+            if progress != None:
+                progress(point)
+            if point.verdict != "OK" or (
+                stop_time != None and point.median_time > stop_time
+            ):
+                break
+    return points
+
+
+def _time_solution(
+    solution: Executable,
+    n: int,
+    input_path: Path,
+    warmup: int,
+    repeat: int,
+    run_limit: Union[float, None],
+) -> BenchPoint:
+    times = []
+    max_rss = 0
+    for i in range(warmup + repeat):
+        result = run_executable(
+            solution, input_path, run_limit, output_limit=None, discard_stderr=True
+        )
+        result.output.close()
+        if result.timed_out:
+            return BenchPoint(n, times, max_rss, "TLE")
+        if result.exit_code != 0:
+            return BenchPoint(n, times, max_rss, "RTE")
+        max_rss = max(max_rss, result.max_rss)
+        if i >= warmup:
+            times.append(result.wall_time)
+    return BenchPoint(n, times, max_rss, "OK")
@@ -1,30 +1,296 @@
-from typing import List, Tuple
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Tuple, Union
 
-import requests
+from .cache import SampleCache, SampleCacheEntry
+from .tracing import span
 
+import os
+import re
 
-def fetch_sample_io(problem_id: int) -> List[Tuple[str, str]]:
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_BASE_URL = "https://www.acmicpc.net"
+
+
+def base_url() -> str:
+    """Find the base URL of BOJ to fetch problems from.
+
+    Returns
+    -------
+    str
+        The value of `BOJ_CHECKER_BASE_URL` if it is set, so that problems can
+        be served by a local stand-in, or `DEFAULT_BASE_URL` otherwise.
+    """
+    return os.getenv("BOJ_CHECKER_BASE_URL") or DEFAULT_BASE_URL
+
+
+class Problem(NamedTuple):
+    """A BOJ problem, as much as needed to check solutions.
+
+    Attributes
+    ----------
+    problem_id : int
+        The ID of the problem.
+    samples : List[Tuple[str, str]]
+        List of input/output pairs.
+    time_limit : Union[float, None]
+        The time limit in seconds, or `None` if unknown.
+    memory_limit : Union[int, None]
+        The memory limit in MB, or `None` if unknown.
+    extra_time : bool
+        False if the problem is marked as giving no extra time to slower
+        languages.
+    """
+
+    problem_id: int
+    samples: List[Tuple[str, str]]
+    time_limit: Union[float, None]
+    memory_limit: Union[int, None]
+    extra_time: bool
+
+
+def _parse_number(text: str) -> Union[float, None]:
+    match = re.search(r"\d+(\.\d+)?", text)
+    if match == None:
+        return None
+    return float(match.group())  # type: ignore
+
+
+class _ProblemExtractor(HTMLParser):
+    """Collect sample IO and the problem info table from a problem page.
+
+    Only the text of `pre#sample-input-N`, `pre#sample-output-N` and the cells
+    of `table#problem-info` is kept. `done` is set at the first section
+    following the samples, after which the rest of the page can be skipped.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sample_inputs: Dict[int, str] = dict()
+        self.sample_outputs: Dict[int, str] = dict()
+        self.info_cells: List[str] = []
+        self.done = False
+        self._in_info_table = False
+        self._text: Union[List[str], None] = None
+        self._sample: Union[Tuple[Dict[int, str], int], None] = None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Union[str, None]]]):
+        element_id = dict(attrs).get("id") or ""
+        if tag == "pre":
+            match = re.fullmatch(r"sample-(input|output)-(\d+)", element_id)
+            if match != None:
+                if match.group(1) == "input":
+                    samples = self.sample_inputs
+                else:
+                    samples = self.sample_outputs
+                self._sample = (samples, int(match.group(2)))
+                self._text = []
+        elif tag == "table" and element_id == "problem-info":
+            self._in_info_table = True
+        elif tag == "td" and self._in_info_table:
+            self._text = []
+        elif (
+            tag == "section"
+            and self.sample_inputs
+            and not element_id.startswith("sample")
+        ):
+            self.done = True
+
+    def handle_endtag(self, tag: str):
+        if self._text == None:
+            if tag == "table":
+                self._in_info_table = False
+            return
+        if tag == "pre" and self._sample != None:
+            samples, number = self._sample
+            samples[number] = "".join(self._text)
+            self._sample = None
+            self._text = None
+        elif tag == "td" and self._sample == None:
+            self.info_cells.append("".join(self._text))
+            self._text = None
+
+    def handle_data(self, data: str):
+        if self._text != None:
+            self._text.append(data)
+
+
+def parse_problem(problem_id: int, html: str, chunk_size: int = 16384) -> Problem:
+    """Extract sample IO and limits from the HTML of a BOJ problem page
+
+    Parsing starts at the problem info table, skipping the navigation before
+    it, and stops once the samples have been passed.
+
+    Parameters
+    ----------
+    problem_id
+        The ID of the problem.
+    html
+        The content of the problem page.
+    chunk_size
+        Number of characters parsed at once.
+
+    Returns
+    -------
+    Problem
+        The parsed problem.
+    """
+    extractor = _ProblemExtractor()
+    info_start = html.find('id="problem-info"')
+    start = max(html.rfind("<", 0, info_start), 0) if info_start != -1 else 0
+    for i in range(start, len(html), chunk_size):
+        extractor.feed(html[i : i + chunk_size])
+        if extractor.done:
+            break
+    else:
+        extractor.close()
+    samples = [
+        (extractor.sample_inputs[x], extractor.sample_outputs[x])
+        for x in sorted(extractor.sample_inputs)
+        if x in extractor.sample_outputs
+    ]
+
+    time_limit = None
+    memory_limit = None
+    extra_time = True
+    cells = extractor.info_cells
+    if len(cells) >= 2:
+        time_limit = _parse_number(cells[0])
+        memory = _parse_number(cells[1])
+        memory_limit = int(memory) if memory != None else None
+        extra_time = "추가 시간 없음" not in cells[0]
+    return Problem(problem_id, samples, time_limit, memory_limit, extra_time)
+
+
+def _problem_from_cache(problem_id: int, entry: SampleCacheEntry) -> Problem:
+    return Problem(
+        problem_id,
+        entry.samples,
+        entry.time_limit,
+        entry.memory_limit,
+        entry.extra_time,
+    )
+
+
+def fetch_problem(
+    problem_id: int,
+    cache: Union[SampleCache, None] = None,
+    offline: bool = False,
+    session: Union["requests.Session", None] = None,
+    revalidate: bool = False,
+    url: Union[str, None] = None,
+) -> Problem:
+    """Fetch sample IO and limits of a problem from BOJ website
+
+    Parameters
+    ----------
+    problem_id
+        The ID of the problem to fetch.
+    cache
+        The sample cache to look up and update. Defaults to `None`, which
+        disables caching.
+    offline
+        If set to True, never touch the network and use the cached problem
+        regardless of its age.
+    session
+        The HTTP session to send the request with, so that connections are
+        reused across calls. Defaults to `None`, which uses a new connection.
+    revalidate
+        If set to True, check the cached problem for updates even if it is
+        fresh. Ignored if `offline` is set.
+    url
+        The base URL of BOJ. Defaults to `None`, which uses `base_url`.
+
+    Returns
+    -------
+    Problem
+        The fetched problem.
+
+    Raises
+    ------
+    LookupError
+        If `offline` is set and the problem is not in the cache.
+    requests.RequestException
+        If the problem cannot be fetched, such as on an error response from
+        BOJ, and it is not in the cache.
+    """
+    with span("sample cache", "boj_parser", problem_id=problem_id):
+        entry = cache.get(problem_id) if cache != None else None
+    if entry != None and (
+        offline or (not revalidate and cache.is_fresh(entry))  # type: ignore
+    ):
+        return _problem_from_cache(problem_id, entry)
+    if offline:
+        raise LookupError(f"Samples of problem {problem_id} are not cached")
+
+    import requests
+
+    if url == None:
+        url = base_url()
+    headers = dict()
+    if entry != None:
+        if entry.etag != None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified != None:
+            headers["If-Modified-Since"] = entry.last_modified
+    try:
+        with span("fetch", "boj_parser", problem_id=problem_id):
+            req = (session if session != None else requests).get(
+                f"{url.rstrip('/')}/problem/{problem_id}", headers=headers
+            )
+    except requests.RequestException:
+        if entry == None:
+            raise
+        return _problem_from_cache(problem_id, entry)
+    if req.status_code == 304 and entry != None:
+        cache.touch(problem_id)  # type: ignore
+        return _problem_from_cache(problem_id, entry)
+    if not req.ok:
+        # Error pages have no samples, so a stale cached problem is better.
+        if entry != None:
+            return _problem_from_cache(problem_id, entry)
+        req.raise_for_status()
+
+    with span("parse", "boj_parser", problem_id=problem_id):
+        problem = parse_problem(problem_id, req.text)
+    if cache != None:
+        cache.put(
+            problem_id,
+            problem.samples,
+            req.headers.get("ETag"),
+            req.headers.get("Last-Modified"),
+            problem.time_limit,
+            problem.memory_limit,
+            problem.extra_time,
+        )
+    return problem
+
+
+def fetch_sample_io(
+    problem_id: int, cache: Union[SampleCache, None] = None, offline: bool = False
+) -> List[Tuple[str, str]]:
     """Fetch sample IO from BOJ website
 
     Parameters
     ----------
     problem_id
         The ID of the problem to get samples from.
+    cache
+        The sample cache to look up and update. Defaults to `None`, which
+        disables caching.
+    offline
+        If set to True, never touch the network and use the cached samples
+        regardless of their age.
 
     Returns
     -------
     List[Tuple[str, str]]
         List of input/output pairs.
+
+    Raises
+    ------
+    LookupError
+        If `offline` is set and the samples are not in the cache.
     """
-    req = requests.get(f"https://www.acmicpc.net/problem/{problem_id}")
-    soup = BeautifulSoup(req.text, "html.parser")
-    sample_input_tags = soup.find_all(
-        "pre", id=lambda x: x != None and x.startswith("sample-input-")
-    )
-    sample_output_tags = soup.find_all(
-        "pre", id=lambda x: x != None and x.startswith("sample-output-")
-    )
-    sample_inputs = [x.text for x in sorted(sample_input_tags, key=lambda x: x.get("id"))]  # type: ignore
-    sample_outputs = [x.text for x in sorted(sample_output_tags, key=lambda x: x.get("id"))]  # type: ignore
-    return list(zip(sample_inputs, sample_outputs))
+    return fetch_problem(problem_id, cache, offline).samples
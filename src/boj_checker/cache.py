@@ -0,0 +1,459 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, List, NamedTuple, Tuple, Union
+from xdg import BaseDirectory
+
+from .config import (
+    DEFAULT_ARTIFACT_CACHE_SIZE,
+    DEFAULT_PCH_CACHE_SIZE,
+    DEFAULT_SAMPLE_TTL,
+)
+
+import fcntl
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+
+class SampleCacheEntry(NamedTuple):
+    """A cached set of samples for a problem.
+
+    Attributes
+    ----------
+    samples : List[Tuple[str, str]]
+        List of input/output pairs.
+    etag : Union[str, None]
+        The `ETag` header of the problem page, if the server sent one.
+    last_modified : Union[str, None]
+        The `Last-Modified` header of the problem page, if the server sent one.
+    fetched_at : float
+        UNIX timestamp of the last time the entry was validated against the
+        server.
+    time_limit : Union[float, None]
+        The time limit of the problem in seconds, if known.
+    memory_limit : Union[int, None]
+        The memory limit of the problem in MB, if known.
+    extra_time : bool
+        False if the problem gives no extra time to slower languages.
+    """
+
+    samples: List[Tuple[str, str]]
+    etag: Union[str, None]
+    last_modified: Union[str, None]
+    fetched_at: float
+    time_limit: Union[float, None] = None
+    memory_limit: Union[int, None] = None
+    extra_time: bool = True
+
+
+def cache_dir_root() -> Path:
+    """Fetch the location of the cache directory according to XDG standard.
+
+    Returns
+    -------
+    pathlib.Path
+        Path object of cache directory
+    """
+    return Path(BaseDirectory.save_cache_path("boj-checker"))
+
+
+class SampleCache:
+    """On-disk store of sample IO, keyed by problem ID.
+
+    An object can be shared between threads.
+
+    Attributes
+    ----------
+    db_path : pathlib.Path
+        Path of the SQLite database backing the cache.
+    ttl : float
+        Number of seconds an entry is considered fresh. Stale entries are
+        revalidated with a conditional request before being used.
+    """
+
+    def __init__(self, db_path: Path, ttl: float = DEFAULT_SAMPLE_TTL):
+        """Create SampleCache object.
+
+        Parameters
+        ----------
+        db_path
+            Path of the SQLite database. Created if it does not exist.
+        ttl
+            Number of seconds an entry is considered fresh.
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS samples ("
+            "problem_id INTEGER PRIMARY KEY, "
+            "samples TEXT NOT NULL, "
+            "etag TEXT, "
+            "last_modified TEXT, "
+            "fetched_at REAL NOT NULL, "
+            "time_limit REAL, "
+            "memory_limit INTEGER, "
+            "extra_time INTEGER NOT NULL DEFAULT 1)"
+        )
+        columns = [x[1] for x in self._connection.execute("PRAGMA table_info(samples)")]
+        if "time_limit" not in columns:
+            # Databases created before limits were stored
+            self._connection.execute("ALTER TABLE samples ADD COLUMN time_limit REAL")
+            self._connection.execute(
+                "ALTER TABLE samples ADD COLUMN memory_limit INTEGER"
+            )
+            self._connection.execute(
+                "ALTER TABLE samples ADD COLUMN extra_time INTEGER NOT NULL DEFAULT 1"
+            )
+        self._connection.commit()
+
+    @classmethod
+    def fromdefault(cls, ttl: float = DEFAULT_SAMPLE_TTL) -> "SampleCache":
+        """Create SampleCache located in the XDG cache directory.
+
+        Parameters
+        ----------
+        ttl
+            Number of seconds an entry is considered fresh.
+
+        Returns
+        -------
+        SampleCache
+            Created object.
+        """
+        return cls(cache_dir_root() / "samples.db", ttl)
+
+    def get(self, problem_id: int) -> Union[SampleCacheEntry, None]:
+        """Look up the cached samples of a problem.
+
+        Parameters
+        ----------
+        problem_id
+            The ID of the problem.
+
+        Returns
+        -------
+        Union[SampleCacheEntry, None]
+            The cached entry, or `None` if the problem is not cached.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT samples, etag, last_modified, fetched_at, time_limit, "
+                "memory_limit, extra_time FROM samples WHERE problem_id = ?",
+                (problem_id,),
+            ).fetchone()
+        if row == None:
+            return None
+        samples = [(x[0], x[1]) for x in json.loads(row[0])]
+        return SampleCacheEntry(
+            samples, row[1], row[2], row[3], row[4], row[5], bool(row[6])
+        )
+
+    def put(
+        self,
+        problem_id: int,
+        samples: List[Tuple[str, str]],
+        etag: Union[str, None] = None,
+        last_modified: Union[str, None] = None,
+        time_limit: Union[float, None] = None,
+        memory_limit: Union[int, None] = None,
+        extra_time: bool = True,
+    ):
+        """Store the samples of a problem, replacing any existing entry.
+
+        Parameters
+        ----------
+        problem_id
+            The ID of the problem.
+        samples
+            List of input/output pairs.
+        etag
+            The `ETag` header of the response.
+        last_modified
+            The `Last-Modified` header of the response.
+        time_limit
+            The time limit of the problem in seconds.
+        memory_limit
+            The memory limit of the problem in MB.
+        extra_time
+            False if the problem gives no extra time to slower languages.
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO samples "
+                "(problem_id, samples, etag, last_modified, fetched_at, time_limit, "
+                "memory_limit, extra_time) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    problem_id,
+                    json.dumps(samples),
+                    etag,
+                    last_modified,
+                    time.time(),
+                    time_limit,
+                    memory_limit,
+                    int(extra_time),
+                ),
+            )
+            self._connection.commit()
+
+    def touch(self, problem_id: int):
+        """Mark the entry of a problem as freshly validated.
+
+        Parameters
+        ----------
+        problem_id
+            The ID of the problem.
+        """
+        with self._lock:
+            self._connection.execute(
+                "UPDATE samples SET fetched_at = ? WHERE problem_id = ?",
+                (time.time(), problem_id),
+            )
+            self._connection.commit()
+
+    def is_fresh(self, entry: SampleCacheEntry) -> bool:
+        """Check if an entry can be used without revalidation.
+
+        Parameters
+        ----------
+        entry
+            The entry to check.
+
+        Returns
+        -------
+        bool
+            True if the entry is younger than `ttl`.
+        """
+        return time.time() - entry.fetched_at < self.ttl
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def directory_size(path: Path) -> int:
+    """Calculate the total size of files under a directory.
+
+    Parameters
+    ----------
+    path
+        The directory to measure.
+
+    Returns
+    -------
+    int
+        Total size in bytes.
+    """
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except FileNotFoundError:
+                pass
+    return total
+
+
+class ArtifactCache:
+    """Content-addressed store of compilation results.
+
+    Each entry is a directory holding what the compile command produced, named
+    after a key derived from the source, the compile command and the compiler
+    version. Entries are evicted in least recently used order once the total
+    size exceeds `max_size`, except for entries marked as in use by `acquire`.
+
+    Attributes
+    ----------
+    root : pathlib.Path
+        Directory holding the cache entries.
+    max_size : int
+        Maximum total size of the cache, in bytes.
+    """
+
+    def __init__(self, root: Path, max_size: int = DEFAULT_ARTIFACT_CACHE_SIZE):
+        """Create ArtifactCache object.
+
+        Parameters
+        ----------
+        root
+            Directory holding the cache entries. Created if it does not exist.
+        max_size
+            Maximum total size of the cache, in bytes.
+        """
+        self.root = root
+        self.max_size = max_size
+        os.makedirs(root, exist_ok=True)
+
+    @classmethod
+    def fromdefault(
+        cls, max_size: int = DEFAULT_ARTIFACT_CACHE_SIZE, name: str = "artifacts"
+    ) -> "ArtifactCache":
+        """Create ArtifactCache located in the XDG cache directory.
+
+        Parameters
+        ----------
+        max_size
+            Maximum total size of the cache, in bytes.
+        name
+            Name of the directory of the cache in the XDG cache directory.
+
+        Returns
+        -------
+        ArtifactCache
+            Created object.
+        """
+        return cls(cache_dir_root() / name, max_size)
+
+    def lookup(self, key: str) -> Union[Path, None]:
+        """Find the entry for a key, marking it as recently used.
+
+        Parameters
+        ----------
+        key
+            The key of the entry.
+
+        Returns
+        -------
+        Union[pathlib.Path, None]
+            Directory of the entry, or `None` if there is no such entry.
+        """
+        entry_path = self.root / key
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+        return entry_path
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Hold a lock on a key, shared with other processes using the cache.
+
+        Runs missing the same entry take the lock before building it, so only
+        one of them builds it and the others wait and use its result.
+
+        Parameters
+        ----------
+        key
+            The key of the entry.
+        """
+        with _file_lock(self.root / f".lock-{key}"):
+            yield
+
+    def acquire(self, key: str) -> IO:
+        """Mark the entry for a key as in use, so that it is not evicted.
+
+        The mark is shared with other runs and processes, and can be taken
+        before the entry is built.
+
+        Parameters
+        ----------
+        key
+            The key of the entry.
+
+        Returns
+        -------
+        IO
+            An open file holding the mark until it is closed.
+        """
+        use_path = self.root / f".use-{key}"
+        while True:
+            use_file = open(use_path, "a")
+            fcntl.flock(use_file, fcntl.LOCK_SH)
+            # An eviction may have removed the file while this run waited for
+            # the lock, leaving it marking nothing.
+            try:
+                if os.stat(use_path).st_ino == os.fstat(use_file.fileno()).st_ino:
+                    return use_file
+            except FileNotFoundError:
+                pass
+            use_file.close()
+
+    def staging_dir(self) -> Path:
+        """Create an empty directory to build a new entry in.
+
+        Returns
+        -------
+        pathlib.Path
+            Path of the created directory. It should be passed to `store` or
+            removed by the caller.
+        """
+        return Path(tempfile.mkdtemp(prefix=".staging-", dir=self.root))
+
+    def store(self, key: str, build_dir: Path) -> Path:
+        """Move a directory into the cache as the entry for a key.
+
+        Parameters
+        ----------
+        key
+            The key of the entry.
+        build_dir
+            Directory holding the compilation result. It should be on the same
+            filesystem as `root`, e.g. created by `staging_dir`.
+
+        Returns
+        -------
+        pathlib.Path
+            Directory of the entry.
+        """
+        entry_path = self.root / key
+        try:
+            # Renaming publishes the whole directory at once, so runs never see
+            # a partially written entry.
+            os.rename(build_dir, entry_path)
+        except OSError:
+            # Another run stored the same entry first.
+            shutil.rmtree(build_dir, ignore_errors=True)
+        self.evict(keep=key)
+        return entry_path
+
+    def evict(self, keep: Union[str, None] = None):
+        """Remove least recently used entries until the cache fits `max_size`.
+
+        Parameters
+        ----------
+        keep
+            Key of an entry that should never be removed.
+        """
+        # Concurrent evictions would each remove entries for the same excess.
+        with _file_lock(self.root / ".lock"):
+            self._evict(keep)
+
+    def _evict(self, keep: Union[str, None]):
+        entries = []
+        for entry in os.scandir(self.root):
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            entries.append(
+                (entry.stat().st_mtime, entry.name, directory_size(Path(entry.path)))
+            )
+        total = sum(x[2] for x in entries)
+        for _, name, size in sorted(entries):
+            if total <= self.max_size:
+                break
+            if name == keep:
+                continue
+            with open(self.root / f".use-{name}", "a") as use_file:
+                try:
+                    fcntl.flock(use_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                shutil.rmtree(self.root / name, ignore_errors=True)
+                # A run waiting on the removed lock file may build the entry
+                # again alongside another, which `store` tolerates.
+                for lock_name in [f".lock-{name}", f".use-{name}"]:
+                    try:
+                        os.remove(self.root / lock_name)
+                    except FileNotFoundError:
+                        pass
+            total -= size
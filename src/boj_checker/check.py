@@ -0,0 +1,335 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Union
+
+from .boj_parser import Problem, fetch_problem
+from .cache import ArtifactCache, SampleCache
+from .comparator import CapturedOutput, normalized_lines
+from .config import CheckerConfig, LanguageConfig
+from .diff import render_diff
+from .forkserver import ForkServer, supported_interpreter
+from .languageinfo import language_limits
+from .runner import (
+    DEFAULT_OUTPUT_LIMIT,
+    CancelToken,
+    Executable,
+    RunResult,
+    compile_source_file,
+    judge,
+    lookup_language_config,
+    remove_work_dir,
+    run_executable_parallel,
+)
+from .testcases import TestCase, discover_tests, sample_cases
+
+if TYPE_CHECKING:
+    import requests
+
+
+class CheckPlan(NamedTuple):
+    """A compiled solution with the test cases to run it on.
+
+    Attributes
+    ----------
+    problem : Problem
+        The problem the solution is for.
+    cases : List[TestCase]
+        The samples of the problem, followed by local test cases.
+    executable : Executable
+        The compiled solution.
+    time_limit : Union[float, None]
+        The time limit for the language of the solution in seconds, or `None`
+        for no limit.
+    memory_limit : Union[int, None]
+        The memory limit for the language of the solution in MB, or `None` for
+        no limit.
+    """
+
+    problem: Problem
+    cases: List[TestCase]
+    executable: Executable
+    time_limit: Union[float, None]
+    memory_limit: Union[int, None]
+
+
+class CaseResult(NamedTuple):
+    """The outcome of running a solution on a test case.
+
+    Attributes
+    ----------
+    case : TestCase
+        The test case.
+    result : RunResult
+        The result of the run.
+    verdict : str
+        The verdict, as returned by `runner.judge`.
+    """
+
+    case: TestCase
+    result: RunResult
+    verdict: str
+
+    def todict(self) -> dict:
+        """Convert the outcome to a JSON-serializable dict.
+
+        Returns
+        -------
+        dict
+            The name of the case, and the verdict, exit code and resource usage
+            of the run.
+        """
+        return {
+            "name": self.case.name,
+            "verdict": self.verdict,
+            "exit_code": self.result.exit_code,
+            "wall_time": self.result.wall_time,
+            "user_time": self.result.user_time,
+            "sys_time": self.result.sys_time,
+            "max_rss": self.result.max_rss,
+            "warm_start": self.result.warm_start,
+        }
+
+
+def prepare_check(
+    problem_id: int,
+    filepath: Path,
+    config: CheckerConfig,
+    sample_cache: Union[SampleCache, None] = None,
+    offline: bool = False,
+    tests_dir: Union[Path, None] = None,
+    temp_dir: Union[Path, None] = None,
+    artifact_cache: Union[ArtifactCache, None] = None,
+    pch_cache: Union[ArtifactCache, None] = None,
+    use_limits: bool = True,
+    time_limit: Union[float, None] = None,
+    session: Union["requests.Session", None] = None,
+) -> CheckPlan:
+    """Fetch the samples of a problem and compile a solution for it.
+
+    Samples are downloaded while the source is compiled.
+
+    Parameters
+    ----------
+    problem_id
+        The ID of the problem.
+    filepath
+        The path of the solution.
+    config
+        The loaded config.
+    sample_cache
+        The sample cache, passed to `fetch_problem`.
+    offline
+        Passed to `fetch_problem`.
+    tests_dir
+        A directory of local test cases to add, as found by `discover_tests`.
+    temp_dir
+        Passed to `compile_source_file`.
+    artifact_cache
+        Passed to `compile_source_file`.
+    pch_cache
+        Passed to `compile_source_file`.
+    use_limits
+        If set to False, do not enforce the limits of the problem.
+    time_limit
+        Overrides the time limit of the problem, in seconds.
+    session
+        Passed to `fetch_problem`.
+
+    Returns
+    -------
+    CheckPlan
+        The compiled solution and its test cases.
+
+    Raises
+    ------
+    NotImplementedError
+        If the language of the solution is unknown. Raised before anything is
+        fetched.
+    LookupError
+        If `offline` is set and the problem is not in the cache.
+    ValueError
+        If the compilation of the solution failed.
+    """
+    language_config = lookup_language_config(filepath, config.languageconfig_table)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        problem_future = executor.submit(
+            fetch_problem, problem_id, sample_cache, offline, session
+        )
+        executable_future = executor.submit(
+            compile_source_file,
+            filepath,
+            config.languageconfig_table,
+            temp_dir,
+            artifact_cache,
+            pch_cache,
+        )
+        try:
+            problem = problem_future.result()
+        except BaseException:
+            try:
+                remove_work_dir(executable_future.result())
+            except Exception:
+                pass
+            raise
+        executable = executable_future.result()
+    return make_plan(
+        problem, executable, language_config, tests_dir, use_limits, time_limit
+    )
+
+
+def make_plan(
+    problem: Problem,
+    executable: Executable,
+    language_config: LanguageConfig,
+    tests_dir: Union[Path, None] = None,
+    use_limits: bool = True,
+    time_limit: Union[float, None] = None,
+) -> CheckPlan:
+    """Put together a fetched problem and a compiled solution for it.
+
+    Parameters
+    ----------
+    problem
+        The problem.
+    executable
+        The compiled solution.
+    language_config
+        The language config of the solution.
+    tests_dir
+        A directory of local test cases to add, as found by `discover_tests`.
+    use_limits
+        If set to False, do not enforce the limits of the problem.
+    time_limit
+        Overrides the time limit of the problem, in seconds.
+
+    Returns
+    -------
+    CheckPlan
+        The compiled solution and its test cases.
+    """
+    cases = list(sample_cases(problem.samples))
+    if tests_dir != None:
+        cases.extend(discover_tests(tests_dir))
+    if use_limits:
+        limits = language_limits(
+            language_config,
+            problem.time_limit,
+            problem.memory_limit,
+            problem.extra_time,
+        )
+    else:
+        limits = (None, None)
+    return CheckPlan(
+        problem,
+        cases,
+        executable,
+        time_limit if time_limit != None else limits[0],
+        limits[1],
+    )
+
+
+def run_check(
+    plan: CheckPlan,
+    jobs: int = 1,
+    output_limit: Union[int, None] = DEFAULT_OUTPUT_LIMIT,
+    executor: Union[ThreadPoolExecutor, None] = None,
+    cancel: Union[CancelToken, None] = None,
+) -> Iterator[CaseResult]:
+    """Run a prepared solution on its test cases and judge the results.
+
+    Parameters
+    ----------
+    plan
+        The solution and test cases, returned by `prepare_check`.
+    jobs
+        Passed to `run_executable_parallel`.
+    output_limit
+        Passed to `run_executable_parallel`.
+    executor
+        Passed to `run_executable_parallel`.
+    cancel
+        Passed to `run_executable_parallel`.
+
+    Returns
+    -------
+    Iterator[CaseResult]
+        The result of each test case, in order. The caller must close the
+        output of each result.
+    """
+    results = run_executable_parallel(
+        plan.executable,
+        [x.input for x in plan.cases],
+        jobs,
+        plan.time_limit,
+        plan.memory_limit,
+        [x.output for x in plan.cases],
+        output_limit,
+        executor,
+        cancel,
+    )
+    for case in plan.cases:
+        result = next(results)
+        yield CaseResult(
+            case, result, judge(case.output, result, plan.time_limit, plan.memory_limit)
+        )
+
+
+def output_diff(
+    output: CapturedOutput, solution: Union[str, Path], context: int = 3
+) -> Iterator[str]:
+    """Render the difference between the output of a run and the expected one.
+
+    Parameters
+    ----------
+    output
+        The output of the run.
+    solution
+        The expected output, or the path of a file holding it.
+    context
+        Number of matching lines to show around differences.
+
+    Returns
+    -------
+    Iterator[str]
+        Lines of the diff, as rendered by `render_diff`.
+    """
+    output_lines = list(normalized_lines(output.lines()))
+    if isinstance(solution, Path):
+        with open(solution, errors="replace") as f:
+            solution_lines = list(normalized_lines(f))
+    else:
+        solution_lines = list(normalized_lines(solution.splitlines()))
+    return render_diff(output_lines, solution_lines, context)
+
+
+def attach_fork_server(
+    executable: Executable, fork_servers: Dict[str, ForkServer]
+) -> Executable:
+    """Set up an executable to run with a fork server if it can.
+
+    Parameters
+    ----------
+    executable
+        The executable to run.
+    fork_servers
+        Started fork servers by interpreter. A fork server is started and
+        added if there is none for the interpreter of `executable`.
+
+    Returns
+    -------
+    Executable
+        The executable, using a fork server if it is a Python script.
+
+    Raises
+    ------
+    OSError
+        If the fork server could not be started.
+    """
+    if executable.language_type != "scripted" or not supported_interpreter(
+        executable.command
+    ):
+        return executable
+    interpreter = executable.command[0]
+    if interpreter not in fork_servers:
+        fork_servers[interpreter] = ForkServer([interpreter])
+    return executable._replace(fork_server=fork_servers[interpreter])
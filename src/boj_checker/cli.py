@@ -1,16 +1,1918 @@
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Union
 from xdg import BaseDirectory
 
 from . import __version__
 from .config import CheckerConfig
-from .runner import check_output, clean_temporary_files, run_source_file
-from .boj_parser import fetch_sample_io
+from .report import PASSING_VERDICTS, check_report, junit_xml
+from .tracing import Tracer, span, start_tracing, stop_tracing
 
 import argparse
 import colorama
-import difflib
+import json
 import os
+import sys
+import threading
+import time
+
+# Modules used by a single command, or only on some paths of the main command,
+# are imported where they are used, to keep the startup fast. The runner alone
+# pulls in the caches with sqlite3, the fork server and precompiled headers.
+if TYPE_CHECKING:
+    from .batch import BatchJob
+    from .bench import BenchPoint
+    from .boj_parser import Problem
+    from .cache import ArtifactCache
+    from .check import CaseResult, CheckPlan
+    from .comparator import CapturedOutput
+    from .forkserver import ForkServer
+    from .history import HistoryEntry
+    from .profiles import ProfileBuild
+    from .race import RaceResult
+    from .runner import CancelToken, Executable, RunResult
+    from .testcases import TestCase
+
+# Exit codes of checks: all cases passed, some case failed or the compilation
+# failed, and the solution could not be checked at all.
+EXIT_PASSED = 0
+EXIT_FAILED = 1
+EXIT_ERROR = 2
+
+VERDICT_COLORS = {
+    "AC": colorama.Fore.GREEN,
+    "WA": colorama.Fore.RED,
+    "RTE": colorama.Fore.RED,
+    "TLE": colorama.Fore.MAGENTA,
+    "MLE": colorama.Fore.MAGENTA,
+    "OLE": colorama.Fore.MAGENTA,
+    "OK": colorama.Fore.CYAN,
+}
+
+
+def format_usage(result: "RunResult") -> str:
+    """Format the resource usage of a run for display.
+
+    Parameters
+    ----------
+    result
+        The result of the run.
+
+    Returns
+    -------
+    str
+        Wall time, CPU time and peak memory usage, in BOJ's units.
+    """
+    return (
+        f"{result.wall_time * 1000:.0f} ms, {result.max_rss} KB "
+        f"(user {result.user_time * 1000:.0f} ms, "
+        f"sys {result.sys_time * 1000:.0f} ms"
+        f"{', warm start' if result.warm_start else ''})"
+    )
+
+
+def print_diff(output: "CapturedOutput", solution: Union[str, Path], context: int):
+    """Print the difference between the output of a run and the expected one.
+
+    Parameters
+    ----------
+    output
+        The output of the run.
+    solution
+        The expected output, or the path of a file holding it.
+    context
+        Number of matching lines to show around differences.
+    """
+    from .check import output_diff
+
+    with span("diff", "cli"):
+        diff_lines = list(output_diff(output, solution, context))
+    print_diff_lines(diff_lines)
+
+
+def print_diff_lines(diff_lines: Iterable[str]):
+    """Print a diff rendered by `render_diff`, with colors.
+
+    Parameters
+    ----------
+    diff_lines
+        Lines of the diff.
+    """
+    print(f"{colorama.Fore.YELLOW}<<<<<<< Output diff{colorama.Style.RESET_ALL}")
+    for diff in diff_lines:
+        if diff.startswith("-"):
+            print(colorama.Fore.RED, end="")
+        elif diff.startswith("+"):
+            print(colorama.Fore.GREEN, end="")
+        elif diff.startswith("@@"):
+            print(colorama.Fore.BLUE, end="")
+        print(f"{diff}{colorama.Style.RESET_ALL}")
+    print(f"{colorama.Fore.YELLOW}>>>>>>>{colorama.Style.RESET_ALL}\n")
+
+
+def add_common_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments shared by all commands to a parser.
+
+    Parameters
+    ----------
+    parser
+        The parser to add arguments to.
+    """
+    parser.add_argument(
+        "--no-config", action="store_true", help="Do not load config file"
+    )
+    parser.add_argument("-c", "--config-file", type=str, help="The path of config file")
+
+
+def add_compile_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments of commands compiling source files to a parser.
+
+    Parameters
+    ----------
+    parser
+        The parser to add arguments to.
+    """
+    parser.add_argument(
+        "-t", "--temp-directory", type=str, help="Path of temporary directory to use"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not reuse or store compilation results",
+    )
+    parser.add_argument(
+        "--no-pch",
+        action="store_true",
+        help="Do not use precompiled headers for C++ sources",
+    )
+    parser.add_argument(
+        "--fork-server",
+        action="store_true",
+        help="Run Python solutions by forking a started interpreter, so that "
+        "runs do not pay for its startup",
+    )
+
+
+def load_config(parsed_args: argparse.Namespace) -> CheckerConfig:
+    """Load the config file as requested by the command line arguments.
+
+    Parameters
+    ----------
+    parsed_args
+        Arguments parsed by a parser set up with `add_common_arguments`.
+
+    Returns
+    -------
+    CheckerConfig
+        The loaded config, or the default one if there is no config file.
+    """
+    if parsed_args.config_file != None:
+        config_file_path = Path(parsed_args.config_file)
+    else:
+        config_file_path = (
+            Path(BaseDirectory.save_config_path("boj-checker")) / "config.json"
+        )
+    try:
+        if parsed_args.no_config:
+            return CheckerConfig.fromdefault()
+        else:
+            return CheckerConfig.fromfilepath(config_file_path)
+    except FileNotFoundError:
+        return CheckerConfig.fromdefault()
+
+
+def open_compile_caches(
+    config: CheckerConfig, parsed_args: argparse.Namespace
+) -> Tuple[Union["ArtifactCache", None], Union["ArtifactCache", None]]:
+    """Open the caches used for compilation, unless disabled by arguments.
+
+    Parameters
+    ----------
+    config
+        The loaded config.
+    parsed_args
+        Arguments parsed by a parser set up with `add_compile_arguments`.
+
+    Returns
+    -------
+    Tuple[Union[ArtifactCache, None], Union[ArtifactCache, None]]
+        The cache of compilation results and the cache of precompiled headers.
+    """
+    from .cache import ArtifactCache
+
+    if parsed_args.no_cache:
+        artifact_cache = None
+    else:
+        artifact_cache = ArtifactCache.fromdefault(config.artifact_cache_size)
+    if parsed_args.no_pch:
+        pch_cache = None
+    else:
+        pch_cache = ArtifactCache.fromdefault(config.pch_cache_size, "pch")
+    return (artifact_cache, pch_cache)
+
+
+def temp_directory_for_command(
+    config: CheckerConfig, parsed_args: argparse.Namespace
+) -> Union[Path, None]:
+    """Find the temporary directory to compile into.
+
+    Parameters
+    ----------
+    config
+        The loaded config.
+    parsed_args
+        Arguments parsed by a parser set up with `add_compile_arguments`.
+
+    Returns
+    -------
+    Union[pathlib.Path, None]
+        The directory given by arguments or by the config, or `None` for the
+        default one.
+    """
+    if parsed_args.temp_directory != None:
+        return Path(parsed_args.temp_directory)
+    return config.temp_dir
+
+
+def compile_for_command(
+    filepath: Path, config: CheckerConfig, parsed_args: argparse.Namespace
+) -> Union["Executable", None]:
+    """Compile a source file, printing the reason if it cannot be compiled.
+
+    Parameters
+    ----------
+    filepath
+        The path of the source file.
+    config
+        The loaded config.
+    parsed_args
+        Arguments parsed by a parser set up with `add_compile_arguments`.
+
+    Returns
+    -------
+    Union[Executable, None]
+        The compiled source, or `None` on failure, which commands report with
+        `EXIT_ERROR`.
+    """
+    from .runner import compile_source_file
+
+    temp_directory = temp_directory_for_command(config, parsed_args)
+    artifact_cache, pch_cache = open_compile_caches(config, parsed_args)
+    try:
+        return compile_source_file(
+            filepath,
+            config.languageconfig_table,
+            temp_directory,
+            artifact_cache,
+            pch_cache,
+        )
+    except NotImplementedError:
+        print(
+            f"{colorama.Fore.BLUE}Unknown language: {filepath}"
+            f"{colorama.Style.RESET_ALL}"
+        )
+    except ValueError:
+        print(
+            f"{colorama.Fore.BLUE}Compilation Error: {filepath}"
+            f"{colorama.Style.RESET_ALL}"
+        )
+    except OSError as error:
+        # Such as a compiler that is not installed, or a missing source.
+        print(
+            f"{colorama.Fore.BLUE}Could not compile {filepath}: {error}"
+            f"{colorama.Style.RESET_ALL}"
+        )
+    return None
+
+
+def fetch_for_command(
+    problem_id: int, config: CheckerConfig, parsed_args: argparse.Namespace
+) -> Union["Problem", None]:
+    """Fetch a problem, printing the reason if it cannot be fetched.
+
+    Parameters
+    ----------
+    problem_id
+        The ID of the problem.
+    config
+        The loaded config.
+    parsed_args
+        Arguments of a command with an `--offline` option.
+
+    Returns
+    -------
+    Union[Problem, None]
+        The problem, or `None` on failure, which commands report with
+        `EXIT_ERROR`.
+    """
+    from .boj_parser import fetch_problem
+    from .cache import SampleCache
+
+    try:
+        return fetch_problem(
+            problem_id,
+            SampleCache.fromdefault(config.sample_cache_ttl),
+            parsed_args.offline,
+        )
+    except LookupError:
+        print(
+            f"{colorama.Fore.BLUE}Samples of problem {problem_id} "
+            f"are not cached{colorama.Style.RESET_ALL}"
+        )
+    except OSError as error:
+        # Errors of requests derive from OSError.
+        print(
+            f"{colorama.Fore.BLUE}Could not fetch problem {problem_id}: {error}"
+            f"{colorama.Style.RESET_ALL}"
+        )
+    return None
+
+
+def start_fork_servers(
+    executables: List["Executable"],
+) -> Tuple[List["Executable"], List["ForkServer"]]:
+    """Start fork servers for the executables that can use one.
+
+    Parameters
+    ----------
+    executables
+        The executables to run.
+
+    Returns
+    -------
+    Tuple[List[Executable], List[ForkServer]]
+        The executables set up to use a fork server if they can, and the
+        started fork servers, one per interpreter. The caller must close them.
+    """
+    from .check import attach_fork_server
+
+    fork_servers: Dict[str, "ForkServer"] = dict()
+    result = []
+    for executable in executables:
+        interpreter = executable.command[0]
+        started = interpreter in fork_servers
+        try:
+            executable = attach_fork_server(executable, fork_servers)
+        except OSError:
+            print(
+                f"{colorama.Fore.BLUE}Could not start a fork server for "
+                f"{interpreter}{colorama.Style.RESET_ALL}"
+            )
+        if not started and interpreter in fork_servers:
+            print(
+                f"Started fork server for {interpreter} in "
+                f"{fork_servers[interpreter].startup_time * 1000:.0f} ms, "
+                "not included in run times"
+            )
+        result.append(executable)
+    return (result, list(fork_servers.values()))
+
+
+def stress_main(args: List[str]) -> int:
+    """The main function of the stress command.
+
+    Parameters
+    ----------
+    args
+        command line arguments following the command name
+
+    Returns
+    -------
+    int
+        Exit code of the program
+    """
+    from .runner import remove_work_dir
+
+    parser = argparse.ArgumentParser(
+        prog="boj-checker stress",
+        description="Compare a solution against a reference solution on "
+        "generated inputs. The generator gets a seed as its only argument and "
+        "prints an input.",
+    )
+    parser.add_argument("generator", metavar="GEN", type=str, help="The generator")
+    parser.add_argument(
+        "reference", metavar="REF", type=str, help="The reference solution"
+    )
+    parser.add_argument(
+        "filepath", metavar="SOL", type=str, help="The solution code to test"
+    )
+    add_common_arguments(parser)
+    add_compile_arguments(parser)
+    parser.add_argument(
+        "-n", "--iterations", type=int, default=1000, help="Number of cases to run"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of cases to run in parallel",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=1, help="The seed of the first case"
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=10,
+        help="Kill each program after this many seconds",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="stress-failure.in",
+        help="Where to save the failing input. The reference output is saved "
+        "next to it with the .out extension",
+    )
+    parser.add_argument(
+        "--no-shrink",
+        action="store_true",
+        help="Do not try to make the failing input smaller",
+    )
+    parser.add_argument(
+        "--no-diff", action="store_true", help="Do not show diffs on WA"
+    )
+    parsed_args = parser.parse_args(args)
+    config = load_config(parsed_args)
+    executables = []
+    for path in [parsed_args.generator, parsed_args.reference, parsed_args.filepath]:
+        executable = compile_for_command(Path(path), config, parsed_args)
+        if executable == None:
+            for compiled in executables:
+                remove_work_dir(compiled)
+            return EXIT_ERROR
+        executables.append(executable)
+    fork_servers: List["ForkServer"] = []
+    if parsed_args.fork_server:
+        executables, fork_servers = start_fork_servers(executables)
+    try:
+        return run_stress_test(parsed_args, *executables)
+    finally:
+        for executable in executables:
+            remove_work_dir(executable)
+        for fork_server in fork_servers:
+            fork_server.close()
+
+
+def run_stress_test(
+    parsed_args: argparse.Namespace,
+    generator: "Executable",
+    reference: "Executable",
+    solution: "Executable",
+) -> int:
+    """Run the stress command on compiled sources and report the result.
+
+    Parameters
+    ----------
+    parsed_args
+        Arguments of the stress command.
+    generator
+        The generator.
+    reference
+        The reference solution.
+    solution
+        The solution to check.
+
+    Returns
+    -------
+    int
+        Exit code of the program
+    """
+    from .comparator import CapturedOutput
+    from .stress import shrink_case, stress_test
+
+    def progress(finished: int):
+        print(f"\rRunning cases: {finished}/{parsed_args.iterations}", end="")
+
+    case = stress_test(
+        generator,
+        reference,
+        solution,
+        parsed_args.iterations,
+        max(parsed_args.jobs, 1),
+        parsed_args.seed,
+        parsed_args.time_limit,
+        progress if sys.stdout.isatty() else None,
+    )
+    if sys.stdout.isatty():
+        print()
+    if case == None:
+        print(
+            f"{colorama.Fore.GREEN}All {parsed_args.iterations} cases passed"
+            f"{colorama.Style.RESET_ALL}"
+        )
+        return 0
+    if case.verdict in ("GEN", "REF"):
+        failed = "Generator" if case.verdict == "GEN" else "Reference solution"
+        print(
+            f"{colorama.Fore.BLUE}{failed} failed on seed {case.seed}"
+            f"{colorama.Style.RESET_ALL}"
+        )
+        return 1
+    print(
+        f"{VERDICT_COLORS[case.verdict]}{case.verdict}{colorama.Style.RESET_ALL} "
+        f"on seed {case.seed}"
+    )
+    if not parsed_args.no_shrink:
+        original_size = len(case.input.splitlines())
+        case = shrink_case(reference, solution, case, parsed_args.time_limit)
+        print(
+            f"Shrunk input from {original_size} to "
+            f"{len(case.input.splitlines())} lines"
+        )
+    input_path = Path(parsed_args.output)
+    input_path.write_text(case.input)
+    input_path.with_suffix(".out").write_text(case.expected)
+    print(f"Saved failing input to {input_path}")
+    if case.verdict == "WA" and not parsed_args.no_diff:
+        output = CapturedOutput()
+        output.write(case.output.encode("utf-8"))
+        print_diff(output, case.expected, 3)
+        output.close()
+    return 1
+
+
+def sync_main(args: List[str]) -> int:
+    """The main function of the sync command.
+
+    Parameters
+    ----------
+    args
+        command line arguments following the command name
+
+    Returns
+    -------
+    int
+        Exit code of the program
+    """
+    from .cache import SampleCache
+    from .sync import parse_problem_ids, sync_problems
+
+    parser = argparse.ArgumentParser(
+        prog="boj-checker sync",
+        description="Download samples of many problems into the sample cache, "
+        "for use without network access.",
+    )
+    parser.add_argument(
+        "problems",
+        metavar="PROB_ID",
+        nargs="+",
+        help="Problem IDs, or inclusive ranges of them such as 1000-1100",
+    )
+    add_common_arguments(parser)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=4,
+        help="Number of requests to send at once",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=2,
+        help="Maximum number of requests to start per second",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Check problems for updates even if their cached samples are fresh",
+    )
+    parsed_args = parser.parse_args(args)
+    try:
+        problem_ids = parse_problem_ids(parsed_args.problems)
+    except ValueError:
+        parser.error("problems must be numbers or ranges such as 1000-1100")
+    config = load_config(parsed_args)
+
+    def progress(finished: int, total: int):
+        print(f"\rFetching problems: {finished}/{total}", end="")
+
+    result = sync_problems(
+        problem_ids,
+        SampleCache.fromdefault(config.sample_cache_ttl),
+        max(parsed_args.jobs, 1),
+        parsed_args.rate,
+        parsed_args.force,
+        progress if sys.stdout.isatty() else None,
+    )
+    if sys.stdout.isatty() and (result.synced or result.failed):
+        print()
+    print(
+        f"Synced {len(result.synced)}, skipped {len(result.skipped)} "
+        f"already cached, failed {len(result.failed)}"
+    )
+    if result.failed:
+        print(
+            f"{colorama.Fore.BLUE}Failed problems: "
+            f"{' '.join(map(str, result.failed))}{colorama.Style.RESET_ALL}"
+        )
+        return 1
+    return 0
+
+
+def serve_main(args: List[str]) -> int:
+    """The main function of the serve command.
+
+    Parameters
+    ----------
+    args
+        command line arguments following the command name
+
+    Returns
+    -------
+    int
+        Exit code of the program
+    """
+    from .daemon import CheckerDaemon, default_socket_path
+
+    parser = argparse.ArgumentParser(
+        prog="boj-checker serve",
+        description="Run a daemon keeping the config, caches, HTTP connections "
+        "and workers between checks, used by `boj-checker client`.",
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=str(default_socket_path()),
+        help="The path of the Unix socket to listen on",
+    )
+    add_common_arguments(parser)
+    add_compile_arguments(parser)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of samples to run in parallel, across all checks",
+    )
+    parsed_args = parser.parse_args(args)
+    config = load_config(parsed_args)
+    try:
+        daemon = CheckerDaemon(
+            config,
+            Path(parsed_args.socket),
+            (
+                Path(parsed_args.temp_directory)
+                if parsed_args.temp_directory != None
+                else None
+            ),
+            not parsed_args.no_cache,
+            not parsed_args.no_pch,
+            parsed_args.fork_server,
+            parsed_args.jobs,
+        )
+    except OSError as e:
+        print(f"{colorama.Fore.BLUE}{e}{colorama.Style.RESET_ALL}")
+        return 1
+    print(f"Listening on {parsed_args.socket}")
+    with daemon:
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def client_main(args: List[str]) -> int:
+    """The main function of the client command.
+
+    Parameters
+    ----------
+    args
+        command line arguments following the command name
+
+    Returns
+    -------
+    int
+        Exit code of the program
+    """
+    from .daemon import COMPILATION_ERROR, RPCError, call, default_socket_path
+    from .runner import DEFAULT_OUTPUT_LIMIT, RunResult
+
+    parser = argparse.ArgumentParser(
+        prog="boj-checker client",
+        description="Check a solution with a daemon started by " "`boj-checker serve`.",
+    )
+    parser.add_argument(
+        "probno", metavar="PROB_ID", type=int, help="The problem ID for solution"
+    )
+    parser.add_argument(
+        "filepath", metavar="FILE", type=str, help="The solution code to test"
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=str(default_socket_path()),
+        help="The path of the Unix socket of the daemon",
+    )
+    parser.add_argument(
+        "--no-diff", action="store_true", help="Do not show diffs on WA"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Use cached samples only, without accessing the network",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        help="Override the time limit of the problem, in seconds",
+    )
+    parser.add_argument(
+        "--no-limits",
+        action="store_true",
+        help="Do not enforce the time and memory limits of the problem",
+    )
+    parser.add_argument(
+        "--output-limit",
+        type=int,
+        default=DEFAULT_OUTPUT_LIMIT // (1024 * 1024),
+        help="Kill the solution after this many MB of output and report OLE",
+    )
+    parser.add_argument(
+        "--diff-context",
+        type=int,
+        default=3,
+        help="Number of matching lines to show around differences on WA",
+    )
+    parser.add_argument(
+        "--tests",
+        metavar="DIR",
+        type=str,
+        help="Also test against NAME.in/NAME.out pairs in this directory",
+    )
+    parsed_args = parser.parse_args(args)
+    params = {
+        "problem_id": parsed_args.probno,
+        "filepath": os.path.abspath(parsed_args.filepath),
+        "tests_dir": (
+            os.path.abspath(parsed_args.tests) if parsed_args.tests != None else None
+        ),
+        "offline": parsed_args.offline,
+        "use_limits": not parsed_args.no_limits,
+        "time_limit": parsed_args.time_limit,
+        "output_limit": parsed_args.output_limit * 1024 * 1024,
+        "diff_context": None if parsed_args.no_diff else parsed_args.diff_context,
+    }
+    try:
+        result = call(Path(parsed_args.socket), "check", params)
+    except RPCError as e:
+        print(f"{colorama.Fore.BLUE}{e.message}{colorama.Style.RESET_ALL}")
+        return EXIT_FAILED if e.code == COMPILATION_ERROR else EXIT_ERROR
+    except OSError:
+        print(
+            f"{colorama.Fore.BLUE}No daemon is listening on {parsed_args.socket}, "
+            f"start one with `boj-checker serve`{colorama.Style.RESET_ALL}"
+        )
+        return EXIT_ERROR
+    cases = result["cases"]
+    print(f"Testing code for {len(cases)} case{'s' if len(cases) != 1 else ''}")
+    time_limit, memory_limit = (result["time_limit"], result["memory_limit"])
+    if time_limit != None or memory_limit != None:
+        print(
+            f"Time limit: {f'{time_limit:g} s' if time_limit != None else '-'}, "
+            f"memory limit: {f'{memory_limit} MB' if memory_limit != None else '-'}"
+        )
+    for case in cases:
+        verdict = case["verdict"]
+        usage = format_usage(
+            RunResult(
+                None,  # type: ignore
+                case["exit_code"],
+                case["wall_time"],
+                case["user_time"],
+                case["sys_time"],
+                case["max_rss"],
+                verdict == "TLE",
+                warm_start=case["warm_start"],
+            )
+        )
+        print(
+            f"Testing {case['name']}: "
+            f"{VERDICT_COLORS[verdict]}{verdict}{colorama.Style.RESET_ALL} "
+            f"{colorama.Style.DIM}{usage}{colorama.Style.RESET_ALL}"
+        )
+        if case["diff"] != None:
+            print_diff_lines(case["diff"])
+    if all(x["verdict"] in PASSING_VERDICTS for x in cases):
+        return EXIT_PASSED
+    return EXIT_FAILED
+
+
+def race_main(args: List[str]) -> int:
+    """The main function of the race command.
+
+    Parameters
+    ----------
+    args
+        command line arguments following the command name
+
+    Returns
+    -------
+    int
+        Exit code of the program
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from .check import make_plan
+    from .race import race
+    from .runner import DEFAULT_OUTPUT_LIMIT, lookup_language_config, remove_work_dir
+
+    parser = argparse.ArgumentParser(
+        prog="boj-checker race",
+        description="Run several solutions of a problem on the same cases, "
+        "repeatedly, and compare their verdicts and resource usage.",
+    )
+    parser.add_argument(
+        "probno", metavar="PROB_ID", type=int, help="The problem ID for solutions"
+    )
+    parser.add_argument(
+        "filepaths", metavar="FILE", nargs="+", help="The solution codes to compare"
+    )
+    add_common_arguments(parser)
+    add_compile_arguments(parser)
+    parser.add_argument(
+        "-n", "--trials", type=int, default=5, help="Number of runs of each case"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Use cached samples only, without accessing the network",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        help="Override the time limit of the problem, in seconds",
+    )
+    parser.add_argument(
+        "--no-limits",
+        action="store_true",
+        help="Do not enforce the time and memory limits of the problem",
+    )
+    parser.add_argument(
+        "--output-limit",
+        type=int,
+        default=DEFAULT_OUTPUT_LIMIT // (1024 * 1024),
+        help="Kill solutions after this many MB of output and report OLE",
+    )
+    parser.add_argument(
+        "--tests",
+        metavar="DIR",
+        type=str,
+        help="Also run NAME.in/NAME.out pairs in this directory",
+    )
+    parsed_args = parser.parse_args(args)
+    config = load_config(parsed_args)
+    filepaths = [Path(x) for x in parsed_args.filepaths]
+    language_configs = []
+    for filepath in filepaths:
+        try:
+            language_configs.append(
+                lookup_language_config(filepath, config.languageconfig_table)
+            )
+        except NotImplementedError:
+            print(
+                f"{colorama.Fore.BLUE}Unknown language: {filepath}"
+                f"{colorama.Style.RESET_ALL}"
+            )
+            return EXIT_ERROR
+    problem = fetch_for_command(parsed_args.probno, config, parsed_args)
+    if problem == None:
+        return EXIT_ERROR
+    with ThreadPoolExecutor() as executor:
+        compiled = list(
+            executor.map(
+                lambda x: compile_for_command(x, config, parsed_args), filepaths
+            )
+        )
+    executables = [x for x in compiled if x != None]
+    fork_servers: List["ForkServer"] = []
+    try:
+        if len(executables) < len(compiled):
+            return EXIT_ERROR
+        if parsed_args.fork_server:
+            executables, fork_servers = start_fork_servers(executables)
+        plans = [
+            make_plan(
+                problem,
+                executable,
+                language_config,
+                Path(parsed_args.tests) if parsed_args.tests != None else None,
+                not parsed_args.no_limits,
+                parsed_args.time_limit,
+            )
+            for executable, language_config in zip(executables, language_configs)
+        ]
+        if not plans[0].cases:
+            print(
+                f"{colorama.Fore.BLUE}No cases to run for problem "
+                f"{parsed_args.probno}{colorama.Style.RESET_ALL}"
+            )
+            return 1
+        trials = max(parsed_args.trials, 1)
+        print(
+            f"Racing {len(plans)} solutions on {len(plans[0].cases)} cases, "
+            f"{trials} trials each"
+        )
+
+        def progress(finished: int, total: int):
+            print(f"\rRunning: {finished}/{total}", end="")
+
+        results = race(
+            plans,
+            trials,
+            parsed_args.output_limit * 1024 * 1024,
+            progress if sys.stdout.isatty() else None,
+        )
+        if sys.stdout.isatty():
+            print()
+        print_race(parsed_args.filepaths, plans[0].cases, results)
+    finally:
+        for executable in executables:
+            remove_work_dir(executable)
+        for fork_server in fork_servers:
+            fork_server.close()
+    return 0
+
+
+def print_race(
+    names: List[str],
+    cases: List["TestCase"],
+    results: List["RaceResult"],
+    compile_times: Union[List[Union[float, None]], None] = None,
+):
+    """Print the verdicts and resource usage of solutions compared by `race`.
+
+    Parameters
+    ----------
+    names
+        The names of the solutions.
+    cases
+        The cases the solutions were run on.
+    results
+        The results of the solutions, in the order of `names`.
+    compile_times
+        The compile time of each solution in seconds, or `None` for solutions
+        that are not compiled. Defaults to `None`, which leaves out the column.
+    """
+
+    def verdict_cell(verdict: str, width: int) -> str:
+        padding = " " * (width - len(verdict))
+        return f"{VERDICT_COLORS[verdict]}{verdict}{colorama.Style.RESET_ALL}{padding}"
+
+    name_width = max(len(x) for x in names)
+    case_width = max((len(x.name) for x in cases), default=0)
+    widths = [max(len(x), 3) for x in names]
+    print(
+        " " * case_width + "  " + "  ".join(x.ljust(w) for x, w in zip(names, widths))
+    )
+    for i, case in enumerate(cases):
+        cells = [verdict_cell(x.verdicts[i], w) for x, w in zip(results, widths)]
+        print(case.name.ljust(case_width) + "  " + "  ".join(cells))
+    print()
+    header = f"{'':{name_width}}  {'':3}  "
+    if compile_times != None:
+        header += f"{'compile':>8}  "
+    print(f"{header}{'min':>8}  {'median':>8}  {'p95':>8}  {'memory':>10}")
+    fastest = min(
+        (x.median_time for x in results if x.passed), default=None  # type: ignore
+    )
+    for i, (name, result) in enumerate(zip(names, results)):
+        verdict = "AC" if result.passed else "WA"
+        if not result.passed:
+            verdict = next(x for x in result.verdicts if x not in ("AC", "OK"))
+        line = f"{name:{name_width}}  {verdict_cell(verdict, 3)}  "
+        if compile_times != None:
+            compile_time = compile_times[i]
+            if compile_time == None:
+                line += f"{'-':>8}  "
+            else:
+                line += f"{compile_time * 1000:>5.0f} ms  "
+        line += (
+            f"{result.min_time * 1000:>5.0f} ms  "
+            f"{result.median_time * 1000:>5.0f} ms  "
+            f"{result.p95_time * 1000:>5.0f} ms  {result.max_rss:>7} KB"
+        )
+        if result.passed and result.median_time == fastest:
+            line += f"  {colorama.Fore.GREEN}fastest{colorama.Style.RESET_ALL}"
+        print(line)
+
+
+def bench_main(args: List[str]) -> int:
+    """The main function of the bench command.
+
+    Parameters
+    ----------
+    args
+        command line arguments following the command name
+
+    Returns
+    -------
+    int
+        Exit code of the program
+    """
+    from .languageinfo import language_limits
+    from .runner import lookup_language_config, remove_work_dir
+
+    parser = argparse.ArgumentParser(
+        prog="boj-checker bench",
+        description="Time a solution on generated inputs of growing sizes, fit "
+        "the timings to common complexity classes, and predict the time at the "
+        "largest size of the problem. The generator gets a size N as its only "
+        "argument and prints an input of that size.",
+    )
+    parser.add_argument(
+        "probno", metavar="PROB_ID", type=int, help="The problem ID for solution"
+    )
+    parser.add_argument("generator", metavar="GEN", type=str, help="The generator")
+    parser.add_argument(
+        "filepath", metavar="SOL", type=str, help="The solution code to time"
+    )
+    add_common_arguments(parser)
+    add_compile_arguments(parser)
+    parser.add_argument(
+        "-N",
+        "--target-n",
+        type=int,
+        required=True,
+        help="The largest N of the problem, to predict the time at",
+    )
+    parser.add_argument(
+        "--min-n", type=int, default=1000, help="The smallest N to time"
+    )
+    parser.add_argument(
+        "--max-n",
+        type=int,
+        help="The largest N to time. Defaults to the target N",
+    )
+    parser.add_argument(
+        "--factor",
+        type=float,
+        default=2,
+        help="The ratio between consecutive sizes",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="Number of runs at each size before measuring",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of measured runs at each size"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Use cached samples only, without accessing the network",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        help="Override the time limit of the problem, in seconds",
+    )
+    parsed_args = parser.parse_args(args)
+    if parsed_args.factor <= 1:
+        parser.error("factor must be greater than 1")
+    max_n = parsed_args.max_n if parsed_args.max_n != None else parsed_args.target_n
+    if not 0 < parsed_args.min_n <= max_n:
+        parser.error("sizes must satisfy 0 < min-n <= max-n")
+    config = load_config(parsed_args)
+    filepath = Path(parsed_args.filepath)
+    try:
+        language_config = lookup_language_config(filepath, config.languageconfig_table)
+    except NotImplementedError:
+        print(f"{colorama.Fore.BLUE}Unknown language{colorama.Style.RESET_ALL}")
+        return EXIT_ERROR
+    problem = fetch_for_command(parsed_args.probno, config, parsed_args)
+    if problem == None:
+        return EXIT_ERROR
+    time_limit, _ = language_limits(
+        language_config, problem.time_limit, problem.memory_limit, problem.extra_time
+    )
+    if parsed_args.time_limit != None:
+        time_limit = parsed_args.time_limit
+    executables = []
+    for path in [parsed_args.generator, parsed_args.filepath]:
+        executable = compile_for_command(Path(path), config, parsed_args)
+        if executable == None:
+            for compiled in executables:
+                remove_work_dir(compiled)
+            return EXIT_ERROR
+        executables.append(executable)
+    fork_servers: List["ForkServer"] = []
+    if parsed_args.fork_server:
+        executables, fork_servers = start_fork_servers(executables)
+    try:
+        return run_bench(parsed_args, time_limit, *executables)
+    finally:
+        for executable in executables:
+            remove_work_dir(executable)
+        for fork_server in fork_servers:
+            fork_server.close()
+
+
+def run_bench(
+    parsed_args: argparse.Namespace,
+    time_limit: Union[float, None],
+    generator: "Executable",
+    solution: "Executable",
+) -> int:
+    """Run the bench command on compiled sources and report the result.
+
+    Parameters
+    ----------
+    parsed_args
+        Arguments of the bench command.
+    time_limit
+        The time limit for the solution in seconds, or `None` if unknown.
+    generator
+        The generator.
+    solution
+        The solution to time.
+
+    Returns
+    -------
+    int
+        Exit code of the program
+    """
+    from .bench import bench, fit_complexity, geometric_sizes
+
+    max_n = parsed_args.max_n if parsed_args.max_n != None else parsed_args.target_n
+    sizes = geometric_sizes(parsed_args.min_n, max_n, parsed_args.factor)
+    if time_limit != None:
+        print(f"Time limit: {time_limit:g} s")
+    print(f"Timing {len(sizes)} sizes from N={sizes[0]} to N={sizes[-1]}")
+
+    def progress(point: "BenchPoint"):
+        if point.verdict == "GEN":
+            print(
+                f"{colorama.Fore.BLUE}Generator failed at N={point.n}"
+                f"{colorama.Style.RESET_ALL}"
+            )
+        elif point.verdict != "OK":
+            print(
+                f"N={point.n}: "
+                f"{VERDICT_COLORS[point.verdict]}{point.verdict}"
+                f"{colorama.Style.RESET_ALL}"
+            )
+        else:
+            print(
+                f"N={point.n}: {point.median_time * 1000:.0f} ms "
+                f"{colorama.Style.DIM}(min {min(point.times) * 1000:.0f} ms, "
+                f"{point.max_rss} KB){colorama.Style.RESET_ALL}"
+            )
+
+    points = bench(
+        generator,
+        solution,
+        sizes,
+        max(parsed_args.warmup, 0),
+        max(parsed_args.repeat, 1),
+        # Runs far beyond the time limit tell nothing more about the fit.
+        max(time_limit * 3, 10) if time_limit != None else None,
+        time_limit * 2 if time_limit != None else None,
+        progress,
+    )
+    measured = [x for x in points if x.verdict == "OK"]
+    if len(measured) < 3:
+        print(
+            f"{colorama.Fore.BLUE}Too few sizes were timed to fit a complexity"
+            f"{colorama.Style.RESET_ALL}"
+        )
+        return 1
+    fits = fit_complexity(measured)
+    print("\nBest fits:")
+    for fit in fits[:3]:
+        print(
+            f"  {fit.name:<14} {fit.constant * 1000:.1f} ms + "
+            f"{fit.coefficient:.3g} s * f(N)  "
+            f"{colorama.Style.DIM}(error {fit.error * 100:.1f}%)"
+            f"{colorama.Style.RESET_ALL}"
+        )
+    best = fits[0]
+    predicted = best.predict(parsed_args.target_n)
+    message = (
+        f"Predicted time at N={parsed_args.target_n}: {predicted:.3g} s, "
+        f"assuming {best.name}"
+    )
+    if time_limit == None:
+        print(message)
+    elif predicted <= time_limit:
+        print(
+            f"{message}, {colorama.Fore.GREEN}within the time limit"
+            f"{colorama.Style.RESET_ALL}"
+        )
+    else:
+        print(
+            f"{message}, {colorama.Fore.MAGENTA}over the time limit"
+            f"{colorama.Style.RESET_ALL}"
+        )
+    return 0
+
+
+def history_main(args: List[str]) -> int:
+    """The main function of the history command.
+
+    Parameters
+    ----------
+    args
+        command line arguments following the command name
+
+    Returns
+    -------
+    int
+        Exit code of the program
+    """
+    from .history import RunHistory
+
+    parser = argparse.ArgumentParser(
+        prog="boj-checker history",
+        description="Show recorded checks with their runtimes, to follow how "
+        "the speed of solutions changes across rewrites.",
+    )
+    parser.add_argument(
+        "probno",
+        metavar="PROB_ID",
+        type=int,
+        nargs="?",
+        help="Only show checks of this problem",
+    )
+    parser.add_argument(
+        "filepath",
+        metavar="FILE",
+        type=str,
+        nargs="?",
+        help="Only show checks of this solution",
+    )
+    parser.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=20,
+        help="Number of latest checks to show",
+    )
+    parsed_args = parser.parse_args(args)
+    history = RunHistory.fromdefault()
+    try:
+        entries = history.entries(
+            parsed_args.probno,
+            Path(parsed_args.filepath) if parsed_args.filepath != None else None,
+            parsed_args.limit,
+        )
+    finally:
+        history.close()
+    if not entries:
+        print("No checks recorded")
+        return 0
+    print_history(entries)
+    return 0
+
+
+def print_history(entries: List["HistoryEntry"]):
+    """Print recorded checks, with the change of their runtime.
+
+    The runtime of each check is compared to the previous check of the same
+    solution with the same language config shown.
+
+    Parameters
+    ----------
+    entries
+        The checks, oldest first.
+    """
+    name_width = max(max(len(Path(x.source).name) for x in entries), len("source"))
+    print(
+        f"{'date':16}  {'problem':>7}  {'source':{name_width}}  {'hash':8}  "
+        f"{'config':8}  {'':3}  {'total':>8}  {'max':>8}  {'memory':>10}  change"
+    )
+    previous: Dict[Tuple[str, str], "HistoryEntry"] = dict()
+    for entry in entries:
+        if entry.passed:
+            verdict = "AC"
+        else:
+            # "-" for checks without cases.
+            verdict = next(
+                (x for x in entry.verdicts if x not in PASSING_VERDICTS), "-"
+            )
+        color = VERDICT_COLORS.get(verdict, colorama.Fore.BLUE)
+        line = (
+            f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.recorded_at))}  "
+            f"{entry.problem_id:>7}  {Path(entry.source).name:{name_width}}  "
+            f"{entry.source_hash[:8]}  {entry.config_key[:8]}  "
+            f"{color}{verdict:3}{colorama.Style.RESET_ALL}  "
+            f"{entry.total_time * 1000:>5.0f} ms  {entry.max_time * 1000:>5.0f} ms  "
+            f"{entry.max_rss:>7} KB"
+        )
+        key = (entry.source, entry.config_key)
+        last = previous.get(key)
+        if last != None and last.total_time > 0 and entry.verdicts != ["CE"]:
+            change = (entry.total_time / last.total_time - 1) * 100
+            change_color = colorama.Fore.GREEN if change < 0 else colorama.Fore.RED
+            line += f"  {change_color}{change:+.1f}%{colorama.Style.RESET_ALL}"
+        if entry.verdicts != ["CE"]:
+            previous[key] = entry
+        print(line)
+
+
+def batch_main(args: List[str]) -> int:
+    """The main function of the batch command.
+
+    Parameters
+    ----------
+    args
+        command line arguments following the command name
+
+    Returns
+    -------
+    int
+        `EXIT_PASSED` if all solutions passed, and `EXIT_FAILED` otherwise.
+    """
+    from .batch import discover_jobs, read_manifest, run_batch
+    from .cache import SampleCache
+    from .history import RunHistory
+    from .languageinfo import extension_lookup
+    from .runner import DEFAULT_OUTPUT_LIMIT
+
+    parser = argparse.ArgumentParser(
+        prog="boj-checker batch",
+        description="Check many solutions at once, sharing the config, an HTTP "
+        "session and a pool of workers. Each PATH is a manifest with a PROB_ID "
+        "and a solution path on each line, or a directory searched for "
+        "solutions laid out as PROB_ID/FILE.",
+    )
+    parser.add_argument(
+        "paths", metavar="PATH", nargs="+", help="Manifests or directories"
+    )
+    add_common_arguments(parser)
+    add_compile_arguments(parser)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of solutions to compile and run at once",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Use cached samples only, without accessing the network",
+    )
+    parser.add_argument(
+        "--no-limits",
+        action="store_true",
+        help="Do not enforce the time and memory limits of the problems",
+    )
+    parser.add_argument(
+        "--output-limit",
+        type=int,
+        default=DEFAULT_OUTPUT_LIMIT // (1024 * 1024),
+        help="Kill solutions after this many MB of output and report OLE",
+    )
+    parser.add_argument(
+        "--no-diff", action="store_true", help="Do not include diffs on WA"
+    )
+    parser.add_argument(
+        "--diff-context",
+        type=int,
+        default=3,
+        help="Number of matching lines to show around differences on WA",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json", "junit"],
+        default="text",
+        help="Print the results as text, as a JSON object, or as a JUnit XML " "report",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not add the checks to the run history",
+    )
+    parsed_args = parser.parse_args(args)
+    config = load_config(parsed_args)
+    extensions = set(extension_lookup) | set(config.languageconfig_table)
+    jobs: List["BatchJob"] = []
+    for path in map(Path, parsed_args.paths):
+        if path.is_dir():
+            jobs.extend(discover_jobs(path, extensions))
+            continue
+        try:
+            jobs.extend(read_manifest(path))
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    if not jobs:
+        parser.error("no solutions found")
+    artifact_cache, pch_cache = open_compile_caches(config, parsed_args)
+    history = None if parsed_args.no_history else RunHistory.fromdefault()
+    text = parsed_args.format == "text"
+
+    def progress(job: "BatchJob", report: dict):
+        if report["error"] != None:
+            summary = f"{colorama.Fore.BLUE}{report['error']}{colorama.Style.RESET_ALL}"
+        else:
+            verdicts = [x["verdict"] for x in report["cases"]]
+            passed = sum(x in PASSING_VERDICTS for x in verdicts)
+            verdict = (
+                "AC"
+                if report["passed"]
+                else next(x for x in verdicts if x not in PASSING_VERDICTS)
+            )
+            total_time = sum(x["wall_time"] for x in report["cases"])
+            summary = (
+                f"{VERDICT_COLORS[verdict]}{verdict}{colorama.Style.RESET_ALL} "
+                f"{passed}/{len(verdicts)} "
+                f"{colorama.Style.DIM}{total_time * 1000:.0f} ms"
+                f"{colorama.Style.RESET_ALL}"
+            )
+        print(f"{job.problem_id} {job.source}: {summary}", flush=True)
+
+    try:
+        reports = run_batch(
+            jobs,
+            config,
+            max(parsed_args.jobs, 1),
+            SampleCache.fromdefault(config.sample_cache_ttl),
+            parsed_args.offline,
+            temp_directory_for_command(config, parsed_args),
+            artifact_cache,
+            pch_cache,
+            parsed_args.fork_server,
+            not parsed_args.no_limits,
+            parsed_args.output_limit * 1024 * 1024,
+            None if parsed_args.no_diff else parsed_args.diff_context,
+            history,
+            progress if text else None,
+        )
+    finally:
+        if history != None:
+            history.close()
+    failed = [x for x in reports if not x["passed"]]
+    if parsed_args.format == "json":
+        print(
+            json.dumps(
+                {
+                    "passed": len(reports) - len(failed),
+                    "failed": len(failed),
+                    "reports": reports,
+                },
+                indent=2,
+            )
+        )
+    elif parsed_args.format == "junit":
+        print(junit_xml(reports))
+    else:
+        print(f"\nPassed {len(reports) - len(failed)}/{len(reports)} solutions")
+        for report in failed:
+            print(
+                f"{colorama.Fore.RED}Failed: {report['problem_id']} "
+                f"{report['source']}{colorama.Style.RESET_ALL}"
+            )
+    return EXIT_FAILED if failed else EXIT_PASSED
+
+
+COMMANDS = {
+    "stress": stress_main,
+    "sync": sync_main,
+    "serve": serve_main,
+    "client": client_main,
+    "race": race_main,
+    "bench": bench_main,
+    "history": history_main,
+    "batch": batch_main,
+}
+
+
+def print_check(
+    plan: "CheckPlan",
+    parsed_args: argparse.Namespace,
+    cancel: Union["CancelToken", None] = None,
+) -> List["CaseResult"]:
+    """Run a prepared solution on its test cases and print the verdicts.
+
+    Parameters
+    ----------
+    plan
+        The solution and test cases, returned by `prepare_check`.
+    parsed_args
+        Arguments of the main command.
+    cancel
+        Stop running cases once this token is cancelled. Defaults to `None`.
+
+    Returns
+    -------
+    List[CaseResult]
+        The results of the cases, with their outputs closed. Fewer than the
+        cases if the check was cancelled.
+    """
+    from .check import run_check
+
+    time_limit, memory_limit = (plan.time_limit, plan.memory_limit)
+    if time_limit != None or memory_limit != None:
+        print(
+            f"Time limit: {f'{time_limit:g} s' if time_limit != None else '-'}, "
+            f"memory limit: {f'{memory_limit} MB' if memory_limit != None else '-'}"
+        )
+    results = run_check(
+        plan,
+        max(parsed_args.jobs, 1),
+        parsed_args.output_limit * 1024 * 1024,
+        cancel=cancel,
+    )
+    case_results = []
+    try:
+        for case in plan.cases:
+            print(f"Testing {case.name}: ", end="", flush=True)
+            case_result = next(results)
+            result, verdict = (case_result.result, case_result.verdict)
+            if cancel != None and cancel.cancelled:
+                result.output.close()
+                print(f"{colorama.Fore.BLUE}Cancelled{colorama.Style.RESET_ALL}")
+                break
+            print(
+                f"{VERDICT_COLORS[verdict]}{verdict}{colorama.Style.RESET_ALL} "
+                f"{colorama.Style.DIM}{format_usage(result)}{colorama.Style.RESET_ALL}"
+            )
+            if verdict == "WA" and not parsed_args.no_diff:
+                print_diff(result.output, case.output, parsed_args.diff_context)  # type: ignore
+            result.output.close()
+            case_results.append(case_result)
+    finally:
+        results.close()
+    return case_results
+
+
+def collect_check(plan: "CheckPlan", parsed_args: argparse.Namespace) -> List[dict]:
+    """Run a prepared solution on its test cases without printing anything.
+
+    Parameters
+    ----------
+    plan
+        The solution and test cases, returned by `prepare_check`.
+    parsed_args
+        Arguments of the main command.
+
+    Returns
+    -------
+    List[dict]
+        The result of each case, as returned by `CaseResult.todict`, with the
+        diff of the output under "diff" for WA unless diffs are disabled.
+    """
+    from .check import output_diff, run_check
+
+    cases = []
+    for case_result in run_check(
+        plan, max(parsed_args.jobs, 1), parsed_args.output_limit * 1024 * 1024
+    ):
+        case, result, verdict = case_result
+        diff = None
+        if verdict == "WA" and not parsed_args.no_diff:
+            diff = list(output_diff(result.output, case.output, parsed_args.diff_context))  # type: ignore
+        result.output.close()
+        cases.append(dict(case_result.todict(), diff=diff))
+    return cases
+
+
+def format_report(output_format: str, report: dict) -> str:
+    """Render a check report in a machine-readable format.
+
+    Parameters
+    ----------
+    output_format
+        "json" or "junit".
+    report
+        The report, as returned by `check_report`.
+
+    Returns
+    -------
+    str
+        The rendered report.
+    """
+    if output_format == "junit":
+        return junit_xml([report])
+    return json.dumps(report, indent=2)
+
+
+def record_history(
+    parsed_args: argparse.Namespace,
+    config: CheckerConfig,
+    cases: List[dict],
+    compiled: bool = True,
+):
+    """Add a check to the run history, unless disabled by the arguments.
+
+    Failures to write the history are ignored, as they do not affect the
+    check.
+
+    Parameters
+    ----------
+    parsed_args
+        Arguments of the main command.
+    config
+        The loaded config.
+    cases
+        The result of each case, as returned by `CaseResult.todict`.
+    compiled
+        False if the compilation of the solution failed.
+    """
+    if parsed_args.no_history:
+        return
+    from .history import RunHistory, language_config_key
+    from .runner import hash_file, lookup_language_config
+
+    import sqlite3
+
+    filepath = Path(parsed_args.filepath)
+    language_config = lookup_language_config(filepath, config.languageconfig_table)
+    try:
+        history = RunHistory.fromdefault()
+        try:
+            history.record(
+                parsed_args.probno,
+                filepath,
+                hash_file(filepath),
+                language_config_key(language_config),
+                cases,
+                compiled,
+            )
+        finally:
+            history.close()
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def print_trace_summary(tracer: Tracer):
+    """Print the time spent in each stage recorded by a tracer.
+
+    The summary goes to stderr, so that it does not mix with JSON or JUnit
+    output on stdout.
+
+    Parameters
+    ----------
+    tracer
+        The tracer.
+    """
+    stats = tracer.summary()
+    if not stats:
+        return
+    name_width = max(len(x.name) for x in stats)
+    print(file=sys.stderr)
+    print(
+        f"{'stage':{name_width}}  {'count':>5}  {'total':>10}  {'mean':>10}  "
+        f"{'max':>10}",
+        file=sys.stderr,
+    )
+    for x in stats:
+        print(
+            f"{x.name:{name_width}}  {x.count:>5}  {x.total * 1000:>7.1f} ms  "
+            f"{x.mean * 1000:>7.1f} ms  {x.max * 1000:>7.1f} ms",
+            file=sys.stderr,
+        )
+
+
+def watch_check(parsed_args: argparse.Namespace, config: CheckerConfig) -> int:
+    """Check a solution each time it is saved, until interrupted.
+
+    The samples are fetched once, and a check still running when the solution
+    is saved again is cancelled.
+
+    Parameters
+    ----------
+    parsed_args
+        Arguments of the main command.
+    config
+        The loaded config.
+
+    Returns
+    -------
+    int
+        Exit code of the program
+    """
+    from .check import attach_fork_server, make_plan
+    from .runner import (
+        CancelToken,
+        compile_source_file,
+        lookup_language_config,
+        remove_work_dir,
+    )
+    from .watch import watch_source
+
+    filepath = Path(parsed_args.filepath)
+    temp_directory = temp_directory_for_command(config, parsed_args)
+    try:
+        language_config = lookup_language_config(filepath, config.languageconfig_table)
+    except NotImplementedError:
+        print(f"{colorama.Fore.BLUE}Unknown language{colorama.Style.RESET_ALL}")
+        return EXIT_ERROR
+    problem = fetch_for_command(parsed_args.probno, config, parsed_args)
+    if problem == None:
+        return EXIT_ERROR
+    artifact_cache, pch_cache = open_compile_caches(config, parsed_args)
+    fork_servers: Dict[str, "ForkServer"] = dict()
+
+    def check(cancel: CancelToken):
+        try:
+            executable = compile_source_file(
+                filepath,
+                config.languageconfig_table,
+                temp_directory,
+                artifact_cache,
+                pch_cache,
+            )
+        except ValueError:
+            print(f"{colorama.Fore.BLUE}Compilation Error{colorama.Style.RESET_ALL}")
+            return
+        except OSError as error:
+            # Keep watching, as the next save may fix it.
+            print(
+                f"{colorama.Fore.BLUE}Could not compile the solution: {error}"
+                f"{colorama.Style.RESET_ALL}"
+            )
+            return
+        if cancel.cancelled:
+            remove_work_dir(executable)
+            return
+        try:
+            plan = make_plan(
+                problem,
+                executable,
+                language_config,
+                Path(parsed_args.tests) if parsed_args.tests != None else None,
+                not parsed_args.no_limits,
+                parsed_args.time_limit,
+            )
+            cases = plan.cases
+            print(f"Testing code for {len(cases)} case{'s' if len(cases) != 1 else ''}")
+            if parsed_args.fork_server:
+                try:
+                    plan = plan._replace(
+                        executable=attach_fork_server(executable, fork_servers)
+                    )
+                except OSError:
+                    pass
+            print_check(plan, parsed_args, cancel)
+        except OSError as error:
+            print(
+                f"{colorama.Fore.BLUE}Could not check the solution: {error}"
+                f"{colorama.Style.RESET_ALL}"
+            )
+        finally:
+            remove_work_dir(executable)
+
+    print(f"Watching {filepath}, press Ctrl-C to stop")
+    cancel = None
+    worker = None
+    try:
+        for _ in watch_source(filepath):
+            if worker != None:
+                cancel.cancel()  # type: ignore
+                worker.join()
+                print()
+            cancel = CancelToken()
+            worker = threading.Thread(target=check, args=(cancel,), daemon=True)
+            worker.start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if worker != None:
+            cancel.cancel()  # type: ignore
+            worker.join()
+        for fork_server in fork_servers.values():
+            fork_server.close()
+    return 0
+
+
+def profiles_check(parsed_args: argparse.Namespace, config: CheckerConfig) -> int:
+    """Compare a solution compiled under several profiles.
+
+    The profiles are compiled at once, without the compilation cache or
+    precompiled headers, and then run on the same cases as the solutions of
+    `race`.
+
+    Parameters
+    ----------
+    parsed_args
+        Arguments of the main command.
+    config
+        The loaded config.
+
+    Returns
+    -------
+    int
+        `EXIT_PASSED` if every profile compiled and passed all cases,
+        `EXIT_FAILED` if not, and `EXIT_ERROR` if the profiles could not be
+        compared.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from .boj_parser import fetch_problem
+    from .cache import SampleCache
+    from .check import make_plan
+    from .profiles import build_profiles, lookup_profile, profile_names
+    from .race import race
+    from .runner import remove_work_dir
+
+    filepath = Path(parsed_args.filepath)
+    names = []
+    for name in parsed_args.profiles.split(","):
+        if name.strip() and name.strip() not in names:
+            names.append(name.strip())
+    language_configs = []
+    for name in names:
+        try:
+            language_configs.append(lookup_profile(filepath, name, config))
+        except NotImplementedError:
+            print(f"{colorama.Fore.BLUE}Unknown language{colorama.Style.RESET_ALL}")
+            return EXIT_ERROR
+        except KeyError:
+            print(
+                f"{colorama.Fore.BLUE}Unknown profile: {name}, available: "
+                f"{', '.join(profile_names(filepath, config))}"
+                f"{colorama.Style.RESET_ALL}"
+            )
+            return EXIT_ERROR
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        problem_future = executor.submit(
+            fetch_problem,
+            parsed_args.probno,
+            SampleCache.fromdefault(config.sample_cache_ttl),
+            parsed_args.offline,
+        )
+        builds = build_profiles(
+            filepath,
+            names,
+            language_configs,
+            temp_directory_for_command(config, parsed_args),
+        )
+    built: List["ProfileBuild"] = []
+    for build in builds:
+        if build.executable != None:
+            built.append(build)
+        else:
+            print(
+                f"{colorama.Fore.BLUE}Compilation Error: {build.name}"
+                f"{colorama.Style.RESET_ALL}"
+            )
+    executables = [x.executable for x in built]
+    fork_servers: List["ForkServer"] = []
+    try:
+        try:
+            problem = problem_future.result()
+        except LookupError:
+            print(
+                f"{colorama.Fore.BLUE}Samples of problem {parsed_args.probno} "
+                f"are not cached{colorama.Style.RESET_ALL}"
+            )
+            return EXIT_ERROR
+        if not built:
+            return EXIT_FAILED
+        if parsed_args.fork_server:
+            executables, fork_servers = start_fork_servers(executables)  # type: ignore
+        plans = [
+            make_plan(
+                problem,
+                executable,  # type: ignore
+                build.language_config,
+                Path(parsed_args.tests) if parsed_args.tests != None else None,
+                not parsed_args.no_limits,
+                parsed_args.time_limit,
+            )
+            for executable, build in zip(executables, built)
+        ]
+        if not plans[0].cases:
+            print(
+                f"{colorama.Fore.BLUE}No cases to run for problem "
+                f"{parsed_args.probno}{colorama.Style.RESET_ALL}"
+            )
+            return EXIT_ERROR
+        trials = max(parsed_args.trials, 1)
+        print(
+            f"Comparing {len(plans)} profiles on {len(plans[0].cases)} cases, "
+            f"{trials} trials each"
+        )
+
+        def progress(finished: int, total: int):
+            print(f"\rRunning: {finished}/{total}", end="")
+
+        results = race(
+            plans,
+            trials,
+            parsed_args.output_limit * 1024 * 1024,
+            progress if sys.stdout.isatty() else None,
+        )
+        if sys.stdout.isatty():
+            print()
+        print_race(
+            [x.name for x in built],
+            plans[0].cases,
+            results,
+            [x.compile_time for x in built],
+        )
+    finally:
+        for executable in executables:
+            remove_work_dir(executable)  # type: ignore
+        for fork_server in fork_servers:
+            fork_server.close()
+    if len(built) < len(builds) or not all(x.passed for x in results):
+        return EXIT_FAILED
+    return EXIT_PASSED
 
 
 def main(args: List[str]):
@@ -30,7 +1932,15 @@ def main(args: List[str]):
         colorama.init(strip=True, convert=False)
     else:
         colorama.init()
-    parser = argparse.ArgumentParser(description="Check solutions against sample IO.")
+    if args and args[0] in COMMANDS:
+        return COMMANDS[args[0]](args[1:])
+    from .runner import DEFAULT_OUTPUT_LIMIT
+
+    parser = argparse.ArgumentParser(
+        description="Check solutions against sample IO.",
+        epilog=f"Other commands: {', '.join(COMMANDS)}. "
+        "Run `boj-checker COMMAND --help` for details.",
+    )
     parser.add_argument("--version", action="version", version=__version__)
     parser.add_argument(
         "probno", metavar="PROB_ID", type=int, help="The problem ID for solution"
@@ -38,68 +1948,200 @@ def main(args: List[str]):
     parser.add_argument(
         "filepath", metavar="FILE", type=str, help="The solution code to test"
     )
+    add_common_arguments(parser)
+    add_compile_arguments(parser)
     parser.add_argument(
-        "--no-config", action="store_true", help="Do not load config file"
+        "--no-diff", action="store_true", help="Do not show diffs on WA"
     )
-    parser.add_argument("-c", "--config-file", type=str, help="The path of config file")
     parser.add_argument(
-        "-t", "--temp-directory", type=str, help="Path of temporary directory to use"
+        "--offline",
+        action="store_true",
+        help="Use cached samples only, without accessing the network",
     )
     parser.add_argument(
-        "--no-diff", action="store_true", help="Do not show diffs on WA"
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of samples to run in parallel",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        help="Override the time limit of the problem, in seconds",
+    )
+    parser.add_argument(
+        "--no-limits",
+        action="store_true",
+        help="Do not enforce the time and memory limits of the problem",
+    )
+    parser.add_argument(
+        "--output-limit",
+        type=int,
+        default=DEFAULT_OUTPUT_LIMIT // (1024 * 1024),
+        help="Kill the solution after this many MB of output and report OLE",
+    )
+    parser.add_argument(
+        "--diff-context",
+        type=int,
+        default=3,
+        help="Number of matching lines to show around differences on WA",
+    )
+    parser.add_argument(
+        "--tests",
+        metavar="DIR",
+        type=str,
+        help="Also test against NAME.in/NAME.out pairs in this directory",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Check again each time the solution is saved, until interrupted",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json", "junit"],
+        default="text",
+        help="Print the results as colored text, as a JSON object, or as a "
+        "JUnit XML report",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not add this check to the run history",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        type=str,
+        help="Write the timings of each stage of the check to FILE as Chrome "
+        "trace events, and print a summary of them",
+    )
+    parser.add_argument(
+        "--profiles",
+        metavar="NAMES",
+        type=str,
+        help="Compile the solution under each of these comma-separated profiles "
+        "of the config file, and compare their compile times, runtimes and "
+        "memory usage. Built-in profiles are default and boj",
+    )
+    parser.add_argument(
+        "-n",
+        "--trials",
+        type=int,
+        default=5,
+        help="Number of runs of each case under each profile, with --profiles",
     )
     parsed_args = parser.parse_args(args)
-    samples = fetch_sample_io(parsed_args.probno)
-    filepath = Path(parsed_args.filepath)
-    if parsed_args.config_file != None:
-        config_file_path = Path(parsed_args.config_file)
-    else:
-        config_file_path = (
-            Path(BaseDirectory.save_config_path("boj-checker")) / "config.json"
-        )
-    if parsed_args.temp_directory != None:
-        temp_directory = Path(parsed_args.temp_directory)
-    else:
-        temp_directory = None
+    if parsed_args.watch and parsed_args.format != "text":
+        parser.error("--watch only supports the text format")
+    if parsed_args.profiles != None and (
+        parsed_args.watch or parsed_args.format != "text"
+    ):
+        parser.error("--profiles only supports the text format, without --watch")
+    if parsed_args.trace == None:
+        return check_main(parsed_args)
+    tracer = start_tracing()
     try:
-        if parsed_args.no_config:
-            config = CheckerConfig.fromdefault()
+        with span("check", "cli"):
+            return check_main(parsed_args)
+    finally:
+        stop_tracing()
+        tracer.write(Path(parsed_args.trace))
+        print_trace_summary(tracer)
+
+
+def check_main(parsed_args: argparse.Namespace) -> int:
+    """Check a solution as requested by the arguments of the main command.
+
+    Parameters
+    ----------
+    parsed_args
+        Arguments of the main command.
+
+    Returns
+    -------
+    int
+        `EXIT_PASSED` if all cases passed, `EXIT_FAILED` if a case failed or
+        the compilation failed, and `EXIT_ERROR` if the solution could not be
+        checked.
+    """
+    from .cache import SampleCache
+    from .check import prepare_check
+    from .runner import remove_work_dir
+
+    filepath = Path(parsed_args.filepath)
+    config = load_config(parsed_args)
+    temp_directory = temp_directory_for_command(config, parsed_args)
+    if parsed_args.watch:
+        return watch_check(parsed_args, config)
+    if parsed_args.profiles != None:
+        return profiles_check(parsed_args, config)
+    output_format = parsed_args.format
+
+    def report_error(message: str, exit_code: int) -> int:
+        if output_format == "text":
+            print(f"{colorama.Fore.BLUE}{message}{colorama.Style.RESET_ALL}")
         else:
-            config = CheckerConfig.fromfilepath(config_file_path)
-    except FileNotFoundError:
-        config = CheckerConfig.fromdefault()
-    print(f"Testing code for {len(samples)} sample{'s' if len(samples) > 1 else ''}")
-    for i, sample in enumerate(samples, 1):
-        print(f"Testing sample #{i}: ", end="")
-        input_str, solution = sample
-        try:
-            output, exit_code = run_source_file(
-                filepath, input_str, config.languageconfig_table, temp_directory
-            )
-        except NotImplementedError:
-            print(f"{colorama.Fore.BLUE}Unknown language{colorama.Style.RESET_ALL}")
-            break
-        except ValueError:
-            print(f"{colorama.Fore.BLUE}Compilation Error{colorama.Style.RESET_ALL}")
-            break
+            report = check_report(parsed_args.probno, filepath, None, None, [], message)
+            print(format_report(output_format, report))
+        return exit_code
 
-        if exit_code != 0:
-            print(f"{colorama.Fore.RED}RTE{colorama.Style.RESET_ALL}")
-        elif check_output(solution, output):
-            print(f"{colorama.Fore.GREEN}AC{colorama.Style.RESET_ALL}")
+    artifact_cache, pch_cache = open_compile_caches(config, parsed_args)
+    try:
+        plan = prepare_check(
+            parsed_args.probno,
+            filepath,
+            config,
+            SampleCache.fromdefault(config.sample_cache_ttl),
+            parsed_args.offline,
+            Path(parsed_args.tests) if parsed_args.tests != None else None,
+            temp_directory,
+            artifact_cache,
+            pch_cache,
+            not parsed_args.no_limits,
+            parsed_args.time_limit,
+        )
+    except NotImplementedError:
+        return report_error("Unknown language", EXIT_ERROR)
+    except LookupError:
+        return report_error(
+            f"Samples of problem {parsed_args.probno} are not cached", EXIT_ERROR
+        )
+    except ValueError:
+        record_history(parsed_args, config, [], compiled=False)
+        return report_error("Compilation Error", EXIT_FAILED)
+    except OSError as error:
+        # Errors of requests derive from OSError, so this also covers
+        # problems that cannot be fetched, without importing requests.
+        return report_error(f"Could not check the solution: {error}", EXIT_ERROR)
+    cases = plan.cases
+    if not cases:
+        # An error page or a changed layout of the problem page gives no cases,
+        # which must not count as passing.
+        remove_work_dir(plan.executable)
+        return report_error(
+            f"No cases to run for problem {parsed_args.probno}", EXIT_ERROR
+        )
+    if output_format == "text":
+        print(f"Testing code for {len(cases)} case{'s' if len(cases) != 1 else ''}")
+    fork_servers: List["ForkServer"] = []
+    if parsed_args.fork_server:
+        [executable], fork_servers = start_fork_servers([plan.executable])
+        plan = plan._replace(executable=executable)
+    try:
+        if output_format == "text":
+            case_dicts = [x.todict() for x in print_check(plan, parsed_args)]
         else:
-            print(f"{colorama.Fore.RED}WA{colorama.Style.RESET_ALL}")
-            if not parsed_args.no_diff:
-                print(
-                    f"{colorama.Fore.YELLOW}<<<<<<< Output diff{colorama.Style.RESET_ALL}"
-                )
-                for diff in difflib.ndiff(output.splitlines(), solution.splitlines()):
-                    if diff.startswith("-"):
-                        print(colorama.Fore.RED, end="")
-                    elif diff.startswith("+"):
-                        print(colorama.Fore.GREEN, end="")
-                    elif diff.startswith("?"):
-                        print(colorama.Fore.BLUE, end="")
-                    print(f"{diff}{colorama.Style.RESET_ALL}")
-                print(f"{colorama.Fore.YELLOW}>>>>>>>{colorama.Style.RESET_ALL}\n")
-    clean_temporary_files(filepath, temp_directory)
+            case_dicts = collect_check(plan, parsed_args)
+    finally:
+        remove_work_dir(plan.executable)
+        for fork_server in fork_servers:
+            fork_server.close()
+    record_history(parsed_args, config, case_dicts)
+    report = check_report(
+        parsed_args.probno, filepath, plan.time_limit, plan.memory_limit, case_dicts
+    )
+    if output_format != "text":
+        print(format_report(output_format, report))
+    return EXIT_PASSED if report["passed"] else EXIT_FAILED
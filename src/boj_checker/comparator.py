@@ -0,0 +1,212 @@
+from typing import IO, BinaryIO, Iterable, Iterator, Union
+
+import io
+import tempfile
+
+
+def normalized_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Strip trailing whitespace from lines, dropping trailing blank lines.
+
+    Parameters
+    ----------
+    lines
+        The lines to normalize. Line terminators are stripped as whitespace.
+
+    Returns
+    -------
+    Iterator[str]
+        The normalized lines. Blank lines are held back until a non-blank line
+        follows them, so only a bounded number of lines is kept in memory.
+    """
+    pending_blank = 0
+    for line in lines:
+        line = line.rstrip()
+        if not line:
+            pending_blank += 1
+            continue
+        for _ in range(pending_blank):
+            yield ""
+        pending_blank = 0
+        yield line
+
+
+class OutputComparator:
+    """Compare the output of a program against the expected output as it is
+    produced.
+
+    Lines are compared with trailing whitespace removed and trailing blank
+    lines ignored, like `runner.check_output`. Output is consumed as it
+    arrives, so only the current partial line is kept in memory, and
+    comparison stops at the first mismatch. As long as the output is
+    byte-for-byte identical to the expected output, whole chunks are compared
+    at once; line by line comparison only starts from the first chunk that
+    differs.
+
+    Attributes
+    ----------
+    matched : bool
+        False once a mismatch has been found.
+    mismatch_line : Union[int, None]
+        The 1-based number of the first mismatching line, if any.
+    """
+
+    def __init__(self, expected: Union[str, bytes, BinaryIO]):
+        """Create OutputComparator object.
+
+        Parameters
+        ----------
+        expected
+            The expected output, either as a whole or as a seekable binary file
+            object positioned at its start.
+        """
+        if isinstance(expected, str):
+            expected = expected.encode("utf-8")
+        if isinstance(expected, bytes):
+            expected = io.BytesIO(expected)
+        self.matched = True
+        self.mismatch_line = None
+        self._expected_file = expected
+        self._expected_lines: Union[Iterator[str], None] = None
+        self._partial = b""
+        self._pending_blank = 0
+        self._line_count = 0
+
+    def _expect(self, line: str):
+        self._line_count += 1
+        if next(self._expected_lines, None) != line:  # type: ignore
+            self.matched = False
+            self.mismatch_line = self._line_count
+
+    def _compare_line(self, data: bytes):
+        line = data.decode("utf-8", "replace").rstrip()
+        if not line:
+            self._pending_blank += 1
+            return
+        for _ in range(self._pending_blank):
+            self._expect("")
+            if not self.matched:
+                return
+        self._pending_blank = 0
+        self._expect(line)
+
+    def _start_line_comparison(self):
+        self._expected_lines = normalized_lines(
+            x.decode("utf-8", "replace")
+            for x in iter(self._expected_file.readline, b"")
+        )
+
+    def _compare_block(self, block: bytes):
+        # `block` consists of whole lines, so the expected output is at a line
+        # boundary as well when switching to line by line comparison.
+        if self._expected_lines == None:
+            expected = self._expected_file.read(len(block))
+            if expected == block:
+                self._line_count += block.count(b"\n")
+                return
+            self._expected_file.seek(-len(expected), io.SEEK_CUR)
+            self._start_line_comparison()
+        for line in block[:-1].split(b"\n"):
+            self._compare_line(line)
+            if not self.matched:
+                return
+
+    def feed(self, data: bytes):
+        """Compare a chunk of output.
+
+        Parameters
+        ----------
+        data
+            The next chunk of output. It does not need to end at a line
+            boundary.
+        """
+        if not self.matched:
+            return
+        data = self._partial + data
+        line_end = data.rfind(b"\n")
+        if line_end == -1:
+            self._partial = data
+            return
+        self._partial = data[line_end + 1 :]
+        self._compare_block(data[: line_end + 1])
+        if not self.matched:
+            self._partial = b""
+
+    def finish(self) -> bool:
+        """Compare the rest of the output after the program has exited.
+
+        Returns
+        -------
+        bool
+            True if the whole output matched the expected output.
+        """
+        if not self.matched:
+            return False
+        if self._expected_lines == None:
+            # Trailing whitespace and blank lines are only ignored line by line.
+            self._start_line_comparison()
+        if self._partial:
+            self._compare_line(self._partial)
+            self._partial = b""
+        if self.matched and next(self._expected_lines, None) != None:
+            self.matched = False
+            self.mismatch_line = self._line_count + 1
+        return self.matched
+
+
+class CapturedOutput:
+    """Output of a program, kept in memory up to a size and on disk beyond it.
+
+    Attributes
+    ----------
+    size : int
+        Number of bytes captured.
+    """
+
+    def __init__(self, max_memory: int = 1024 * 1024):
+        """Create CapturedOutput object.
+
+        Parameters
+        ----------
+        max_memory
+            Number of bytes kept in memory before spilling to a temporary file.
+        """
+        self.size = 0
+        self._file: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=max_memory)
+
+    def write(self, data: bytes):
+        """Append a chunk of output.
+
+        Parameters
+        ----------
+        data
+            The chunk to append.
+        """
+        self._file.write(data)
+        self.size += len(data)
+
+    def read(self) -> str:
+        """Read the whole output.
+
+        Returns
+        -------
+        str
+            The output, decoded as UTF-8.
+        """
+        self._file.seek(0)
+        return self._file.read().decode("utf-8", "replace")
+
+    def lines(self) -> Iterator[str]:
+        """Iterate over the lines of the output without loading all of it.
+
+        Returns
+        -------
+        Iterator[str]
+            Lines of the output, without line terminators.
+        """
+        self._file.seek(0)
+        for line in self._file:
+            yield line.decode("utf-8", "replace").rstrip("\r\n")
+
+    def close(self):
+        """Discard the captured output."""
+        self._file.close()
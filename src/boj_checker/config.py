@@ -1,8 +1,15 @@
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 
 import json
 
+# Defaults of the cache settings, kept here rather than in the cache module so
+# that loading the config does not import sqlite3.
+DEFAULT_SAMPLE_TTL = 7 * 24 * 60 * 60
+DEFAULT_ARTIFACT_CACHE_SIZE = 256 * 1024 * 1024
+# A precompiled bits/stdc++.h takes about 100 MiB.
+DEFAULT_PCH_CACHE_SIZE = 512 * 1024 * 1024
+
 
 class LanguageConfig:
     """Configuration of compile, run commands.
@@ -115,6 +122,24 @@ class CheckerConfig:
         A dictionary parsed from config file.
     languageconfig_table : Dict[str, LanguageConfig]
         A dictionary mapping file extension to LanguageConfig object.
+    profile_table : Dict[str, Dict[str, LanguageConfig]]
+        A dictionary mapping file extension to named alternative
+        LanguageConfig objects, for comparing compilers and options. Set by the
+        `profiles` key of the config file, a list of objects with `extension`,
+        `name` and `config` keys.
+    sample_cache_ttl : float
+        Number of seconds cached samples are used without revalidation. Set by
+        the `sample_cache_ttl` key of the config file.
+    artifact_cache_size : int
+        Maximum size of the compilation cache in bytes. Set in MiB by the
+        `artifact_cache_size` key of the config file.
+    pch_cache_size : int
+        Maximum size of the precompiled header cache in bytes. Set in MiB by the
+        `pch_cache_size` key of the config file.
+    temp_dir : Union[pathlib.Path, None]
+        The directory to compile into when compilation results are not cached,
+        such as a RAM-backed /dev/shm, or `None` for the temporary directory of
+        the system. Set by the `temp_dir` key of the config file.
     """
 
     def __init__(self, config_file_content: str):
@@ -128,9 +153,31 @@ class CheckerConfig:
         self.config_dict = json.loads(config_file_content)
         self.languageconfig_table = dict()
         for languageconfig_dict in self.config_dict["language_configs"]:
-            self.languageconfig_table[
-                languageconfig_dict["extension"]
-            ] = LanguageConfig.fromdict(languageconfig_dict["config"])
+            self.languageconfig_table[languageconfig_dict["extension"]] = (
+                LanguageConfig.fromdict(languageconfig_dict["config"])
+            )
+        self.profile_table: Dict[str, Dict[str, LanguageConfig]] = dict()
+        for profile_dict in self.config_dict.get("profiles", []):
+            profiles = self.profile_table.setdefault(profile_dict["extension"], dict())
+            profiles[profile_dict["name"]] = LanguageConfig.fromdict(
+                profile_dict["config"]
+            )
+        self.sample_cache_ttl = float(
+            self.config_dict.get("sample_cache_ttl", DEFAULT_SAMPLE_TTL)
+        )
+        if "artifact_cache_size" in self.config_dict:
+            self.artifact_cache_size = int(
+                self.config_dict["artifact_cache_size"] * 1024 * 1024
+            )
+        else:
+            self.artifact_cache_size = DEFAULT_ARTIFACT_CACHE_SIZE
+        if "pch_cache_size" in self.config_dict:
+            self.pch_cache_size = int(self.config_dict["pch_cache_size"] * 1024 * 1024)
+        else:
+            self.pch_cache_size = DEFAULT_PCH_CACHE_SIZE
+        self.temp_dir: Union[Path, None] = None
+        if self.config_dict.get("temp_dir") != None:
+            self.temp_dir = Path(self.config_dict["temp_dir"]).expanduser()
 
     @classmethod
     def fromdefault(cls) -> "CheckerConfig":
@@ -0,0 +1,401 @@
+"""Daemon keeping the state of boj-checker between checks.
+
+The daemon loads the config, opens the caches, and starts an HTTP session and
+a pool of workers once, then serves checks over a Unix socket. Requests and
+responses are JSON-RPC 2.0 objects, one per line.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Union
+
+from .cache import ArtifactCache, SampleCache, cache_dir_root
+from .check import attach_fork_server, output_diff, prepare_check, run_check
+from .config import CheckerConfig
+from .forkserver import ForkServer
+from .runner import DEFAULT_OUTPUT_LIMIT, remove_work_dir
+
+import inspect
+import json
+import os
+import socket
+import socketserver
+import threading
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# Errors of the check method, with the messages the command line prints.
+UNKNOWN_LANGUAGE = 1
+NOT_CACHED = 2
+COMPILATION_ERROR = 3
+NO_CASES = 4
+
+
+def default_socket_path() -> Path:
+    """Find the default path of the socket of the daemon.
+
+    Returns
+    -------
+    pathlib.Path
+        A path in `XDG_RUNTIME_DIR`, or in the cache directory if it is not
+        set.
+    """
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "boj-checker.sock"
+    return cache_dir_root() / "boj-checker.sock"
+
+
+class RPCError(Exception):
+    """An error response of a JSON-RPC call.
+
+    Attributes
+    ----------
+    code : int
+        The error code.
+    message : str
+        The error message.
+    """
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class CheckerDaemon:
+    """State shared by the checks served by a daemon.
+
+    Attributes
+    ----------
+    config : CheckerConfig
+        The loaded config.
+    socket_path : pathlib.Path
+        The path of the socket the daemon listens on.
+    """
+
+    def __init__(
+        self,
+        config: CheckerConfig,
+        socket_path: Path,
+        temp_dir: Union[Path, None] = None,
+        use_cache: bool = True,
+        use_pch: bool = True,
+        use_fork_server: bool = False,
+        jobs: int = os.cpu_count() or 1,
+        sample_cache: Union[SampleCache, None] = None,
+    ):
+        """Create CheckerDaemon object, and start listening on its socket.
+
+        Parameters
+        ----------
+        config
+            The loaded config.
+        socket_path
+            The path of the socket to listen on. A stale socket left by a
+            daemon that is not running any more is replaced.
+        temp_dir
+            Passed to `compile_source_file`.
+        use_cache
+            If set to False, do not reuse or store compilation results.
+        use_pch
+            If set to False, do not use precompiled headers.
+        use_fork_server
+            If set to True, run Python solutions with fork servers, started on
+            first use and kept for later checks.
+        jobs
+            Number of workers running solutions, shared by all checks.
+        sample_cache
+            The sample cache to use. Defaults to `None`, which opens the
+            default one.
+
+        Raises
+        ------
+        OSError
+            If another daemon is listening on `socket_path`.
+        """
+        import requests
+
+        self.config = config
+        self.socket_path = socket_path
+        self._temp_dir = temp_dir
+        if sample_cache == None:
+            sample_cache = SampleCache.fromdefault(config.sample_cache_ttl)
+        self._sample_cache = sample_cache
+        self._session = requests.Session()
+        self._artifact_cache = (
+            ArtifactCache.fromdefault(config.artifact_cache_size) if use_cache else None
+        )
+        self._pch_cache = (
+            ArtifactCache.fromdefault(config.pch_cache_size, "pch") if use_pch else None
+        )
+        self._use_fork_server = use_fork_server
+        self._fork_servers: Dict[str, ForkServer] = dict()
+        self._fork_server_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(jobs, 1))
+        self._methods: Dict[str, Callable[..., Any]] = {
+            "check": self.check,
+            "ping": self.ping,
+            "shutdown": self.shutdown,
+        }
+        self._remove_stale_socket()
+        os.makedirs(socket_path.parent, exist_ok=True)
+        self._server = socketserver.ThreadingUnixStreamServer(
+            str(socket_path), self._handler_class()
+        )
+        self._server.daemon_threads = True
+
+    def _remove_stale_socket(self):
+        if not self.socket_path.exists():
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(str(self.socket_path))
+            except ConnectionRefusedError:
+                os.remove(self.socket_path)
+                return
+        raise OSError(f"A daemon is already listening on {self.socket_path}")
+
+    def _handler_class(self) -> type:
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    response = daemon.handle_request(line)
+                    if response != None:
+                        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                        self.wfile.flush()
+
+        return Handler
+
+    def handle_request(self, line: bytes) -> Union[dict, None]:
+        """Handle a JSON-RPC request.
+
+        Parameters
+        ----------
+        line
+            The encoded request.
+
+        Returns
+        -------
+        Union[dict, None]
+            The response, or `None` if the request is a notification.
+        """
+        try:
+            request = json.loads(line.decode("utf-8"))
+        except ValueError:
+            return _error_response(None, PARSE_ERROR, "Parse error")
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error_response(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        method = self._methods.get(request["method"])
+        params = request.get("params", dict())
+        try:
+            if method == None:
+                raise RPCError(METHOD_NOT_FOUND, "Method not found")
+            if not isinstance(params, dict):
+                raise RPCError(INVALID_PARAMS, "Params must be an object")
+            try:
+                inspect.signature(method).bind(**params)
+            except TypeError as e:
+                raise RPCError(INVALID_PARAMS, str(e))
+            result = method(**params)
+        except RPCError as e:
+            response = _error_response(request_id, e.code, e.message)
+        except Exception as e:
+            response = _error_response(request_id, INTERNAL_ERROR, repr(e))
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        if "id" not in request:
+            return None
+        return response
+
+    def ping(self) -> str:
+        """Check if the daemon is running.
+
+        Returns
+        -------
+        str
+            "pong".
+        """
+        return "pong"
+
+    def shutdown(self) -> None:
+        """Stop serving after the current requests are answered."""
+        threading.Thread(target=self._server.shutdown).start()
+
+    def check(
+        self,
+        problem_id: int,
+        filepath: str,
+        tests_dir: Union[str, None] = None,
+        offline: bool = False,
+        use_limits: bool = True,
+        time_limit: Union[float, None] = None,
+        output_limit: Union[int, None] = DEFAULT_OUTPUT_LIMIT,
+        diff_context: Union[int, None] = 3,
+    ) -> dict:
+        """Check a solution against the samples of a problem.
+
+        Parameters
+        ----------
+        problem_id
+            The ID of the problem.
+        filepath
+            The absolute path of the solution.
+        tests_dir
+            The absolute path of a directory of local test cases to add.
+        offline
+            Passed to `fetch_problem`.
+        use_limits
+            If set to False, do not enforce the limits of the problem.
+        time_limit
+            Overrides the time limit of the problem, in seconds.
+        output_limit
+            Number of bytes of output after which each run is killed.
+        diff_context
+            Number of matching lines to show around differences on WA, or
+            `None` for no diffs.
+
+        Returns
+        -------
+        dict
+            The limits of the problem, and the name, verdict, resource usage,
+            exit code and diff of each case.
+
+        Raises
+        ------
+        RPCError
+            If the language is unknown, the problem is not cached in offline
+            mode, the compilation failed, or there are no cases to run.
+        """
+        source_path = Path(filepath)
+        try:
+            plan = prepare_check(
+                problem_id,
+                source_path,
+                self.config,
+                self._sample_cache,
+                offline,
+                Path(tests_dir) if tests_dir != None else None,
+                self._temp_dir,
+                self._artifact_cache,
+                self._pch_cache,
+                use_limits,
+                time_limit,
+                self._session,
+            )
+        except NotImplementedError:
+            raise RPCError(UNKNOWN_LANGUAGE, "Unknown language")
+        except LookupError:
+            raise RPCError(
+                NOT_CACHED, f"Samples of problem {problem_id} are not cached"
+            )
+        except ValueError:
+            raise RPCError(COMPILATION_ERROR, "Compilation Error")
+        if not plan.cases:
+            remove_work_dir(plan.executable)
+            raise RPCError(NO_CASES, f"No cases to run for problem {problem_id}")
+        if self._use_fork_server:
+            with self._fork_server_lock:
+                try:
+                    plan = plan._replace(
+                        executable=attach_fork_server(
+                            plan.executable, self._fork_servers
+                        )
+                    )
+                except OSError:
+                    pass
+        cases = []
+        try:
+            for case_result in run_check(
+                plan, output_limit=output_limit, executor=self._executor
+            ):
+                case, result, verdict = case_result
+                diff = None
+                if verdict == "WA" and diff_context != None:
+                    diff = list(output_diff(result.output, case.output, diff_context))  # type: ignore
+                result.output.close()
+                cases.append(dict(case_result.todict(), diff=diff))
+        finally:
+            remove_work_dir(plan.executable)
+        return {
+            "problem_id": problem_id,
+            "time_limit": plan.time_limit,
+            "memory_limit": plan.memory_limit,
+            "cases": cases,
+        }
+
+    def serve_forever(self):
+        """Serve requests until the shutdown method is called."""
+        self._server.serve_forever()
+
+    def close(self):
+        """Stop listening and release the held resources."""
+        self._server.server_close()
+        try:
+            os.remove(self.socket_path)
+        except FileNotFoundError:
+            pass
+        self._executor.shutdown()
+        self._session.close()
+        for fork_server in self._fork_servers.values():
+            fork_server.close()
+
+    def __enter__(self) -> "CheckerDaemon":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _error_response(request_id: Any, code: int, message: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def call(socket_path: Path, method: str, params: Union[dict, None] = None) -> Any:
+    """Call a method of a running daemon.
+
+    Parameters
+    ----------
+    socket_path
+        The path of the socket of the daemon.
+    method
+        The name of the method.
+    params
+        The arguments of the method by name.
+
+    Returns
+    -------
+    Any
+        The result of the method.
+
+    Raises
+    ------
+    OSError
+        If no daemon is listening on `socket_path`.
+    RPCError
+        If the daemon responded with an error.
+    """
+    request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise OSError("The daemon closed the connection")
+    response = json.loads(line.decode("utf-8"))
+    if "error" in response:
+        raise RPCError(response["error"]["code"], response["error"]["message"])
+    return response["result"]
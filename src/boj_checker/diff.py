@@ -0,0 +1,206 @@
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def first_difference(a: Sequence[str], b: Sequence[str]) -> int:
+    """Find the first line where two sequences of lines differ.
+
+    Parameters
+    ----------
+    a
+        The first sequence.
+    b
+        The second sequence.
+
+    Returns
+    -------
+    int
+        Index of the first differing line. Equal to the length of the shorter
+        sequence if one is a prefix of the other.
+    """
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    return min(len(a), len(b))
+
+
+def _myers(a: List[int], b: List[int], max_edits: int) -> List[Opcode]:
+    n, m = len(a), len(b)
+    offset = max_edits + 1
+    v = [0] * (2 * offset + 1)
+    trace = []
+    for d in range(max_edits + 1):
+        trace.append(v[offset - d : offset + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m, d)
+    return [("replace", 0, n, 0, m)]
+
+
+def _backtrack(trace: List[List[int]], n: int, m: int, edits: int) -> List[Opcode]:
+    # trace[d] holds the furthest x reached on each diagonal k in [-d, d]
+    # before step d, at index k + d.
+    opcodes: List[Opcode] = []
+
+    def add(tag: str, i1: int, i2: int, j1: int, j2: int):
+        if i1 == i2 and j1 == j2:
+            return
+        if opcodes and opcodes[-1][0] == tag:
+            _, _, last_i2, _, last_j2 = opcodes[-1]
+            opcodes[-1] = (tag, i1, last_i2, j1, last_j2)
+        else:
+            opcodes.append((tag, i1, i2, j1, j2))
+
+    x, y = n, m
+    for d in range(edits, 0, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1 + d] < v[k + 1 + d]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k + d]
+        prev_y = prev_x - prev_k
+        if prev_k == k + 1:
+            mid_x, mid_y = prev_x, prev_y + 1
+        else:
+            mid_x, mid_y = prev_x + 1, prev_y
+        add("equal", mid_x, x, mid_y, y)
+        if prev_k == k + 1:
+            add("insert", prev_x, prev_x, prev_y, mid_y)
+        else:
+            add("delete", prev_x, mid_x, prev_y, prev_y)
+        x, y = prev_x, prev_y
+    add("equal", 0, x, 0, y)
+    opcodes.reverse()
+    return opcodes
+
+
+def diff_opcodes(
+    a: Sequence[str], b: Sequence[str], max_edits: int = 1000
+) -> List[Opcode]:
+    """Compute a line diff of two sequences.
+
+    Common leading and trailing lines are skipped in linear time, and the rest
+    is diffed with Myers' algorithm on hashed lines, which takes O((N + M) D)
+    time for D differing lines.
+
+    Parameters
+    ----------
+    a
+        The first sequence.
+    b
+        The second sequence.
+    max_edits
+        The maximum number of differing lines to look for. If the sequences
+        differ more than that, the part between the common prefix and suffix is
+        reported as replaced as a whole.
+
+    Returns
+    -------
+    List[Tuple[str, int, int, int, int]]
+        Opcodes in the format of `difflib.SequenceMatcher.get_opcodes`, with
+        tags "equal", "delete", "insert" and "replace".
+    """
+    prefix = first_difference(a, b)
+    suffix = 0
+    while (
+        suffix < len(a) - prefix
+        and suffix < len(b) - prefix
+        and a[len(a) - suffix - 1] == b[len(b) - suffix - 1]
+    ):
+        suffix += 1
+    line_ids: Dict[str, int] = dict()
+    a_ids = [line_ids.setdefault(x, len(line_ids)) for x in a[prefix : len(a) - suffix]]
+    b_ids = [line_ids.setdefault(x, len(line_ids)) for x in b[prefix : len(b) - suffix]]
+
+    opcodes: List[Opcode] = []
+    if prefix > 0:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    if a_ids or b_ids:
+        for tag, i1, i2, j1, j2 in _myers(a_ids, b_ids, max_edits):
+            opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    if suffix > 0:
+        opcodes.append(("equal", len(a) - suffix, len(a), len(b) - suffix, len(b)))
+    return opcodes
+
+
+def render_diff(
+    a: Sequence[str],
+    b: Sequence[str],
+    context: int = 3,
+    max_lines: int = 200,
+    max_edits: int = 1000,
+) -> Iterator[str]:
+    """Render a line diff of two sequences, showing only the lines around
+    differences.
+
+    Parameters
+    ----------
+    a
+        The first sequence, whose lines are prefixed with "- ".
+    b
+        The second sequence, whose lines are prefixed with "+ ".
+    context
+        Number of equal lines to show around each difference.
+    max_lines
+        Maximum number of lines to render. The diff is cut off with a "..."
+        line beyond that.
+    max_edits
+        Passed to `diff_opcodes`.
+
+    Returns
+    -------
+    Iterator[str]
+        Lines of the diff. Hunks start with a "@@ -i,n +j,m @@" header, as in
+        unified diffs.
+    """
+    opcodes = diff_opcodes(a, b, max_edits)
+    if not opcodes:
+        return
+    # Grouping as in difflib.SequenceMatcher.get_grouped_opcodes
+    tag, i1, i2, j1, j2 = opcodes[0]
+    if tag == "equal":
+        opcodes[0] = (tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2)
+    tag, i1, i2, j1, j2 = opcodes[-1]
+    if tag == "equal":
+        opcodes[-1] = (tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context))
+    groups: List[List[Opcode]] = []
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal" and i2 - i1 > context * 2:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    groups.append(group)
+    groups = [x for x in groups if any(y[0] != "equal" for y in x)]
+
+    rendered = 0
+    for group in groups:
+        i1, j1 = group[0][1], group[0][3]
+        i2, j2 = group[-1][2], group[-1][4]
+        lines = [f"@@ -{i1 + 1},{i2 - i1} +{j1 + 1},{j2 - j1} @@"]
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                lines.extend(f"  {x}" for x in a[i1:i2])
+                continue
+            lines.extend(f"- {x}" for x in a[i1:i2])
+            lines.extend(f"+ {x}" for x in b[j1:j2])
+        for line in lines:
+            if rendered >= max_lines:
+                yield "..."
+                return
+            yield line
+            rendered += 1
@@ -0,0 +1,317 @@
+"""Fork server for Python solutions.
+
+A fork server is a Python interpreter started once, which forks a child for
+each run instead of starting a new interpreter. This module is also run as a
+script by the interpreter of the solution, which may differ from the one
+running boj-checker, so it may only import the standard library.
+"""
+
+from typing import List, Tuple, Union
+
+import array
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+
+# Sent from the server to each run: the pid of the child, a byte once it has
+# exited, and its wait status and resource usage once it has been reaped.
+_PID = struct.Struct("i")
+_USAGE = struct.Struct("iddl")
+_FD_COUNT = 4
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise OSError("Fork server closed the connection")
+        data += chunk
+    return data
+
+
+def supported_interpreter(command: List[str]) -> bool:
+    """Check if a run command can be served by a fork server.
+
+    Parameters
+    ----------
+    command
+        The run command of a scripted source.
+
+    Returns
+    -------
+    bool
+        True if the command runs a script with a Python interpreter without any
+        interpreter options.
+    """
+    if len(command) < 2 or command[1].startswith("-"):
+        return False
+    name = os.path.basename(command[0])
+    return name.startswith("python") or name.startswith("pypy")
+
+
+class ForkedProcess:
+    """A child forked by a fork server.
+
+    The child is not a child of this process, so it is waited for through
+    the fork server. It is only reaped after `reap` is called, so its pid stays
+    valid until then.
+
+    Attributes
+    ----------
+    pid : int
+        The process ID of the child.
+    """
+
+    def __init__(self, sock: socket.socket):
+        """Create ForkedProcess object.
+
+        Parameters
+        ----------
+        sock
+            The connection to the fork server for this child.
+        """
+        self._sock = sock
+        (self.pid,) = _PID.unpack(_recv_exactly(sock, _PID.size))
+
+    def wait_exit(self):
+        """Wait until the child exits, without reaping it."""
+        _recv_exactly(self._sock, 1)
+
+    def reap(self) -> Tuple[int, float, float, int]:
+        """Reap the child after it has exited.
+
+        Returns
+        -------
+        Tuple[int, float, float, int]
+            The wait status, user time, system time and peak resident set size
+            in KiB of the child.
+        """
+        self._sock.sendall(b"A")
+        usage = _USAGE.unpack(_recv_exactly(self._sock, _USAGE.size))
+        self._sock.close()
+        return usage
+
+
+class ForkServer:
+    """A Python interpreter forking a child to run a script on request.
+
+    Children start from the state of an interpreter that has imported only a
+    few standard library modules, and run the script as `__main__`, so runs
+    behave as with a new interpreter without paying for its startup. The
+    `random` module is reseeded in each child, but the hash seed of strings and
+    bytes is fixed when the interpreter starts, so it is the same in every run,
+    and so is the iteration order of sets of strings. Modules imported by the
+    server, such as `json` and `socket`, are already imported in the children.
+
+    Attributes
+    ----------
+    interpreter : List[str]
+        The command of the interpreter.
+    startup_time : float
+        Number of seconds it took for the interpreter to start, which runs do
+        not pay for.
+    """
+
+    def __init__(self, interpreter: List[str]):
+        """Start a fork server.
+
+        Parameters
+        ----------
+        interpreter
+            The command of the interpreter, such as ["python3"].
+        """
+        from subprocess import DEVNULL, Popen
+
+        self.interpreter = interpreter
+        self._control, server_control = socket.socketpair(
+            socket.AF_UNIX, socket.SOCK_SEQPACKET
+        )
+        start_time = time.perf_counter()
+        self._process = Popen(
+            interpreter + [os.path.abspath(__file__), str(server_control.fileno())],
+            stdin=DEVNULL,
+            stdout=DEVNULL,
+            pass_fds=[server_control.fileno()],
+        )
+        server_control.close()
+        if self._control.recv(1) != b"R":
+            self.close()
+            raise OSError(f"Fork server {interpreter} failed to start")
+        self.startup_time = time.perf_counter() - start_time
+
+    def spawn(
+        self,
+        argv: List[str],
+        cwd: Union[str, None],
+        stdin: int,
+        stdout: int,
+        stderr: int,
+    ) -> ForkedProcess:
+        """Fork a child running a script.
+
+        Parameters
+        ----------
+        argv
+            The path of the script followed by its arguments.
+        cwd
+            The working directory of the child, or `None` for the working
+            directory of the fork server.
+        stdin
+            File descriptor to use as the stdin of the child.
+        stdout
+            File descriptor to use as the stdout of the child.
+        stderr
+            File descriptor to use as the stderr of the child.
+
+        Returns
+        -------
+        ForkedProcess
+            The forked child.
+        """
+        sock, server_sock = socket.socketpair()
+        try:
+            fds = array.array("i", [server_sock.fileno(), stdin, stdout, stderr])
+            self._control.sendmsg(
+                [json.dumps({"argv": argv, "cwd": cwd}).encode("utf-8")],
+                [(socket.SOL_SOCKET, socket.SCM_RIGHTS, fds)],
+            )
+        finally:
+            server_sock.close()
+        return ForkedProcess(sock)
+
+    def close(self):
+        """Stop the fork server. Running children are not affected."""
+        self._control.close()
+        self._process.wait()
+
+    def __enter__(self) -> "ForkServer":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _run_child(request: dict, fds: List[int]):
+    _, stdin, stdout, stderr = fds
+    for target, fd in enumerate([stdin, stdout, stderr]):
+        os.dup2(fd, target)
+    for fd in fds:
+        if fd > 2:
+            os.close(fd)
+    if request["cwd"] != None:
+        os.chdir(request["cwd"])
+    argv = request["argv"]
+    sys.argv = argv
+    sys.path[0] = os.path.dirname(os.path.abspath(argv[0]))
+    # Otherwise every child would continue from the state of the server. The
+    # random module of CPython reseeds itself after a fork, but this does not
+    # rely on it.
+    random = sys.modules.get("random")
+    if random != None:
+        random.seed()
+
+    import atexit
+    import runpy
+
+    try:
+        runpy.run_path(argv[0], run_name="__main__")
+        exit_code = 0
+    except SystemExit as e:
+        if e.code == None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        exc_type, exc, traceback = sys.exc_info()
+        # Hide the frames of this module and runpy, as in a new interpreter.
+        script_traceback = traceback
+        while (
+            script_traceback != None
+            and script_traceback.tb_frame.f_code.co_filename != argv[0]
+        ):
+            script_traceback = script_traceback.tb_next
+        if script_traceback != None:
+            exc.with_traceback(script_traceback)  # type: ignore
+            traceback = script_traceback
+        sys.excepthook(exc_type, exc, traceback)
+        exit_code = 1
+    atexit._run_exitfuncs()  # type: ignore
+    for stream in [sys.stdout, sys.stderr]:
+        try:
+            stream.flush()
+        except Exception:
+            exit_code = 120
+    os._exit(exit_code)
+
+
+def _monitor(request: dict, fds: List[int]):
+    # The server ignores SIGCHLD so that monitors are reaped automatically,
+    # but the monitor waits for the child itself.
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    sock = socket.socket(fileno=fds[0])
+    pid = os.fork()
+    if pid == 0:
+        sock.detach()
+        try:
+            _run_child(request, fds)
+        except BaseException:
+            sys.excepthook(*sys.exc_info())
+        os._exit(1)
+    for fd in fds[1:]:
+        os.close(fd)
+    sock.sendall(_PID.pack(pid))
+    if hasattr(os, "waitid"):
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+    sock.sendall(b"E")
+    sock.recv(1)
+    _, status, rusage = os.wait4(pid, 0)
+    max_rss = rusage.ru_maxrss
+    if sys.platform == "darwin":
+        max_rss //= 1024
+    sock.sendall(_USAGE.pack(status, rusage.ru_utime, rusage.ru_stime, max_rss))
+
+
+def serve(control_fd: int):
+    """Serve requests from `ForkServer` until the control socket is closed.
+
+    Parameters
+    ----------
+    control_fd
+        File descriptor of the control socket.
+    """
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    control = socket.socket(fileno=control_fd)
+    control.sendall(b"R")
+    fd_size = socket.CMSG_SPACE(_FD_COUNT * array.array("i").itemsize)
+    while True:
+        data, ancdata, _, _ = control.recvmsg(65536, fd_size)
+        if not data:
+            break
+        fds = array.array("i")
+        for level, kind, fd_data in ancdata:
+            if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                fds.frombytes(fd_data[: len(fd_data) - len(fd_data) % fds.itemsize])
+        if len(fds) != _FD_COUNT:
+            for fd in fds:
+                os.close(fd)
+            continue
+        if os.fork() == 0:
+            control.close()
+            try:
+                _monitor(json.loads(data.decode("utf-8")), list(fds))
+            finally:
+                os._exit(0)
+        for fd in fds:
+            os.close(fd)
+
+
+if __name__ == "__main__":
+    serve(int(sys.argv[1]))
@@ -0,0 +1,253 @@
+from pathlib import Path
+from typing import List, NamedTuple, Union
+from xdg import BaseDirectory
+
+from .config import LanguageConfig
+from .report import PASSING_VERDICTS
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+def data_dir_root() -> Path:
+    """Fetch the location of the data directory according to XDG standard.
+
+    Returns
+    -------
+    pathlib.Path
+        Path object of data directory
+    """
+    return Path(BaseDirectory.save_data_path("boj-checker"))
+
+
+def language_config_key(language_config: LanguageConfig) -> str:
+    """Create a key identifying a language config.
+
+    Parameters
+    ----------
+    language_config
+        The language config.
+
+    Returns
+    -------
+    str
+        SHA-256 digest of the language type and the command templates.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(
+        json.dumps(
+            [
+                language_config.language_type,
+                language_config.compile_command_template,
+                language_config.run_command_template,
+            ]
+        ).encode("utf-8")
+    )
+    return hasher.hexdigest()
+
+
+class HistoryEntry(NamedTuple):
+    """A recorded check of a solution.
+
+    Attributes
+    ----------
+    run_id : int
+        The ID of the record, increasing with time.
+    recorded_at : float
+        UNIX timestamp of the check.
+    problem_id : int
+        The ID of the problem.
+    source : str
+        The absolute path of the solution.
+    source_hash : str
+        SHA-256 digest of the content of the solution.
+    config_key : str
+        The key of the language config, as returned by `language_config_key`.
+    verdicts : List[str]
+        The verdict of each case, or a single "CE" if the compilation failed.
+    total_time : float
+        Sum of the wall times of the cases in seconds.
+    max_time : float
+        Wall time of the slowest case in seconds.
+    max_rss : int
+        Peak resident set size over the cases, in KiB.
+    """
+
+    run_id: int
+    recorded_at: float
+    problem_id: int
+    source: str
+    source_hash: str
+    config_key: str
+    verdicts: List[str]
+    total_time: float
+    max_time: float
+    max_rss: int
+
+    @property
+    def passed(self) -> bool:
+        """True if there were cases to run, and every case passed."""
+        return bool(self.verdicts) and all(x in PASSING_VERDICTS for x in self.verdicts)
+
+
+class RunHistory:
+    """On-disk record of checks, for following the runtime of solutions.
+
+    An object can be shared between threads.
+
+    Attributes
+    ----------
+    db_path : pathlib.Path
+        Path of the SQLite database backing the history.
+    """
+
+    def __init__(self, db_path: Path):
+        """Create RunHistory object.
+
+        Parameters
+        ----------
+        db_path
+            Path of the SQLite database. Created if it does not exist.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "run_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "recorded_at REAL NOT NULL, "
+            "problem_id INTEGER NOT NULL, "
+            "source TEXT NOT NULL, "
+            "source_hash TEXT NOT NULL, "
+            "config_key TEXT NOT NULL, "
+            "verdicts TEXT NOT NULL, "
+            "total_time REAL NOT NULL, "
+            "max_time REAL NOT NULL, "
+            "max_rss INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS runs_problem ON runs (problem_id, source)"
+        )
+        self._connection.commit()
+
+    @classmethod
+    def fromdefault(cls) -> "RunHistory":
+        """Create RunHistory located in the XDG data directory.
+
+        Returns
+        -------
+        RunHistory
+            Created object.
+        """
+        return cls(data_dir_root() / "history.db")
+
+    def record(
+        self,
+        problem_id: int,
+        source: Path,
+        source_hash: str,
+        config_key: str,
+        cases: List[dict],
+        compiled: bool = True,
+    ) -> int:
+        """Record a check.
+
+        Parameters
+        ----------
+        problem_id
+            The ID of the problem.
+        source
+            The path of the solution.
+        source_hash
+            SHA-256 digest of the content of the solution.
+        config_key
+            The key of the language config, as returned by
+            `language_config_key`.
+        cases
+            The result of each case, as returned by `CaseResult.todict`.
+        compiled
+            False if the compilation of the solution failed.
+
+        Returns
+        -------
+        int
+            The ID of the record.
+        """
+        verdicts = [x["verdict"] for x in cases] if compiled else ["CE"]
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (recorded_at, problem_id, source, source_hash, "
+                "config_key, verdicts, total_time, max_time, max_rss) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(),
+                    problem_id,
+                    str(source.resolve()),
+                    source_hash,
+                    config_key,
+                    json.dumps(verdicts),
+                    sum(x["wall_time"] for x in cases),
+                    max((x["wall_time"] for x in cases), default=0.0),
+                    max((x["max_rss"] for x in cases), default=0),
+                ),
+            )
+            self._connection.commit()
+        return cursor.lastrowid
+
+    def entries(
+        self,
+        problem_id: Union[int, None] = None,
+        source: Union[Path, None] = None,
+        limit: Union[int, None] = None,
+    ) -> List[HistoryEntry]:
+        """Look up recorded checks.
+
+        Parameters
+        ----------
+        problem_id
+            Only return checks of this problem. Defaults to `None`, which
+            returns checks of all problems.
+        source
+            Only return checks of the solution at this path. Defaults to
+            `None`, which returns checks of all solutions.
+        limit
+            Only return this many of the latest checks. Defaults to `None`,
+            which returns all checks.
+
+        Returns
+        -------
+        List[HistoryEntry]
+            The checks, oldest first.
+        """
+        conditions = []
+        params: list = []
+        if problem_id != None:
+            conditions.append("problem_id = ?")
+            params.append(problem_id)
+        if source != None:
+            conditions.append("source = ?")
+            params.append(str(source.resolve()))
+        query = (
+            "SELECT run_id, recorded_at, problem_id, source, source_hash, "
+            "config_key, verdicts, total_time, max_time, max_rss FROM runs"
+        )
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY run_id DESC"
+        if limit != None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [
+            HistoryEntry(*x[:6], json.loads(x[6]), *x[7:])  # type: ignore
+            for x in reversed(rows)
+        ]
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
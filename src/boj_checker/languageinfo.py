@@ -1,7 +1,12 @@
 from pathlib import Path
-from typing import Callable, List, NamedTuple, Union
+from subprocess import PIPE, STDOUT, run
+from typing import Callable, List, NamedTuple, Tuple, Union
 from .config import LanguageConfig
 
+import functools
+import os
+import shutil
+
 
 class LanguageInfo(NamedTuple):
     language_type: str
@@ -31,3 +36,165 @@ extension_lookup = {
         "compiled", ["rustc", "{source_path}", "-o", "{exec_path}"], ["{exec_path}"]
     ),
 }
+
+
+# Compile and run commands of the BOJ judge, keyed by extension. See
+# https://www.acmicpc.net/help/language
+judge_extension_lookup = {
+    "py": LanguageConfig("scripted", [], ["python3", "-W", "ignore", "{source_path}"]),
+    "c": LanguageConfig(
+        "compiled",
+        [
+            "gcc",
+            "{source_path}",
+            "-o",
+            "{exec_path}",
+            "-O2",
+            "-Wall",
+            "-lm",
+            "-static",
+            "-std=gnu11",
+            "-DONLINE_JUDGE",
+            "-DBOJ",
+        ],
+        ["{exec_path}"],
+    ),
+    "cc": LanguageConfig(
+        "compiled",
+        [
+            "g++",
+            "{source_path}",
+            "-o",
+            "{exec_path}",
+            "-O2",
+            "-Wall",
+            "-lm",
+            "-static",
+            "-std=gnu++17",
+            "-DONLINE_JUDGE",
+            "-DBOJ",
+        ],
+        ["{exec_path}"],
+    ),
+    "java": LanguageConfig(
+        "fixed_exec",
+        [
+            "javac",
+            "-release",
+            "11",
+            "-J-Xms1024m",
+            "-J-Xmx1920m",
+            "-J-Xss512m",
+            "-encoding",
+            "UTF-8",
+            "{source_path}",
+            "-d",
+            "{exec_path}",
+        ],
+        [
+            "java",
+            "-Xms1024m",
+            "-Xmx1920m",
+            "-Xss512m",
+            "-Dfile.encoding=UTF-8",
+            "-XX:+UseSerialGC",
+            "Main",
+        ],
+    ),
+    "rs": LanguageConfig(
+        "compiled",
+        ["rustc", "--edition", "2021", "-O", "-o", "{exec_path}", "{source_path}"],
+        ["{exec_path}"],
+    ),
+}
+
+
+class ExtraLimit(NamedTuple):
+    time_multiplier: float
+    time_addition: float
+    memory_multiplier: float
+    memory_addition: int
+
+
+# Extra time/memory BOJ gives to slower runtimes, keyed by the name of the
+# program in the run command. See https://www.acmicpc.net/help/language
+extra_limit_lookup = {
+    "python": ExtraLimit(3, 2, 2, 32),
+    "python3": ExtraLimit(3, 2, 2, 32),
+    "pypy3": ExtraLimit(3, 2, 2, 128),
+    "java": ExtraLimit(2, 1, 2, 16),
+}
+
+
+def language_limits(
+    language_config: LanguageConfig,
+    time_limit: Union[float, None],
+    memory_limit: Union[int, None],
+    extra_time: bool = True,
+) -> Tuple[Union[float, None], Union[int, None]]:
+    """Calculate the limits BOJ applies to a language.
+
+    Parameters
+    ----------
+    language_config
+        The language config of the solution.
+    time_limit
+        The time limit of the problem in seconds.
+    memory_limit
+        The memory limit of the problem in MB.
+    extra_time
+        Whether the problem gives extra time and memory to slower languages.
+
+    Returns
+    -------
+    Tuple[Union[float, None], Union[int, None]]
+        The time limit in seconds and the memory limit in MB for the language.
+    """
+    if not extra_time or not language_config.run_command_template:
+        return (time_limit, memory_limit)
+    program = os.path.basename(language_config.run_command_template[0])
+    if program not in extra_limit_lookup:
+        return (time_limit, memory_limit)
+    extra_limit = extra_limit_lookup[program]
+    if time_limit != None:
+        time_limit = (
+            time_limit * extra_limit.time_multiplier + extra_limit.time_addition
+        )
+    if memory_limit != None:
+        memory_limit = int(
+            memory_limit * extra_limit.memory_multiplier + extra_limit.memory_addition
+        )
+    return (time_limit, memory_limit)
+
+
+@functools.lru_cache(maxsize=None)
+def _compiler_version(binary_path: str, mtime: float) -> str:
+    try:
+        process = run([binary_path, "--version"], stdout=PIPE, stderr=STDOUT)
+    except OSError:
+        return ""
+    return process.stdout.decode("utf-8", "replace")
+
+
+def compiler_version(binary: str) -> str:
+    """Fetch the version string of a compiler.
+
+    The result is memoized by the resolved path and modification time of the
+    binary, so upgrading the toolchain is noticed without re-running
+    `--version` every time.
+
+    Parameters
+    ----------
+    binary
+        Name or path of the compiler binary.
+
+    Returns
+    -------
+    str
+        Output of `binary --version`, or an empty string if it cannot be run.
+    """
+    binary_path = shutil.which(binary)
+    if binary_path == None:
+        return ""
+    binary_path = os.path.realpath(binary_path)
+    return _compiler_version(binary_path, os.stat(binary_path).st_mtime)
@@ -0,0 +1,220 @@
+from pathlib import Path
+from subprocess import DEVNULL, PIPE, run
+from typing import List, Union
+
+from .cache import ArtifactCache
+from .config import LanguageConfig
+from .languageinfo import compiler_version
+from .tracing import span
+
+import hashlib
+import json
+import os
+import re
+import shutil
+
+PRECOMPILED_HEADER = "bits/stdc++.h"
+_INCLUDE_PATTERN = re.compile(rb"^\s*#\s*include\s*<bits/stdc\+\+\.h>", re.MULTILINE)
+# Flags only used when linking, which would make the compiler link the
+# precompiled header. Those in _LINK_ARGUMENT_FLAGS take the next argument.
+_LINK_FLAGS = ("-static", "-static-libgcc", "-static-libstdc++", "-rdynamic", "-s")
+_LINK_FLAG_PREFIXES = ("-l", "-L", "-Wl,")
+_LINK_ARGUMENT_FLAGS = ("-l", "-L", "-Xlinker")
+# Stored in the cache entry of a header that could not be precompiled, so that
+# it is not built again on every compilation.
+_FAILED_MARKER = "failed"
+
+
+def uses_precompiled_header(filepath: Path) -> bool:
+    """Check if a source file includes the header that is precompiled.
+
+    Parameters
+    ----------
+    filepath
+        The path of the source file.
+
+    Returns
+    -------
+    bool
+        True if the source includes `PRECOMPILED_HEADER`.
+    """
+    with open(filepath, "rb") as f:
+        return _INCLUDE_PATTERN.search(f.read()) != None
+
+
+def header_flags(language_config: LanguageConfig) -> Union[List[str], None]:
+    """Find the flags of a compile command that a precompiled header must be
+    built with.
+
+    Parameters
+    ----------
+    language_config
+        The language config of the source.
+
+    Returns
+    -------
+    Union[List[str], None]
+        The compile command without the source and output paths and the flags
+        only used when linking, or `None` if the compiler is not a GCC C++
+        compiler, whose precompiled headers are picked up from the include
+        path.
+    """
+    template = language_config.compile_command_template
+    if language_config.language_type != "compiled" or not template:
+        return None
+    name = os.path.basename(template[0])
+    if not (name in ("g++", "c++") or name.startswith("g++-")):
+        return None
+    version = compiler_version(template[0])
+    if not version or "clang" in version.lower():
+        return None
+    flags = [template[0]]
+    skip_next = False
+    for i, arg in enumerate(template[1:], 1):
+        if skip_next:
+            skip_next = False
+            continue
+        if "{source_path}" in arg or "{exec_path}" in arg:
+            continue
+        if arg == "-o" and i + 1 < len(template) and "{exec_path}" in template[i + 1]:
+            continue
+        if arg in _LINK_ARGUMENT_FLAGS:
+            skip_next = True
+            continue
+        if arg in _LINK_FLAGS or arg.startswith(_LINK_FLAG_PREFIXES):
+            continue
+        flags.append(arg)
+    return flags
+
+
+def header_key(flags: List[str]) -> str:
+    """Create a key identifying a precompiled header.
+
+    Parameters
+    ----------
+    flags
+        The compiler followed by the flags, as returned by `header_flags`.
+
+    Returns
+    -------
+    str
+        SHA-256 digest of the resolved path and version of the compiler, and
+        the flags.
+    """
+    compiler = shutil.which(flags[0]) or flags[0]
+    hasher = hashlib.sha256()
+    hasher.update(PRECOMPILED_HEADER.encode("utf-8"))
+    hasher.update(os.path.realpath(compiler).encode("utf-8"))
+    hasher.update(compiler_version(flags[0]).encode("utf-8"))
+    hasher.update(json.dumps(flags[1:]).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _find_header(flags: List[str]) -> Union[Path, None]:
+    # Preprocess an include of the header and look for the line marker of
+    # entering it, to find the header the compiler would use.
+    process = run(
+        flags + ["-x", "c++", "-E", "-"],
+        input=f"#include <{PRECOMPILED_HEADER}>\n".encode("utf-8"),
+        stdout=PIPE,
+        stderr=DEVNULL,
+    )
+    if process.returncode != 0:
+        return None
+    pattern = re.compile(
+        rb'^# \d+ "(.*/' + re.escape(PRECOMPILED_HEADER.encode("utf-8")) + rb')" 1',
+        re.MULTILINE,
+    )
+    match = pattern.search(process.stdout)
+    if match == None:
+        return None
+    return Path(os.fsdecode(match.group(1)))  # type: ignore
+
+
+def _build_header(flags: List[str], include_dir: Path) -> bool:
+    header_path = _find_header(flags)
+    if header_path == None:
+        return False
+    # The compiler looks for HEADER.gch next to each candidate HEADER, and uses
+    # the copy of the header instead if the precompiled one does not match the
+    # flags of a compilation.
+    target = include_dir / PRECOMPILED_HEADER
+    os.makedirs(target.parent, exist_ok=True)
+    shutil.copyfile(header_path, target)
+    with span("precompile header", "pch"):
+        process = run(
+            flags + ["-x", "c++-header", str(target), "-o", f"{target}.gch"],
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+        )
+    return process.returncode == 0
+
+
+def precompiled_header_dir(
+    language_config: LanguageConfig, cache: ArtifactCache
+) -> Union[Path, None]:
+    """Find or build the precompiled header for a language config.
+
+    Parameters
+    ----------
+    language_config
+        The language config of the source.
+    cache
+        The cache holding precompiled headers.
+
+    Returns
+    -------
+    Union[pathlib.Path, None]
+        The directory to add to the include path, or `None` if the header
+        cannot be precompiled for the language config. A failed build is
+        remembered in the cache and not retried.
+    """
+    flags = header_flags(language_config)
+    if flags == None:
+        return None
+    key = header_key(flags)
+    include_dir = cache.lookup(key)
+    if include_dir == None:
+        with cache.lock(key):
+            # Another run may have built the header while this one waited.
+            include_dir = cache.lookup(key)
+            if include_dir == None:
+                staging_dir = cache.staging_dir()
+                try:
+                    if not _build_header(flags, staging_dir):
+                        shutil.rmtree(staging_dir, ignore_errors=True)
+                        staging_dir = cache.staging_dir()
+                        (staging_dir / _FAILED_MARKER).touch()
+                except BaseException:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+                    raise
+                include_dir = cache.store(key, staging_dir)
+    if (include_dir / _FAILED_MARKER).exists():
+        return None
+    return include_dir
+
+
+def with_include_dir(
+    language_config: LanguageConfig, include_dir: Path
+) -> LanguageConfig:
+    """Add a directory to the front of the include path of a compile command.
+
+    Parameters
+    ----------
+    language_config
+        The language config to extend.
+    include_dir
+        The directory to add.
+
+    Returns
+    -------
+    LanguageConfig
+        The extended language config.
+    """
+    template = language_config.compile_command_template
+    escaped_dir = str(include_dir).replace("{", "{{").replace("}", "}}")
+    return LanguageConfig(
+        language_config.language_type,
+        template[:1] + ["-I", escaped_dir] + template[1:],
+        language_config.run_command_template,
+    )
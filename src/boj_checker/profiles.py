@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, NamedTuple, Union
+
+from .config import CheckerConfig, LanguageConfig
+from .languageinfo import judge_extension_lookup
+from .runner import Executable, compile_source_file, lookup_language_config
+
+import time
+
+# The language config used by the main command.
+DEFAULT_PROFILE = "default"
+# The commands of the BOJ judge, from `judge_extension_lookup`.
+JUDGE_PROFILE = "boj"
+
+
+class ProfileBuild(NamedTuple):
+    """A solution compiled under one profile.
+
+    Attributes
+    ----------
+    name : str
+        The name of the profile.
+    language_config : LanguageConfig
+        The language config of the profile.
+    executable : Union[Executable, None]
+        The compiled solution, or `None` if the compilation failed.
+    compile_time : Union[float, None]
+        Wall time of the compilation in seconds, or `None` for languages that
+        are not compiled.
+    """
+
+    name: str
+    language_config: LanguageConfig
+    executable: Union[Executable, None]
+    compile_time: Union[float, None]
+
+
+def profile_names(filepath: Path, config: CheckerConfig) -> List[str]:
+    """List the profiles available for a source file.
+
+    Parameters
+    ----------
+    filepath
+        The path of the source file.
+    config
+        The loaded config.
+
+    Returns
+    -------
+    List[str]
+        The names of the profiles, built-in ones first.
+    """
+    extension = filepath.suffix[1:]
+    names = [DEFAULT_PROFILE]
+    if extension in judge_extension_lookup:
+        names.append(JUDGE_PROFILE)
+    for name in config.profile_table.get(extension, dict()):
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def lookup_profile(filepath: Path, name: str, config: CheckerConfig) -> LanguageConfig:
+    """Find the language config of a profile for a source file.
+
+    Profiles in the config file take precedence over the built-in
+    `DEFAULT_PROFILE` and `JUDGE_PROFILE`.
+
+    Parameters
+    ----------
+    filepath
+        The path of the source file.
+    name
+        The name of the profile.
+    config
+        The loaded config.
+
+    Returns
+    -------
+    LanguageConfig
+        The language config of the profile.
+
+    Raises
+    ------
+    KeyError
+        If there is no such profile for the filetype of the source.
+    NotImplementedError
+        If there is no language config for the filetype of the source.
+    """
+    extension = filepath.suffix[1:]
+    profiles = config.profile_table.get(extension, dict())
+    if name in profiles:
+        return profiles[name]
+    if name == DEFAULT_PROFILE:
+        return lookup_language_config(filepath, config.languageconfig_table)
+    if name == JUDGE_PROFILE and extension in judge_extension_lookup:
+        return judge_extension_lookup[extension]
+    lookup_language_config(filepath, config.languageconfig_table)
+    raise KeyError(name)
+
+
+def build_profiles(
+    filepath: Path,
+    names: List[str],
+    language_configs: List[LanguageConfig],
+    temp_dir: Union[Path, None] = None,
+) -> List[ProfileBuild]:
+    """Compile a source file under several profiles at once.
+
+    Neither the compilation cache nor precompiled headers are used, so that
+    the compile times are those of a fresh build, as on the judge. A profile
+    whose compiler fails or is not installed gets no executable. The caller
+    must remove the executables with `runner.remove_work_dir`.
+
+    Parameters
+    ----------
+    filepath
+        The path of the source file.
+    names
+        The name of each profile.
+    language_configs
+        The language config of each profile, as returned by `lookup_profile`.
+    temp_dir
+        Passed to `compile_source_file`.
+
+    Returns
+    -------
+    List[ProfileBuild]
+        The compiled solution of each profile, in the order of `names`.
+    """
+    extension = filepath.suffix[1:]
+
+    def build(name: str, language_config: LanguageConfig) -> ProfileBuild:
+        start = time.perf_counter()
+        try:
+            executable: Union[Executable, None] = compile_source_file(
+                filepath, {extension: language_config}, temp_dir
+            )
+        except (ValueError, OSError):
+            executable = None
+        compile_time: Union[float, None] = time.perf_counter() - start
+        if language_config.language_type == "scripted":
+            compile_time = None
+        return ProfileBuild(name, language_config, executable, compile_time)
+
+    with ThreadPoolExecutor(max_workers=max(len(names), 1)) as executor:
+        return list(executor.map(build, names, language_configs))
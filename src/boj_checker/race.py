@@ -0,0 +1,126 @@
+from typing import Callable, List, NamedTuple, Union
+
+from .check import CheckPlan
+from .runner import DEFAULT_OUTPUT_LIMIT, judge, run_executable
+
+import math
+
+
+class RaceResult(NamedTuple):
+    """The results of a solution over all trials of a race.
+
+    Attributes
+    ----------
+    verdicts : List[str]
+        The verdict of each case. A case gets the first verdict other than AC
+        or OK among its trials, so flaky failures are not hidden.
+    wall_times : List[float]
+        Wall time of each run in seconds, over all cases and trials.
+    max_rss : int
+        Peak resident set size over all runs, in KiB.
+    """
+
+    verdicts: List[str]
+    wall_times: List[float]
+    max_rss: int
+
+    @property
+    def passed(self) -> bool:
+        """True if no case failed in any trial."""
+        return all(x in ("AC", "OK") for x in self.verdicts)
+
+    @property
+    def min_time(self) -> float:
+        """The fastest run, in seconds."""
+        return min(self.wall_times)
+
+    @property
+    def median_time(self) -> float:
+        """The median run, in seconds."""
+        import statistics
+
+        return statistics.median(self.wall_times)
+
+    @property
+    def p95_time(self) -> float:
+        """The 95th percentile of runs, in seconds."""
+        return percentile(self.wall_times, 0.95)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Find a percentile by the nearest-rank method.
+
+    Parameters
+    ----------
+    values
+        The values, in any order. Must not be empty.
+    fraction
+        The percentile as a fraction, between 0 and 1.
+
+    Returns
+    -------
+    float
+        The smallest value not less than `fraction` of the values.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def race(
+    plans: List[CheckPlan],
+    trials: int = 3,
+    output_limit: Union[int, None] = DEFAULT_OUTPUT_LIMIT,
+    progress: Union[Callable[[int, int], None], None] = None,
+) -> List[RaceResult]:
+    """Run several solutions on the same cases, repeatedly.
+
+    Runs are sequential so that solutions do not compete for the CPU, and
+    interleaved between solutions so that changes in the load of the machine
+    affect all of them alike.
+
+    Parameters
+    ----------
+    plans
+        The solutions with their cases and limits, as returned by
+        `check.make_plan`. All plans must have the same cases.
+    trials
+        Number of times each solution is run on each case.
+    output_limit
+        Number of bytes of output after which each run is killed.
+    progress
+        Called with the number of finished and total runs after each run.
+
+    Returns
+    -------
+    List[RaceResult]
+        The results of each solution, in the order of `plans`.
+    """
+    cases = plans[0].cases if plans else []
+    verdicts = [["AC"] * len(cases) for _ in plans]
+    wall_times: List[List[float]] = [[] for _ in plans]
+    max_rss = [0] * len(plans)
+    total = trials * len(cases) * len(plans)
+    finished = 0
+    for _ in range(trials):
+        for i, case in enumerate(cases):
+            for j, plan in enumerate(plans):
+                result = run_executable(
+                    plan.executable,
+                    case.input,
+                    plan.time_limit,
+                    plan.memory_limit,
+                    case.output,
+                    output_limit,
+                    discard_stderr=True,
+                )
+                verdict = judge(case.output, result, plan.time_limit, plan.memory_limit)
+                result.output.close()
+                if verdicts[j][i] in ("AC", "OK"):
+                    verdicts[j][i] = verdict
+                wall_times[j].append(result.wall_time)
+                max_rss[j] = max(max_rss[j], result.max_rss)
+                finished += 1
+                if progress != None:
+                    progress(finished, total)
+    return [RaceResult(*x) for x in zip(verdicts, wall_times, max_rss)]
@@ -0,0 +1,123 @@
+from pathlib import Path
+from typing import List, Union
+
+PASSING_VERDICTS = ("AC", "OK")
+NO_CASES_ERROR = "No cases to run"
+
+
+def check_report(
+    problem_id: int,
+    source: Path,
+    time_limit: Union[float, None],
+    memory_limit: Union[int, None],
+    cases: List[dict],
+    error: Union[str, None] = None,
+) -> dict:
+    """Put together the results of a check.
+
+    Parameters
+    ----------
+    problem_id
+        The ID of the problem.
+    source
+        The path of the solution.
+    time_limit
+        The time limit the solution was run with in seconds, or `None`.
+    memory_limit
+        The memory limit the solution was run with in MB, or `None`.
+    cases
+        The result of each case, as returned by `CaseResult.todict`, with the
+        diff of the output under "diff" for WA.
+    error
+        The reason the solution could not be run, such as a compilation error.
+        Defaults to `None`, which is replaced by "No cases to run" if there
+        are no cases, so that such a check never passes.
+
+    Returns
+    -------
+    dict
+        The report, which can be serialized to JSON.
+    """
+    if error == None and not cases:
+        error = NO_CASES_ERROR
+    return {
+        "problem_id": problem_id,
+        "source": str(source),
+        "time_limit": time_limit,
+        "memory_limit": memory_limit,
+        "passed": error == None
+        and all(x["verdict"] in PASSING_VERDICTS for x in cases),
+        "error": error,
+        "cases": cases,
+    }
+
+
+def junit_xml(reports: List[dict]) -> str:
+    """Render check reports as a JUnit XML document.
+
+    Each report becomes a test suite, and each of its cases a test case. WA is
+    reported as a failure, and other failing verdicts as errors. An error
+    stopping the check, such as a compilation error or a problem that could not
+    be fetched, is reported as an error of a test case named "setup".
+
+    Parameters
+    ----------
+    reports
+        The reports, as returned by `check_report`.
+
+    Returns
+    -------
+    str
+        The XML document.
+    """
+    import xml.etree.ElementTree as ET
+
+    root = ET.Element("testsuites")
+    for report in reports:
+        source = Path(report["source"]).name
+        suite = ET.SubElement(
+            root,
+            "testsuite",
+            name=f"{report['problem_id']}/{source}",
+            tests=str(len(report["cases"]) + (report["error"] != None)),
+        )
+        failures = 0
+        errors = 0
+        total_time = 0.0
+        if report["error"] != None:
+            testcase = ET.SubElement(
+                suite,
+                "testcase",
+                name="setup",
+                classname=f"boj.{report['problem_id']}",
+                time="0",
+            )
+            ET.SubElement(testcase, "error", message=report["error"])
+            errors += 1
+        for case in report["cases"]:
+            total_time += case["wall_time"]
+            testcase = ET.SubElement(
+                suite,
+                "testcase",
+                name=case["name"],
+                classname=f"boj.{report['problem_id']}.{source}",
+                time=f"{case['wall_time']:.3f}",
+            )
+            verdict = case["verdict"]
+            if verdict in PASSING_VERDICTS:
+                continue
+            message = f"{verdict} (exit code {case['exit_code']})"
+            if verdict == "WA":
+                failure = ET.SubElement(testcase, "failure", message=message)
+                failures += 1
+            else:
+                failure = ET.SubElement(testcase, "error", message=message)
+                errors += 1
+            if case.get("diff"):
+                failure.text = "\n".join(case["diff"])
+        suite.set("failures", str(failures))
+        suite.set("errors", str(errors))
+        suite.set("time", f"{total_time:.3f}")
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(
+        root, encoding="unicode"
+    )
@@ -1,36 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from subprocess import DEVNULL, Popen, PIPE
-from typing import Dict, Tuple, Union
+from typing import IO, Callable, Dict, Iterator, List, NamedTuple, Tuple, Union
 
+from .cache import ArtifactCache
+from .comparator import CapturedOutput, OutputComparator
 from .config import LanguageConfig
-from .languageinfo import extension_lookup
+from .forkserver import ForkServer
+from .languageinfo import compiler_version, extension_lookup
+from .pch import precompiled_header_dir, uses_precompiled_header, with_include_dir
+from .tracing import add_span, span
 
 import hashlib
+import json
+import math
 import os
+import resource
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
 
 
-def generate_dirname(filepath: Path) -> str:
-    """Create a dirname using given file path.
+def hash_file(filepath: Path) -> str:
+    """Calculate the SHA-256 hash of a file.
 
     Parameters
     ----------
     filepath
-        The path of the source file to base on.
+        The path of the file to hash.
 
     Returns
     -------
     str
-        Generated dirname in $filename-$sha256hash format
+        Hex digest of the content.
     """
     hasher = hashlib.sha256()
     BUFSIZE = 65536
-    with open(filepath, "rb") as f:
+    with span("hash", "runner", file=str(filepath)), open(filepath, "rb") as f:
         while True:
             data = f.read(BUFSIZE)
             if not data:
                 break
             hasher.update(data)
-    return f"{filepath.name}-{hasher.hexdigest()}"
+    return hasher.hexdigest()
+
+
+def generate_dirname(filepath: Path) -> str:
+    """Create a dirname using given file path.
+
+    Parameters
+    ----------
+    filepath
+        The path of the source file to base on.
+
+    Returns
+    -------
+    str
+        Generated dirname in $filename-$sha256hash format
+    """
+    return f"{filepath.name}-{hash_file(filepath)}"
+
+
+def artifact_key(filepath: Path, language_config: LanguageConfig) -> str:
+    """Create a key identifying the compilation result of a source file.
+
+    Parameters
+    ----------
+    filepath
+        The path of the source file.
+    language_config
+        The language config used to compile the source.
+
+    Returns
+    -------
+    str
+        SHA-256 digest of the source content, the compile command and the
+        compiler version.
+    """
+    compile_command = [
+        x.format(source_path=filepath.name, exec_path="a.out")
+        for x in language_config.compile_command_template
+    ]
+    hasher = hashlib.sha256()
+    hasher.update(hash_file(filepath).encode("utf-8"))
+    hasher.update(language_config.language_type.encode("utf-8"))
+    hasher.update(json.dumps(compile_command).encode("utf-8"))
+    if compile_command:
+        hasher.update(compiler_version(compile_command[0]).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+DEFAULT_OUTPUT_LIMIT = 64 * 1024 * 1024
+OUTPUT_BUFSIZE = 65536
 
 
 def temporary_dir_root() -> Path:
@@ -39,36 +103,146 @@ def temporary_dir_root() -> Path:
     Returns
     -------
     pathlib.Path
-        Path object of temporary directory
+        Path object of temporary directory, following `TMPDIR`
     """
-    return Path("/tmp")  # TODO: support other OSes other than Linux
+    return Path(tempfile.gettempdir())
 
 
-def run_source_file(
+class Executable(NamedTuple):
+    """A source file prepared to be run.
+
+    Attributes
+    ----------
+    command : List[str]
+        The command to run, for subprocess.Popen.
+    cwd : Union[pathlib.Path, None]
+        The working directory to run `command` in, or `None` for the current
+        directory.
+    language_type : str
+        Type of the language the source is written in.
+    fork_server : Union[ForkServer, None]
+        The fork server to run the script with instead of starting
+        `command`, or `None`. The command must start with the interpreter of
+        the fork server.
+    work_dir : Union[pathlib.Path, None]
+        The directory created for this executable alone, to be removed by
+        `remove_work_dir` once it is no longer run, or `None`.
+    cache_lock : Union[IO, None]
+        The mark returned by `ArtifactCache.acquire` keeping the cache entry of
+        this executable from being evicted, to be released by
+        `remove_work_dir`, or `None`.
+    """
+
+    command: List[str]
+    cwd: Union[Path, None]
+    language_type: str = "scripted"
+    fork_server: Union[ForkServer, None] = None
+    work_dir: Union[Path, None] = None
+    cache_lock: Union[IO, None] = None
+
+
+def lookup_language_config(
+    filepath: Path, user_language_config: Dict[str, LanguageConfig]
+) -> LanguageConfig:
+    """Find the language config for a source file.
+
+    Parameters
+    ----------
+    filepath
+        The path of the source file.
+    user_language_config
+        Dictionary mapping extension to LanguageConfig object, for custom
+        settings. Takes precedence over the defaults.
+
+    Returns
+    -------
+    LanguageConfig
+        The language config to use.
+
+    Raises
+    ------
+    NotImplementedError
+        If there is no language config for the filetype of the source.
+    """
+    file_extension = filepath.suffix[1:]
+    try:
+        if file_extension in user_language_config:
+            return user_language_config[file_extension]
+        else:
+            return extension_lookup[file_extension]
+    except KeyError:
+        raise NotImplementedError(f"Not implemented for extension: {file_extension}")
+
+
+def _compile(
+    filepath: Path,
+    language_info: LanguageConfig,
+    exec_path: Path,
+    pch_cache: Union[ArtifactCache, None] = None,
+):
+    if (
+        pch_cache != None
+        and language_info.language_type == "compiled"
+        and uses_precompiled_header(filepath)
+    ):
+        include_dir = precompiled_header_dir(language_info, pch_cache)
+        if include_dir != None:
+            language_info = with_include_dir(language_info, include_dir)
+    with span("compile", "runner", source=str(filepath)):
+        compile_process = Popen(
+            language_info.compile_command(filepath, exec_path),
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+        )
+        exit_code = compile_process.wait()
+    if exit_code != 0:
+        raise ValueError(f"Compilation of source {filepath} failed")
+
+
+def _compile_into(
+    filepath: Path,
+    language_info: LanguageConfig,
+    build_dir: Path,
+    pch_cache: Union[ArtifactCache, None],
+):
+    if language_info.language_type == "fixed_exec":
+        _compile(filepath, language_info, build_dir)
+    else:
+        _compile(filepath, language_info, build_dir / "a.out", pch_cache)
+
+
+def compile_source_file(
     filepath: Path,
-    input_str: str,
     user_language_config: Dict[str, LanguageConfig],
     temp_dir: Union[Path, None] = None,
-) -> Tuple[str, int]:
-    """Run a source file from given path, getting input from `input_str`.
+    artifact_cache: Union[ArtifactCache, None] = None,
+    pch_cache: Union[ArtifactCache, None] = None,
+) -> Executable:
+    """Compile a source file from given path, if its language needs to.
 
     Parameters
     ----------
     filepath
-        The path of the source file to run.
-    input_str
-        The input to provide.
+        The path of the source file to compile.
     user_language_config
         Dictionary mapping extension to LanguageConfig object, for custom
         settings.
     temp_dir
         The root of temporary directory. Defaults to `None`. If set to a value
         other than `None`, `temporary_dir_root` is overridden.
+    artifact_cache
+        The cache to reuse compilation results from. Defaults to `None`, which
+        compiles into a new directory in the temporary directory, to be removed
+        with `remove_work_dir`.
+    pch_cache
+        The cache of precompiled headers. If given, C++ sources including
+        `bits/stdc++.h` are compiled with a precompiled version of it, built on
+        first use. Defaults to `None`, which disables precompiled headers.
 
     Returns
     -------
-    Tuple[str, int]
-        The output of the program, and the exit code.
+    Executable
+        The command to run the compiled source.
 
     Raises
     ------
@@ -77,92 +251,611 @@ def run_source_file(
     ValueError
         If the compilation of the source code is failed.
     """
-    dirname = generate_dirname(filepath)
-    if temp_dir != None:
-        temp_dir_path = temp_dir / dirname
+    language_info = lookup_language_config(filepath, user_language_config)
+    if language_info.language_type == "scripted":
+        return Executable(language_info.run_command(filepath, Path()), None, "scripted")
+
+    work_dir = None
+    cache_lock = None
+    if artifact_cache != None:
+        key = artifact_key(filepath, language_info)
+        # Marked before the lookup, so that the entry cannot be evicted while
+        # it is run, even by other processes.
+        cache_lock = artifact_cache.acquire(key)
+        try:
+            build_dir = artifact_cache.lookup(key)
+            if build_dir == None:
+                with artifact_cache.lock(key):
+                    # Another run may have built the entry while this one waited.
+                    build_dir = artifact_cache.lookup(key)
+                    if build_dir == None:
+                        staging_dir = artifact_cache.staging_dir()
+                        try:
+                            _compile_into(
+                                filepath, language_info, staging_dir, pch_cache
+                            )
+                        except BaseException:
+                            shutil.rmtree(staging_dir, ignore_errors=True)
+                            raise
+                        build_dir = artifact_cache.store(key, staging_dir)
+        except BaseException:
+            cache_lock.close()
+            raise
     else:
-        temp_dir_path = temporary_dir_root() / dirname
+        # Each run compiles into a directory of its own, so concurrent runs of
+        # the same source never share a partially written binary.
+        root = temp_dir if temp_dir != None else temporary_dir_root()
+        build_dir = Path(
+            tempfile.mkdtemp(prefix=f"{generate_dirname(filepath)}-", dir=root)
+        )
+        try:
+            _compile_into(filepath, language_info, build_dir, pch_cache)
+        except BaseException:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+        work_dir = build_dir
+
+    if language_info.language_type == "fixed_exec":
+        return Executable(
+            language_info.run_command(Path(), Path()),
+            build_dir,
+            "fixed_exec",
+            work_dir=work_dir,
+            cache_lock=cache_lock,
+        )
+    return Executable(
+        language_info.run_command(Path(), build_dir / "a.out"),
+        None,
+        "compiled",
+        work_dir=work_dir,
+        cache_lock=cache_lock,
+    )
+
+
+class RunResult(NamedTuple):
+    """The outcome of a single run of a program.
+
+    Attributes
+    ----------
+    output : CapturedOutput
+        The output of the program, up to the output limit.
+    exit_code : int
+        The exit code of the program. Negative if it was killed by a signal,
+        following the convention of subprocess.Popen.
+    wall_time : float
+        Elapsed real time, in seconds.
+    user_time : float
+        CPU time spent in user mode, in seconds.
+    sys_time : float
+        CPU time spent in kernel mode, in seconds.
+    max_rss : int
+        Peak resident set size, in KiB. Programs using less memory than this
+        process are measured by sampling, which may miss short-lived peaks.
+    timed_out : bool
+        True if the program was killed for exceeding the time limit.
+    matched : Union[bool, None]
+        Whether the output matched the expected output, or `None` if no
+        expected output was given.
+    output_limit_exceeded : bool
+        True if the program was killed for exceeding the output limit.
+    warm_start : bool
+        True if the program was forked from a fork server, so its times do not
+        include the startup of the interpreter.
+    """
+
+    output: CapturedOutput
+    exit_code: int
+    wall_time: float
+    user_time: float
+    sys_time: float
+    max_rss: int
+    timed_out: bool
+    matched: Union[bool, None] = None
+    output_limit_exceeded: bool = False
+    warm_start: bool = False
+
+
+class CancelToken:
+    """A request to kill runs in progress, shared between threads.
 
+    Runs given a token are killed when it is cancelled, and runs started with
+    a cancelled token are killed right away.
+    """
+
+    def __init__(self):
+        """Create CancelToken object."""
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.cancelled = False
+
+    def cancel(self):
+        """Cancel the token, killing the runs using it."""
+        with self._lock:
+            self.cancelled = True
+            callbacks = self._callbacks
+            self._callbacks = []
+        for callback in callbacks:
+            callback()
+
+    def register(self, callback: Callable[[], None]) -> bool:
+        """Call a function when the token is cancelled.
+
+        Parameters
+        ----------
+        callback
+            The function to call.
+
+        Returns
+        -------
+        bool
+            False if the token is already cancelled, in which case `callback`
+            is not called.
+        """
+        with self._lock:
+            if self.cancelled:
+                return False
+            self._callbacks.append(callback)
+            return True
+
+    def unregister(self, callback: Callable[[], None]):
+        """Stop calling a registered function when the token is cancelled.
+
+        Parameters
+        ----------
+        callback
+            The function to stop calling.
+        """
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def _read_peak_rss(pid: int) -> int:
     try:
-        os.mkdir(temp_dir_path)
-    except FileExistsError:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
         pass
-    file_extension = filepath.suffix[1:]
-    try:
-        if file_extension in user_language_config:
-            language_info = user_language_config[file_extension]
-        else:
-            language_info = extension_lookup[file_extension]
-    except KeyError:
-        raise NotImplementedError(f"Not implemented for extension: {file_extension}")
+    return 0
 
-    if language_info.language_type == "scripted":
-        process = Popen(
-            language_info.run_command(filepath, Path()), stdout=PIPE, stdin=PIPE
-        )
-    elif language_info.language_type == "fixed_exec":
-        compile_process = Popen(
-            language_info.compile_command(filepath, temp_dir_path),
-            stdout=DEVNULL,
-            stderr=DEVNULL,
-        )
-        exit_code = compile_process.wait()
-        if exit_code != 0:
-            raise ValueError(f"Compilation of source {filepath} failed")
-        process = Popen(
-            language_info.run_command(Path(), Path()),
-            stdout=PIPE,
-            stdin=PIPE,
-            cwd=temp_dir_path,
-        )
+
+def _exit_code(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+class _Child(NamedTuple):
+    pid: int
+    stdin: Union[IO[bytes], None]
+    stdout: IO[bytes]
+    # Waits until the child exits without reaping it, so that its pid stays
+    # valid.
+    wait_exit: Callable[[], None]
+    # Reaps the child, returning its wait status, user time, system time and
+    # peak RSS in KiB.
+    reap: Callable[[], Tuple[int, float, float, int]]
+
+
+def _popen_child(process: Popen) -> _Child:
+    def wait_exit():
+        os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+
+    def reap() -> Tuple[int, float, float, int]:
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = _exit_code(status)
+        max_rss = rusage.ru_maxrss
+        if sys.platform == "darwin":
+            max_rss //= 1024
+        return (status, rusage.ru_utime, rusage.ru_stime, max_rss)
+
+    return _Child(process.pid, process.stdin, process.stdout, wait_exit, reap)
+
+
+def _fork_child(
+    executable: Executable, input_data: Union[str, Path], discard_stderr: bool
+) -> _Child:
+    fork_server: ForkServer = executable.fork_server  # type: ignore
+    stdout_read, stdout_write = os.pipe()
+    child_fds = [stdout_write]
+    stdin_write = None
+    if isinstance(input_data, Path):
+        stdin_read = os.open(input_data, os.O_RDONLY)
     else:
-        execpath = temp_dir_path / "a.out"
-        if not execpath.exists():
-            compile_process = Popen(
-                language_info.compile_command(filepath, temp_dir_path / "a.out"),
-                stdout=DEVNULL,
-                stderr=DEVNULL,
+        stdin_read, stdin_write = os.pipe()
+    child_fds.append(stdin_read)
+    if discard_stderr:
+        stderr = os.open(os.devnull, os.O_WRONLY)
+        child_fds.append(stderr)
+    else:
+        stderr = sys.stderr.fileno()
+    try:
+        process = fork_server.spawn(
+            executable.command[len(fork_server.interpreter) :],
+            str(executable.cwd) if executable.cwd != None else None,
+            stdin_read,
+            stdout_write,
+            stderr,
+        )
+    except BaseException:
+        for fd in [stdout_read, stdin_write]:
+            if fd != None:
+                os.close(fd)
+        raise
+    finally:
+        for fd in child_fds:
+            os.close(fd)
+    return _Child(
+        process.pid,
+        open(stdin_write, "wb") if stdin_write != None else None,
+        open(stdout_read, "rb"),
+        process.wait_exit,
+        process.reap,
+    )
+
+
+def _set_limits(
+    pid: int,
+    time_limit: Union[float, None],
+    memory_limit: Union[int, None],
+    limit_address_space: bool,
+):
+    if not hasattr(resource, "prlimit"):
+        return
+    if time_limit != None:
+        cpu_limit = math.ceil(time_limit)
+        resource.prlimit(pid, resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+    if memory_limit != None and limit_address_space:
+        # Address space is only a safety net against runaway allocation, as
+        # runtimes reserve far more than they use. MLE is judged by peak RSS.
+        address_space = (memory_limit * 2 + 64) * 1024 * 1024
+        resource.prlimit(pid, resource.RLIMIT_AS, (address_space, address_space))
+
+
+def run_executable(
+    executable: Executable,
+    input_data: Union[str, Path],
+    time_limit: Union[float, None] = None,
+    memory_limit: Union[int, None] = None,
+    solution: Union[str, Path, None] = None,
+    output_limit: Union[int, None] = DEFAULT_OUTPUT_LIMIT,
+    discard_stderr: bool = False,
+    cancel: Union[CancelToken, None] = None,
+) -> RunResult:
+    """Run a compiled source, getting input from `input_data`.
+
+    The output is compared against `solution` while it is being read, so large
+    outputs are never held in memory as a whole.
+
+    Parameters
+    ----------
+    executable
+        The source to run, returned by `compile_source_file`.
+    input_data
+        The input to provide, or the path of a file holding it. Files are
+        passed as stdin of the program directly, without being read here.
+    time_limit
+        Number of seconds after which the program is killed. Applies to both
+        wall time and CPU time. Defaults to `None`, which means no limit.
+    memory_limit
+        The memory limit in MB. Native programs get their address space
+        limited in proportion. Defaults to `None`, which means no limit.
+    solution
+        The expected output, or the path of a file holding it. Defaults to
+        `None`, which skips the comparison.
+    output_limit
+        Number of bytes of output after which the program is killed. Defaults
+        to `DEFAULT_OUTPUT_LIMIT`. `None` means no limit.
+    discard_stderr
+        If set to True, the error output of the program is discarded instead of
+        being shown.
+    cancel
+        The program is killed when this token is cancelled. Defaults to
+        `None`.
+
+    Returns
+    -------
+    RunResult
+        The output, exit code and resource usage of the program.
+    """
+    stderr = DEVNULL if discard_stderr else None
+    with span("spawn", "runner"):
+        if executable.fork_server != None:
+            start_time = time.perf_counter()
+            process = _fork_child(executable, input_data, discard_stderr)
+        elif isinstance(input_data, Path):
+            with open(input_data, "rb") as input_file:
+                start_time = time.perf_counter()
+                process = _popen_child(
+                    Popen(
+                        executable.command,
+                        stdout=PIPE,
+                        stdin=input_file,
+                        stderr=stderr,
+                        cwd=executable.cwd,
+                    )
+                )
+        else:
+            start_time = time.perf_counter()
+            process = _popen_child(
+                Popen(
+                    executable.command,
+                    stdout=PIPE,
+                    stdin=PIPE,
+                    stderr=stderr,
+                    cwd=executable.cwd,
+                )
             )
-            exit_code = compile_process.wait()
-            if exit_code != 0:
-                raise ValueError(f"Compilation of source {filepath} failed")
-        process = Popen(
-            language_info.run_command(Path(), temp_dir_path / "a.out"),
-            stdout=PIPE,
-            stdin=PIPE,
+    parent_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        parent_rss //= 1024
+    try:
+        _set_limits(
+            process.pid,
+            time_limit,
+            memory_limit,
+            executable.language_type == "compiled",
         )
+    except (OSError, ValueError):
+        pass
+    output = CapturedOutput()
+    solution_file = None
+    if isinstance(solution, Path):
+        solution_file = open(solution, "rb")
+        comparator = OutputComparator(solution_file)
+    elif solution != None:
+        comparator = OutputComparator(solution)
+    else:
+        comparator = None
+
+    # The child is reaped here instead of by Popen, so the kill below must not
+    # go through Popen either: it would reap the child and lose its rusage.
+    # Children of a fork server can only be killed by pid anyway.
+    lock = threading.Lock()
+    state = {
+        "exited": False,
+        "timed_out": False,
+        "output_limit_exceeded": False,
+        "cancelled": False,
+        "peak_rss": _read_peak_rss(process.pid),
+    }
+
+    def kill(reason: str):
+        with lock:
+            if not state["exited"]:
+                state[reason] = True
+                os.kill(process.pid, signal.SIGKILL)
+
+    def write_input():
+        try:
+            process.stdin.write(input_data.encode("utf-8"))  # type: ignore
+            process.stdin.close()  # type: ignore
+        except BrokenPipeError:
+            pass
+
+    def read_output():
+        # Includes the comparison against the solution, done while reading.
+        with span("read output", "runner"):
+            while True:
+                data = process.stdout.read1(OUTPUT_BUFSIZE)  # type: ignore
+                if not data:
+                    break
+                if state["output_limit_exceeded"]:
+                    continue
+                if output_limit != None and output.size + len(data) > output_limit:
+                    kill("output_limit_exceeded")
+                    continue
+                output.write(data)
+                if comparator != None:
+                    comparator.feed(data)
+        process.stdout.close()  # type: ignore
+
+    io_threads = [threading.Thread(target=read_output, daemon=True)]
+    if process.stdin != None:
+        io_threads.append(threading.Thread(target=write_input, daemon=True))
+    for thread in io_threads:
+        thread.start()
+
+    def sample_peak_rss():
+        interval = 0.001
+        while True:
+            with lock:
+                if state["exited"]:
+                    break
+                state["peak_rss"] = max(state["peak_rss"], _read_peak_rss(process.pid))
+            time.sleep(interval)
+            interval = min(interval * 2, 0.05)
+
+    def kill_cancelled():
+        kill("cancelled")
+
+    if cancel != None and not cancel.register(kill_cancelled):
+        kill_cancelled()
+    timer = None
+    if time_limit != None:
+        timer = threading.Timer(time_limit, kill, ("timed_out",))
+        timer.daemon = True
+        timer.start()
+    sampler = threading.Thread(target=sample_peak_rss, daemon=True)
+    sampler.start()
+    # Wait without reaping, so the pid stays valid for kill and the sampler.
+    process.wait_exit()
+    end_time = time.perf_counter()
+    wall_time = end_time - start_time
+    add_span("run", "runner", start_time, end_time, pid=process.pid)
+    with lock:
+        state["exited"] = True
+    status, user_time, sys_time, max_rss = process.reap()
+    if timer != None:
+        timer.cancel()
+    if cancel != None:
+        cancel.unregister(kill_cancelled)
+    for thread in io_threads:
+        thread.join()
+
+    matched = comparator.finish() if comparator != None else None
+    if solution_file != None:
+        solution_file.close()
+
+    if executable.fork_server != None:
+        max_rss = max(max_rss, state["peak_rss"])
+    elif max_rss <= parent_rss:
+        # ru_maxrss also counts the memory of this process the child was forked
+        # from, so it only means something when the child went beyond that.
+        max_rss = state["peak_rss"]
+    return RunResult(
+        output,
+        _exit_code(status),
+        wall_time,
+        user_time,
+        sys_time,
+        max_rss,
+        state["timed_out"],
+        matched,
+        state["output_limit_exceeded"],
+        executable.fork_server != None,
+    )
+
+
+def run_executable_parallel(
+    executable: Executable,
+    inputs: List[Union[str, Path]],
+    jobs: int = 1,
+    time_limit: Union[float, None] = None,
+    memory_limit: Union[int, None] = None,
+    solutions: Union[List[Union[str, Path, None]], None] = None,
+    output_limit: Union[int, None] = DEFAULT_OUTPUT_LIMIT,
+    executor: Union[ThreadPoolExecutor, None] = None,
+    cancel: Union[CancelToken, None] = None,
+) -> Iterator[RunResult]:
+    """Run a compiled source on several inputs using a pool of workers.
 
-    output, _ = process.communicate(input=input_str.encode("utf-8"))
-    exit_code = process.wait()
+    Parameters
+    ----------
+    executable
+        The source to run, returned by `compile_source_file`.
+    inputs
+        The inputs to provide, one per run. See `run_executable`.
+    jobs
+        The maximum number of runs in progress at once. Defaults to 1.
+    time_limit
+        Number of seconds after which each run is killed.
+    memory_limit
+        The memory limit in MB.
+    solutions
+        The expected outputs, in the order of `inputs`.
+    output_limit
+        Number of bytes of output after which each run is killed.
+    executor
+        The pool of workers to use, shared with other callers. Defaults to
+        `None`, which creates a pool of `jobs` workers for these runs.
+    cancel
+        Passed to `run_executable`.
 
-    return (output.decode("utf-8"), exit_code)
+    Returns
+    -------
+    Iterator[RunResult]
+        The result of each run, in the order of `inputs`. Runs not started
+        yet are cancelled when the iterator is closed.
+    """
+    if executor == None:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            yield from run_executable_parallel(
+                executable,
+                inputs,
+                jobs,
+                time_limit,
+                memory_limit,
+                solutions,
+                output_limit,
+                executor,
+                cancel,
+            )
+        return
+    futures = [
+        executor.submit(
+            run_executable,
+            executable,
+            x,
+            time_limit,
+            memory_limit,
+            solutions[i] if solutions != None else None,
+            output_limit,
+            False,
+            cancel,
+        )
+        for i, x in enumerate(inputs)
+    ]
+    try:
+        for future in futures:
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
 
 
-def clean_temporary_files(filepath: Path, temp_dir: Union[Path, None] = None):
-    """Clean up a temporary directory created when running source in `filepath`
+def run_source_file(
+    filepath: Path,
+    input_str: str,
+    user_language_config: Dict[str, LanguageConfig],
+    temp_dir: Union[Path, None] = None,
+    artifact_cache: Union[ArtifactCache, None] = None,
+) -> Tuple[str, int]:
+    """Run a source file from given path, getting input from `input_str`.
 
     Parameters
     ----------
     filepath
-        Path of the source.
+        The path of the source file to run.
+    input_str
+        The input to provide.
+    user_language_config
+        Dictionary mapping extension to LanguageConfig object, for custom
+        settings.
     temp_dir
         The root of temporary directory. Defaults to `None`. If set to a value
         other than `None`, `temporary_dir_root` is overridden.
+    artifact_cache
+        The cache to reuse compilation results from. Defaults to `None`.
+
+    Returns
+    -------
+    Tuple[str, int]
+        The output of the program, and the exit code.
+
+    Raises
+    ------
+    NotImplementedError
+        If this function cannot handle the filetype of the source.
+    ValueError
+        If the compilation of the source code is failed.
     """
-    dirname = generate_dirname(filepath)
-    if temp_dir != None:
-        temp_dir_path = temp_dir / dirname
-    else:
-        temp_dir_path = temporary_dir_root() / dirname
-    for path, _, filenames in os.walk(temp_dir_path):
-        for filename in filenames:
-            full_path = os.path.join(path, filename)
-            if os.path.exists(full_path):
-                os.remove(full_path)
+    executable = compile_source_file(
+        filepath, user_language_config, temp_dir, artifact_cache
+    )
     try:
-        os.rmdir(temp_dir_path)
-    except FileNotFoundError:
-        pass
+        result = run_executable(executable, input_str)
+    finally:
+        remove_work_dir(executable)
+    return (result.output.read(), result.exit_code)
+
+
+def remove_work_dir(executable: Executable):
+    """Remove the directory created for an executable, if there is one, and
+    let its cache entry be evicted.
+
+    Parameters
+    ----------
+    executable
+        The executable returned by `compile_source_file`, which must not be run
+        afterwards.
+    """
+    if executable.work_dir != None:
+        shutil.rmtree(executable.work_dir, ignore_errors=True)
+    if executable.cache_lock != None:
+        executable.cache_lock.close()
 
 
 def check_output(solution: str, output: str) -> bool:
@@ -180,6 +873,63 @@ def check_output(solution: str, output: str) -> bool:
     bool
         True if correct, False if wrong.
     """
-    solution_lines = [x.rstrip() for x in solution.rstrip().split("\n")]
-    output_lines = [x.rstrip() for x in output.rstrip().split("\n")]
-    return all([x == y for x, y in zip(solution_lines, output_lines)])
+    comparator = OutputComparator(solution)
+    comparator.feed(output.encode("utf-8"))
+    return comparator.finish()
+
+
+def judge(
+    solution: Union[str, Path, None],
+    result: RunResult,
+    time_limit: Union[float, None] = None,
+    memory_limit: Union[int, None] = None,
+) -> str:
+    """Decide the verdict of a run.
+
+    Parameters
+    ----------
+    solution
+        Sample output taken from BOJ, or the path of a file holding the
+        expected output. Only used if the output was not compared during the
+        run.
+    result
+        The result of the run.
+    time_limit
+        The time limit in seconds, compared against the CPU time of the run.
+    memory_limit
+        The memory limit in MB, compared against the peak RSS of the run.
+
+    Returns
+    -------
+    str
+        One of "AC", "WA", "RTE", "TLE", "MLE" and "OLE", or "OK" if the run
+        succeeded but there is no expected output to compare to.
+    """
+    if (
+        result.timed_out
+        or result.exit_code == -signal.SIGXCPU
+        or (
+            time_limit != None
+            and result.user_time + result.sys_time > time_limit  # type: ignore
+        )
+    ):
+        return "TLE"
+    if memory_limit != None and result.max_rss > memory_limit * 1024:
+        return "MLE"
+    if result.output_limit_exceeded:
+        return "OLE"
+    if result.exit_code != 0:
+        return "RTE"
+    if result.matched != None:
+        matched = result.matched
+    elif solution == None:
+        return "OK"
+    elif isinstance(solution, Path):
+        with span("compare", "runner"), open(solution, "rb") as f:
+            comparator = OutputComparator(f)
+            comparator.feed(result.output.read().encode("utf-8"))
+            matched = comparator.finish()
+    else:
+        with span("compare", "runner"):
+            matched = check_output(solution, result.output.read())
+    return "AC" if matched else "WA"
@@ -0,0 +1,263 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, List, NamedTuple, Set, Union
+
+from .runner import Executable, judge, run_executable
+
+
+class StressCase(NamedTuple):
+    """A generated test case and how the solution did on it.
+
+    Attributes
+    ----------
+    seed : int
+        The seed passed to the generator.
+    input : str
+        The generated input.
+    expected : str
+        The output of the reference solution.
+    output : str
+        The output of the solution.
+    verdict : str
+        The verdict of the solution, as returned by `runner.judge`. "GEN" and
+        "REF" mean that the generator and the reference solution failed.
+    """
+
+    seed: int
+    input: str
+    expected: str
+    output: str
+    verdict: str
+
+
+def with_arguments(executable: Executable, arguments: List[str]) -> Executable:
+    """Append command line arguments to the command of an executable.
+
+    Parameters
+    ----------
+    executable
+        The executable to extend.
+    arguments
+        The arguments to append.
+
+    Returns
+    -------
+    Executable
+        The extended executable.
+    """
+    return executable._replace(command=executable.command + arguments)
+
+
+def run_case(
+    generator: Executable,
+    reference: Executable,
+    solution: Executable,
+    seed: int,
+    time_limit: Union[float, None] = None,
+) -> StressCase:
+    """Generate a test case and check the solution against the reference on it.
+
+    Parameters
+    ----------
+    generator
+        The generator. It is run with `seed` as its only argument, and its
+        output is used as the input.
+    reference
+        The reference solution, trusted to be correct.
+    solution
+        The solution to check.
+    seed
+        The seed to pass to the generator.
+    time_limit
+        Number of seconds after which each program is killed.
+
+    Returns
+    -------
+    StressCase
+        The generated case and the verdict of the solution.
+    """
+    generated = run_executable(
+        with_arguments(generator, [str(seed)]), "", time_limit, discard_stderr=True
+    )
+    try:
+        input_str = generated.output.read()
+    finally:
+        generated.output.close()
+    if generated.timed_out or generated.exit_code != 0:
+        return StressCase(seed, input_str, "", "", "GEN")
+    return check_case(reference, solution, seed, input_str, time_limit)
+
+
+def check_case(
+    reference: Executable,
+    solution: Executable,
+    seed: int,
+    input_str: str,
+    time_limit: Union[float, None] = None,
+) -> StressCase:
+    """Check the solution against the reference on a given input.
+
+    Parameters
+    ----------
+    reference
+        The reference solution, trusted to be correct.
+    solution
+        The solution to check.
+    seed
+        The seed the input was generated with.
+    input_str
+        The input.
+    time_limit
+        Number of seconds after which each program is killed.
+
+    Returns
+    -------
+    StressCase
+        The case and the verdict of the solution.
+    """
+    expected = run_executable(reference, input_str, time_limit, discard_stderr=True)
+    try:
+        expected_str = expected.output.read()
+    finally:
+        expected.output.close()
+    if expected.timed_out or expected.exit_code != 0:
+        return StressCase(seed, input_str, expected_str, "", "REF")
+    result = run_executable(
+        solution, input_str, time_limit, solution=expected_str, discard_stderr=True
+    )
+    try:
+        return StressCase(
+            seed,
+            input_str,
+            expected_str,
+            result.output.read(),
+            judge(expected_str, result, time_limit),
+        )
+    finally:
+        result.output.close()
+
+
+def stress_test(
+    generator: Executable,
+    reference: Executable,
+    solution: Executable,
+    iterations: int,
+    jobs: int = 1,
+    first_seed: int = 1,
+    time_limit: Union[float, None] = None,
+    progress: Union[Callable[[int], None], None] = None,
+) -> Union[StressCase, None]:
+    """Run generated test cases across a pool of workers until one fails.
+
+    Parameters
+    ----------
+    generator
+        The generator, run with the seed as its only argument.
+    reference
+        The reference solution.
+    solution
+        The solution to check.
+    iterations
+        Number of test cases to try.
+    jobs
+        The maximum number of cases in progress at once.
+    first_seed
+        The seed of the first case. Following cases get consecutive seeds.
+    time_limit
+        Number of seconds after which each program is killed.
+    progress
+        Called with the number of finished cases after each case.
+
+    Returns
+    -------
+    Union[StressCase, None]
+        The failing case with the smallest seed among those finished when the
+        failure was found, or `None` if every case passed.
+    """
+    failures: List[StressCase] = []
+    finished = 0
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending: Set[Future] = set()
+        seeds = iter(range(first_seed, first_seed + iterations))
+        while True:
+            while not failures and len(pending) < jobs * 2:
+                seed = next(seeds, None)
+                if seed == None:
+                    break
+                pending.add(
+                    executor.submit(
+                        run_case, generator, reference, solution, seed, time_limit
+                    )
+                )
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                case = future.result()
+                finished += 1
+                if case.verdict != "AC":
+                    failures.append(case)
+            if progress != None:
+                progress(finished)
+            if failures:
+                for future in pending:
+                    future.cancel()
+    if not failures:
+        return None
+    return min(failures, key=lambda x: x.seed)
+
+
+def shrink_case(
+    reference: Executable,
+    solution: Executable,
+    case: StressCase,
+    time_limit: Union[float, None] = None,
+    max_attempts: int = 500,
+) -> StressCase:
+    """Try to make a failing case smaller by removing lines of its input.
+
+    Chunks of lines are removed, halving the chunk size whenever no chunk can
+    be removed, as long as the reference solution still accepts the input and
+    the solution still fails on it. Inputs whose first line holds counts
+    usually cannot be shrunk much this way.
+
+    Parameters
+    ----------
+    reference
+        The reference solution.
+    solution
+        The solution to check.
+    case
+        The failing case.
+    time_limit
+        Number of seconds after which each program is killed.
+    max_attempts
+        The maximum number of candidate inputs to try.
+
+    Returns
+    -------
+    StressCase
+        The smallest failing case found.
+    """
+    lines = case.input.splitlines(keepends=True)
+    chunk_size = len(lines) // 2
+    attempts = 0
+    while chunk_size > 0 and attempts < max_attempts:
+        removed = False
+        start = 0
+        while start < len(lines) and attempts < max_attempts:
+            candidate_lines = lines[:start] + lines[start + chunk_size :]
+            attempts += 1
+            candidate = check_case(
+                reference, solution, case.seed, "".join(candidate_lines), time_limit
+            )
+            if candidate.verdict not in ("AC", "REF"):
+                case = candidate
+                lines = candidate_lines
+                removed = True
+            else:
+                start += chunk_size
+        if not removed:
+            chunk_size //= 2
+    return case
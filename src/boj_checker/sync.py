@@ -0,0 +1,165 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, List, NamedTuple, Union
+
+from .boj_parser import fetch_problem
+from .cache import SampleCache
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Space out events so that at most `rate` of them start per second.
+
+    An object can be shared between threads.
+    """
+
+    def __init__(self, rate: float):
+        """Create RateLimiter object.
+
+        Parameters
+        ----------
+        rate
+            The maximum number of events per second. Zero or less means no
+            limit.
+        """
+        self._interval = 1 / rate if rate > 0 else 0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next event may start."""
+        with self._lock:
+            now = time.monotonic()
+            start_time = max(now, self._next_time)
+            self._next_time = start_time + self._interval
+        if start_time > now:
+            time.sleep(start_time - now)
+
+
+class SyncResult(NamedTuple):
+    """Summary of a sync.
+
+    Attributes
+    ----------
+    synced : List[int]
+        Problems fetched and stored.
+    skipped : List[int]
+        Problems skipped because their cached samples were fresh.
+    failed : List[int]
+        Problems that could not be fetched, or do not exist.
+    """
+
+    synced: List[int]
+    skipped: List[int]
+    failed: List[int]
+
+
+def parse_problem_ids(specs: Iterable[str]) -> List[int]:
+    """Parse problem IDs given as numbers and inclusive ranges.
+
+    Parameters
+    ----------
+    specs
+        Strings such as "1000" or "1000-2000".
+
+    Returns
+    -------
+    List[int]
+        The problem IDs in the order given, without duplicates.
+
+    Raises
+    ------
+    ValueError
+        If a string is neither a number nor a range.
+    """
+    problem_ids = dict()
+    for spec in specs:
+        first, _, last = spec.partition("-")
+        first_id = int(first)
+        last_id = int(last) if last else first_id
+        if last_id < first_id:
+            raise ValueError(f"Empty range of problems: {spec}")
+        for problem_id in range(first_id, last_id + 1):
+            problem_ids[problem_id] = None
+    return list(problem_ids)
+
+
+def sync_problems(
+    problem_ids: List[int],
+    cache: SampleCache,
+    jobs: int = 4,
+    rate: float = 2,
+    force: bool = False,
+    progress: Union[Callable[[int, int], None], None] = None,
+) -> SyncResult:
+    """Fetch many problems concurrently into the sample cache.
+
+    Requests share one HTTP session, so connections are reused, and are
+    started at most `rate` times per second regardless of `jobs`.
+
+    Parameters
+    ----------
+    problem_ids
+        The problems to fetch.
+    cache
+        The sample cache to store the problems in.
+    jobs
+        The maximum number of requests in progress at once.
+    rate
+        The maximum number of requests started per second. Zero or less means
+        no limit.
+    force
+        If set to True, revalidate problems whose cached samples are fresh.
+    progress
+        Called with the number of finished and total problems after each
+        problem.
+
+    Returns
+    -------
+    SyncResult
+        Which problems were synced, skipped and failed.
+    """
+    import requests
+
+    skipped = []
+    pending = []
+    for problem_id in problem_ids:
+        entry = cache.get(problem_id)
+        if not force and entry != None and cache.is_fresh(entry):
+            skipped.append(problem_id)
+        else:
+            pending.append(problem_id)
+    limiter = RateLimiter(rate)
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=jobs)
+    session.mount("https://", adapter)
+
+    def sync(problem_id: int) -> bool:
+        limiter.wait()
+        start_time = time.time()
+        try:
+            fetch_problem(problem_id, cache, session=session, revalidate=force)
+        except requests.RequestException:
+            return False
+        # Missing problems are not stored, and failed requests fall back to the
+        # cached entry, so neither leaves an entry updated by this request.
+        entry = cache.get(problem_id)
+        return entry != None and entry.fetched_at >= start_time
+
+    synced = []
+    failed = []
+    with session, ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(sync, x): x for x in pending}
+        try:
+            for finished, future in enumerate(as_completed(futures), 1):
+                if future.result():
+                    synced.append(futures[future])
+                else:
+                    failed.append(futures[future])
+                if progress != None:
+                    progress(finished, len(pending))
+        finally:
+            for future in futures:
+                future.cancel()
+    return SyncResult(sorted(synced), skipped, sorted(failed))
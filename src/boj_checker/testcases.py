@@ -0,0 +1,77 @@
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Tuple, Union
+
+import os
+import re
+
+
+class TestCase(NamedTuple):
+    """An input to run a solution on, with the expected output.
+
+    Attributes
+    ----------
+    name : str
+        Name of the test case, for display.
+    input : Union[str, pathlib.Path]
+        The input, or the path of the file holding it. Files are passed to the
+        solution as its stdin without being read.
+    output : Union[str, pathlib.Path, None]
+        The expected output, the path of the file holding it, or `None` if
+        unknown.
+    """
+
+    name: str
+    input: Union[str, Path]
+    output: Union[str, Path, None]
+
+
+def sample_cases(samples: List[Tuple[str, str]]) -> Iterator[TestCase]:
+    """Create test cases from sample IO.
+
+    Parameters
+    ----------
+    samples
+        List of input/output pairs, as returned by `fetch_sample_io`.
+
+    Returns
+    -------
+    Iterator[TestCase]
+        Test cases named "sample #1", "sample #2" and so on.
+    """
+    for i, (input_str, output_str) in enumerate(samples, 1):
+        yield TestCase(f"sample #{i}", input_str, output_str)
+
+
+def _natural_key(name: str) -> List[Union[int, str]]:
+    return [int(x) if x.isdigit() else x for x in re.split(r"(\d+)", name)]
+
+
+def discover_tests(directory: Path) -> Iterator[TestCase]:
+    """Find test cases in a directory.
+
+    Every `NAME.in` file is a test case, with `NAME.out` as its expected output
+    if it exists. Files are not opened here.
+
+    Parameters
+    ----------
+    directory
+        The directory to look in.
+
+    Returns
+    -------
+    Iterator[TestCase]
+        Test cases in natural order of their names, so that `10.in` comes after
+        `2.in`.
+    """
+    names = [
+        x.name[: -len(".in")]
+        for x in os.scandir(directory)
+        if x.name.endswith(".in") and x.is_file()
+    ]
+    for name in sorted(names, key=_natural_key):
+        output_path = directory / f"{name}.out"
+        yield TestCase(
+            name,
+            directory / f"{name}.in",
+            output_path if output_path.exists() else None,
+        )
@@ -0,0 +1,244 @@
+"""Timing of the stages of a check.
+
+Spans are recorded only while tracing is started, and cost a global lookup
+otherwise. Recorded spans can be written as Chrome trace events, viewable in
+`chrome://tracing` or Perfetto, and summarized by name.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Union
+
+import json
+import os
+import threading
+import time
+
+
+class SpanStats(NamedTuple):
+    """Statistics of the spans of one name.
+
+    Attributes
+    ----------
+    name : str
+        The name of the spans.
+    count : int
+        Number of spans.
+    total : float
+        Total duration of the spans in seconds. Spans running in parallel are
+        all counted.
+    max : float
+        Duration of the longest span in seconds.
+    """
+
+    name: str
+    count: int
+    total: float
+    max: float
+
+    @property
+    def mean(self) -> float:
+        """Mean duration of the spans in seconds."""
+        return self.total / self.count
+
+
+class Tracer:
+    """A recording of spans, from any number of threads.
+
+    Attributes
+    ----------
+    events : List[dict]
+        Recorded spans, as Chrome trace events of the complete type.
+    """
+
+    def __init__(self):
+        """Create Tracer object, starting its clock."""
+        self.events: List[dict] = []
+        self._origin = time.perf_counter()
+        self._thread_names: Dict[int, str] = dict()
+        self._lock = threading.Lock()
+
+    def record(self, name: str, category: str, start: float, end: float, args: dict):
+        """Record a span.
+
+        Parameters
+        ----------
+        name
+            The name of the span.
+        category
+            The category of the span, such as the module recording it.
+        start
+            The start of the span, as returned by `time.perf_counter`.
+        end
+            The end of the span, as returned by `time.perf_counter`.
+        args
+            Details shown with the span.
+        """
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+            self._thread_names[thread.ident] = thread.name  # type: ignore
+
+    def chrome_trace(self) -> dict:
+        """Make a Chrome trace of the recorded spans.
+
+        Returns
+        -------
+        dict
+            The trace, in the JSON object format of Chrome trace events.
+        """
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self._thread_names)
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in thread_names.items()
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path):
+        """Write the recorded spans as a Chrome trace.
+
+        Parameters
+        ----------
+        path
+            The path of the file to write.
+        """
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def summary(self) -> List[SpanStats]:
+        """Summarize the recorded spans by name.
+
+        Returns
+        -------
+        List[SpanStats]
+            Statistics of each name, longest total first.
+        """
+        stats: Dict[str, SpanStats] = dict()
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            duration = event["dur"] / 1e6
+            previous = stats.get(event["name"])
+            if previous == None:
+                stats[event["name"]] = SpanStats(event["name"], 1, duration, duration)
+            else:
+                stats[event["name"]] = SpanStats(
+                    event["name"],
+                    previous.count + 1,
+                    previous.total + duration,
+                    max(previous.max, duration),
+                )
+        return sorted(stats.values(), key=lambda x: x.total, reverse=True)
+
+
+_tracer: Union[Tracer, None] = None
+
+
+class _Span:
+    def __init__(self, tracer: Tracer, name: str, category: str, args: dict):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self._tracer.record(
+            self._name, self._category, self._start, time.perf_counter(), self._args
+        )
+
+
+class _NullSpan:
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def start_tracing() -> Tracer:
+    """Start recording spans.
+
+    Returns
+    -------
+    Tracer
+        The tracer spans are recorded to until `stop_tracing` is called.
+    """
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing():
+    """Stop recording spans."""
+    global _tracer
+    _tracer = None
+
+
+def span(name: str, category: str = "", **args: Any):
+    """Time the enclosed block, if tracing is started.
+
+    Parameters
+    ----------
+    name
+        The name of the span, such as "compile".
+    category
+        The category of the span, such as the module recording it.
+    **args
+        Details shown with the span. They are evaluated even if tracing is not
+        started, so they should be cheap to compute.
+
+    Returns
+    -------
+    ContextManager
+        A context manager recording the span, or doing nothing if tracing is
+        not started.
+    """
+    tracer = _tracer
+    if tracer == None:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def add_span(name: str, category: str, start: float, end: float, **args: Any):
+    """Record a span timed by the caller, if tracing is started.
+
+    Parameters
+    ----------
+    name
+        The name of the span.
+    category
+        The category of the span.
+    start
+        The start of the span, as returned by `time.perf_counter`.
+    end
+        The end of the span, as returned by `time.perf_counter`.
+    **args
+        Details shown with the span.
+    """
+    tracer = _tracer
+    if tracer != None:
+        tracer.record(name, category, start, end, args)
@@ -0,0 +1,207 @@
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+from .runner import generate_dirname
+
+import os
+import select
+import struct
+import threading
+import time
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    # Watches the directory of the file rather than the file itself, as
+    # editors often save by writing a new file and renaming it over the old
+    # one, which would end a watch on the old file.
+
+    def __init__(self, path: Path):
+        import ctypes
+
+        # The symbols of the interpreter include those of the C library.
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._name = os.fsencode(path.name)
+        mask = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        directory = os.fsencode(str(path.parent))
+        if libc.inotify_add_watch(self._fd, directory, mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, "inotify_add_watch failed")
+
+    def wait(self, timeout: Union[float, None]) -> bool:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, _, _, name_size = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset : offset + name_size].rstrip(b"\0")
+                offset += name_size
+                if name == self._name:
+                    changed = True
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _Poller:
+    def __init__(self, path: Path, interval: float):
+        self._path = path
+        self._interval = interval
+        self._state = self._stat()
+
+    def _stat(self) -> Union[Tuple[int, int, int], None]:
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def wait(self, timeout: Union[float, None]) -> bool:
+        deadline = time.monotonic() + timeout if timeout != None else None
+        while True:
+            interval = self._interval
+            if deadline != None:
+                interval = min(interval, deadline - time.monotonic())
+                if interval <= 0:
+                    return False
+            time.sleep(interval)
+            state = self._stat()
+            if state != self._state:
+                self._state = state
+                return True
+
+    def close(self):
+        pass
+
+
+class FileWatcher:
+    """Watch a file for changes.
+
+    Uses inotify where it is available, and polls the file otherwise. Changes
+    may be reported when the content stays the same, so callers should compare
+    the content themselves.
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        The path of the watched file.
+    uses_inotify : bool
+        True if changes are reported by inotify rather than by polling.
+    """
+
+    def __init__(self, path: Path, poll_interval: float = 0.2):
+        """Start watching a file.
+
+        Parameters
+        ----------
+        path
+            The path of the file to watch.
+        poll_interval
+            Number of seconds between checks of the file when polling.
+        """
+        self.path = path
+        self._watcher: Union[_Inotify, _Poller]
+        try:
+            self._watcher = _Inotify(path)
+            self.uses_inotify = True
+        except (OSError, AttributeError):
+            self._watcher = _Poller(path, poll_interval)
+            self.uses_inotify = False
+
+    def wait(self, timeout: Union[float, None] = None) -> bool:
+        """Wait for the file to change.
+
+        Parameters
+        ----------
+        timeout
+            Maximum number of seconds to wait, or `None` to wait forever.
+
+        Returns
+        -------
+        bool
+            True if the file may have changed, False on timeout.
+        """
+        return self._watcher.wait(timeout)
+
+    def close(self):
+        """Stop watching the file."""
+        self._watcher.close()
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _current_dirname(path: Path) -> Union[str, None]:
+    try:
+        return generate_dirname(path)
+    except OSError:
+        return None
+
+
+def watch_source(
+    path: Path,
+    debounce: float = 0.1,
+    stop: Union[threading.Event, None] = None,
+    poll_interval: float = 0.2,
+) -> Iterator[str]:
+    """Follow the content of a source file as it is saved.
+
+    Parameters
+    ----------
+    path
+        The path of the source file.
+    debounce
+        Number of seconds the file must stay unchanged after a change before it
+        is reported, so that a burst of writes is reported once.
+    stop
+        Stop watching once this event is set. Defaults to `None`, which means
+        watching until the iterator is closed.
+    poll_interval
+        Passed to `FileWatcher`.
+
+    Returns
+    -------
+    Iterator[str]
+        The dirname of the source, as returned by `generate_dirname`, for its
+        current content and then each time its content changes. Saves leaving
+        the content unchanged are not reported.
+    """
+    # Check the stop event regularly even if the file never changes.
+    wait_timeout = 0.5 if stop != None else None
+    with FileWatcher(path, poll_interval) as watcher:
+        last_dirname = _current_dirname(path)
+        if last_dirname != None:
+            yield last_dirname
+        while stop == None or not stop.is_set():
+            if not watcher.wait(wait_timeout):
+                continue
+            while watcher.wait(debounce):
+                pass
+            dirname = _current_dirname(path)
+            if dirname != None and dirname != last_dirname:
+                last_dirname = dirname
+                yield dirname
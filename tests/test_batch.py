@@ -0,0 +1,148 @@
+from pathlib import Path
+from boj_checker.batch import BatchJob, discover_jobs, read_manifest, run_batch
+from boj_checker.cache import SampleCache
+from boj_checker.config import CheckerConfig
+from boj_checker.history import RunHistory
+
+import tempfile
+import unittest
+
+SOLUTION = "a, b = map(int, input().split())\nprint(a + b)\n"
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path: str, content: str) -> Path:
+        full_path = self.temp_path / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+        return full_path
+
+    def test_read_manifest(self):
+        manifest = self.write(
+            "manifest.txt", "# solutions\n1000 a/b.py\n\n1001   c.cc\n"
+        )
+        self.assertEqual(
+            read_manifest(manifest),
+            [
+                BatchJob(1000, self.temp_path / "a/b.py"),
+                BatchJob(1001, self.temp_path / "c.cc"),
+            ],
+        )
+        with self.assertRaises(ValueError):
+            read_manifest(self.write("bad.txt", "a.py\n"))
+        manifest = self.write("tabs.txt", "1000\ta.py\n1001 \t  b c.py  \n")
+        self.assertEqual(
+            read_manifest(manifest),
+            [
+                BatchJob(1000, self.temp_path / "a.py"),
+                BatchJob(1001, self.temp_path / "b c.py"),
+            ],
+        )
+
+    def test_discover_jobs(self):
+        self.write("contest/1001/b.py", "")
+        self.write("contest/1000/a.py", "")
+        self.write("contest/1000/notes.txt", "")
+        self.write("contest/misc/c.py", "")
+        self.assertEqual(
+            discover_jobs(self.temp_path / "contest", {"py"}),
+            [
+                BatchJob(1000, self.temp_path / "contest/1000/a.py"),
+                BatchJob(1001, self.temp_path / "contest/1001/b.py"),
+            ],
+        )
+        self.assertEqual(
+            discover_jobs(self.temp_path / "contest/1000", {"py"}),
+            [BatchJob(1000, self.temp_path / "contest/1000/a.py")],
+        )
+
+    def test_run_batch(self):
+        cache = SampleCache(self.temp_path / "samples.db")
+        cache.put(1000, [("1 2\n", "3\n"), ("2 2\n", "4\n")], time_limit=2)
+        history = RunHistory(self.temp_path / "history.db")
+        jobs = [
+            BatchJob(1000, self.write("1000/a.py", SOLUTION)),
+            BatchJob(1000, self.write("1000/b.py", "print(3)\n")),
+            BatchJob(1001, self.write("1001/a.py", SOLUTION)),
+            BatchJob(1000, self.write("1000/c.unknown", "")),
+        ]
+        finished = []
+        reports = run_batch(
+            jobs,
+            CheckerConfig.fromdefault(),
+            2,
+            cache,
+            offline=True,
+            temp_dir=self.temp_path,
+            history=history,
+            progress=lambda job, report: finished.append(job),
+        )
+        self.assertEqual(sorted(finished), sorted(jobs))
+        self.assertTrue(reports[0]["passed"])
+        self.assertEqual([x["verdict"] for x in reports[1]["cases"]], ["AC", "WA"])
+        self.assertEqual(
+            reports[1]["cases"][1]["diff"], ["@@ -1,1 +1,1 @@", "- 3", "+ 4"]
+        )
+        self.assertFalse(reports[2]["passed"])
+        self.assertIn("not cached", reports[2]["error"])
+        self.assertEqual(reports[3]["error"], "Unknown language")
+        self.assertEqual(len(history.entries(1000)), 2)
+        history.close()
+
+    def test_run_batch_history_error(self):
+        cache = SampleCache(self.temp_path / "samples.db")
+        cache.put(1000, [("1 2\n", "3\n")], time_limit=2)
+        history = RunHistory(self.temp_path / "history.db")
+        history.close()
+        reports = run_batch(
+            [BatchJob(1000, self.write("1000/a.py", SOLUTION))],
+            CheckerConfig.fromdefault(),
+            1,
+            cache,
+            offline=True,
+            temp_dir=self.temp_path,
+            history=history,
+        )
+        self.assertTrue(reports[0]["passed"])
+
+    def test_run_batch_os_error(self):
+        cache = SampleCache(self.temp_path / "samples.db")
+        cache.put(1000, [("1 2\n", "3\n")], time_limit=2)
+        self.write("1000/Main.java", "class Main {}\n")
+        manifest = self.write("manifest.txt", "1000 missing.cc\n1000 1000/Main.java\n")
+        config = CheckerConfig("""{
+                "language_configs": [
+                    {
+                        "extension": "java",
+                        "config": {
+                            "language_type": "compiled",
+                            "compile_command": ["boj-checker-no-javac", "{source_path}"],
+                            "run_command": ["{exec_path}"]
+                        }
+                    }
+                ]
+            }""")
+        reports = run_batch(
+            read_manifest(manifest),
+            config,
+            2,
+            cache,
+            offline=True,
+            temp_dir=self.temp_path,
+        )
+        for report in reports:
+            self.assertFalse(report["passed"])
+            self.assertIn("Could not compile", report["error"])
+        self.assertIn("missing.cc", reports[0]["error"])
+        self.assertIn("boj-checker-no-javac", reports[1]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
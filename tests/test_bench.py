@@ -0,0 +1,59 @@
+from boj_checker.bench import BenchPoint, bench, fit_complexity, geometric_sizes
+from boj_checker.runner import Executable
+
+import math
+import sys
+import unittest
+
+GENERATOR = Executable(
+    [
+        sys.executable,
+        "-c",
+        "import sys; n = int(sys.argv[1]); print(n); print(*range(n))",
+    ],
+    None,
+)
+SOLUTION = Executable(
+    [sys.executable, "-c", "input(); print(sum(map(int, input().split())))"], None
+)
+
+
+class TestBench(unittest.TestCase):
+    def test_geometric_sizes(self):
+        self.assertEqual(geometric_sizes(1000, 8000), [1000, 2000, 4000, 8000])
+        self.assertEqual(geometric_sizes(1000, 5000), [1000, 2000, 4000, 5000])
+        self.assertEqual(geometric_sizes(1, 4, 1.2), [1, 2, 3, 4])
+        self.assertEqual(geometric_sizes(7, 7), [7])
+
+    def test_fit_complexity(self):
+        sizes = geometric_sizes(1000, 1000000)
+        points = [
+            BenchPoint(n, [0.03 + 2e-8 * n * math.log2(n)], 0, "OK") for n in sizes
+        ]
+        fit = fit_complexity(points)[0]
+        self.assertEqual(fit.name, "O(N log N)")
+        self.assertAlmostEqual(fit.constant, 0.03)
+        self.assertAlmostEqual(
+            fit.predict(10**7), 0.03 + 2e-8 * 10**7 * math.log2(10**7)
+        )
+
+        points = [BenchPoint(n, [1e-9 * n * n], 0, "OK") for n in sizes]
+        self.assertEqual(fit_complexity(points)[0].name, "O(N^2)")
+
+    def test_bench(self):
+        finished = []
+        points = bench(
+            GENERATOR, SOLUTION, [10, 20, 40], 0, 2, 10, None, finished.append
+        )
+        self.assertEqual([x.n for x in points], [10, 20, 40])
+        self.assertEqual(finished, points)
+        for point in points:
+            self.assertEqual(point.verdict, "OK")
+            self.assertEqual(len(point.times), 2)
+            self.assertGreater(point.median_time, 0)
+
+        failing = Executable([sys.executable, "-c", "raise SystemExit(1)"], None)
+        points = bench(GENERATOR, failing, [10, 20], 0, 2)
+        self.assertEqual([(x.n, x.verdict) for x in points], [(10, "RTE")])
+        points = bench(failing, SOLUTION, [10, 20], 0, 2)
+        self.assertEqual([(x.n, x.verdict) for x in points], [(10, "GEN")])
@@ -1,9 +1,112 @@
-from boj_checker.boj_parser import fetch_sample_io
+from http.server import BaseHTTPRequestHandler, HTTPServer
 
+from pathlib import Path
+
+from boj_checker.boj_parser import fetch_problem, fetch_sample_io, parse_problem
+from boj_checker.cache import SampleCache
+
+import os
+import requests
+import tempfile
+import threading
 import unittest
 
+PROBLEM_PAGE = """
+<table class="table" id="problem-info">
+<thead><tr><th>시간 제한</th><th>메모리 제한</th><th>제출</th></tr></thead>
+<tbody><tr><td>0.5 초 (추가 시간 없음) </td><td>256 MB</td><td>100</td></tr></tbody>
+</table>
+<pre class="sampledata" id="sample-input-1">1 2
+</pre>
+<pre class="sampledata" id="sample-output-1">3
+</pre>
+"""
+
+
+class ProblemHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/problem/1001":
+            self.send_error(503)
+            return
+        if self.path != "/problem/1000":
+            self.send_error(404)
+            return
+        body = PROBLEM_PAGE.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
 
 class TestBOJParser(unittest.TestCase):
     def test_fetch_sample_io(self):
         self.assertEqual(fetch_sample_io(10831), [])
         self.assertIsNotNone(fetch_sample_io(1000))
+
+    def test_parse_problem(self):
+        problem = parse_problem(1000, PROBLEM_PAGE)
+        self.assertEqual(problem.problem_id, 1000)
+        self.assertEqual(problem.samples, [("1 2\n", "3\n")])
+        self.assertEqual(problem.time_limit, 0.5)
+        self.assertEqual(problem.memory_limit, 256)
+        self.assertFalse(problem.extra_time)
+
+        problem = parse_problem(1000, "<html></html>")
+        self.assertEqual(problem.samples, [])
+        self.assertIsNone(problem.time_limit)
+        self.assertIsNone(problem.memory_limit)
+        self.assertTrue(problem.extra_time)
+
+    def test_parse_problem_samples(self):
+        page = "".join(
+            f'<section id="sampleinput{i}"><pre id="sample-input-{i}">{i} &lt;&amp;'
+            f'</pre></section><pre id="sample-output-{i}">{i}</pre>'
+            for i in range(12, 0, -1)
+        )
+        page += '<section id="source"></section><pre id="sample-input-13">'
+        problem = parse_problem(1000, page, chunk_size=7)
+        self.assertEqual(problem.samples, [(f"{i} <&", str(i)) for i in range(1, 13)])
+
+    def test_fetch_problem_base_url(self):
+        server = HTTPServer(("127.0.0.1", 0), ProblemHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            problem = fetch_problem(1000, url=url)
+            self.assertEqual(problem.samples, [("1 2\n", "3\n")])
+            os.environ["BOJ_CHECKER_BASE_URL"] = url + "/"
+            try:
+                problem = fetch_problem(1000)
+            finally:
+                del os.environ["BOJ_CHECKER_BASE_URL"]
+            self.assertEqual(problem.memory_limit, 256)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_fetch_problem_error(self):
+        server = HTTPServer(("127.0.0.1", 0), ProblemHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with self.assertRaises(requests.HTTPError):
+                fetch_problem(9999, url=url)
+            with self.assertRaises(requests.HTTPError):
+                fetch_problem(1001, url=url)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                cache = SampleCache(Path(temp_dir) / "samples.db", ttl=0)
+                cache.put(1001, [("1\n", "1\n")], '"etag"', None, 1.0, 128, True)
+                cache.put(9999, [("2\n", "2\n")], None, None, 1.0, 128, True)
+                problem = fetch_problem(1001, cache, url=url)
+                self.assertEqual(problem.samples, [("1\n", "1\n")])
+                problem = fetch_problem(9999, cache, url=url)
+                self.assertEqual(problem.samples, [("2\n", "2\n")])
+                self.assertEqual(cache.get(1001).samples, [("1\n", "1\n")])
+        finally:
+            server.shutdown()
+            server.server_close()
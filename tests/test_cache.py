@@ -0,0 +1,91 @@
+from pathlib import Path
+from boj_checker.boj_parser import fetch_sample_io
+from boj_checker.cache import ArtifactCache, SampleCache
+
+import os
+import tempfile
+import unittest
+
+
+class TestSampleCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "samples.db"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_get(self):
+        cache = SampleCache(self.db_path)
+        self.assertIsNone(cache.get(1000))
+        cache.put(1000, [("1 2\n", "3\n")], '"etag"', None)
+        entry = cache.get(1000)
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.samples, [("1 2\n", "3\n")])
+        self.assertEqual(entry.etag, '"etag"')
+        self.assertIsNone(entry.last_modified)
+        self.assertTrue(cache.is_fresh(entry))
+        self.assertEqual(SampleCache(self.db_path).get(1000), entry)
+
+    def test_ttl(self):
+        cache = SampleCache(self.db_path, ttl=0)
+        cache.put(1000, [("1 2\n", "3\n")])
+        self.assertFalse(cache.is_fresh(cache.get(1000)))
+
+    def test_offline(self):
+        cache = SampleCache(self.db_path, ttl=0)
+        with self.assertRaises(LookupError):
+            fetch_sample_io(1000, cache, offline=True)
+        cache.put(1000, [("1 2\n", "3\n")])
+        self.assertEqual(fetch_sample_io(1000, cache, offline=True), [("1 2\n", "3\n")])
+
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name) / "artifacts"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_entry(self, cache: ArtifactCache, key: str, size: int) -> Path:
+        staging_dir = cache.staging_dir()
+        with open(staging_dir / "a.out", "wb") as f:
+            f.write(b"\0" * size)
+        return cache.store(key, staging_dir)
+
+    def test_store_lookup(self):
+        cache = ArtifactCache(self.root)
+        self.assertIsNone(cache.lookup("key"))
+        entry_path = self.make_entry(cache, "key", 16)
+        self.assertEqual(cache.lookup("key"), entry_path)
+        self.assertTrue((entry_path / "a.out").exists())
+
+    def test_evict(self):
+        cache = ArtifactCache(self.root, max_size=100)
+        self.make_entry(cache, "first", 40)
+        self.make_entry(cache, "second", 40)
+        os.utime(self.root / "first", (0, 0))
+        os.utime(self.root / "second", (1, 1))
+        cache.lookup("first")
+        self.make_entry(cache, "third", 40)
+        self.assertIsNotNone(cache.lookup("first"))
+        self.assertIsNone(cache.lookup("second"))
+        self.assertIsNotNone(cache.lookup("third"))
+
+    def test_evict_in_use(self):
+        cache = ArtifactCache(self.root, max_size=100)
+        self.make_entry(cache, "first", 40)
+        self.make_entry(cache, "second", 40)
+        os.utime(self.root / "first", (0, 0))
+        os.utime(self.root / "second", (1, 1))
+        use_file = cache.acquire("first")
+        self.make_entry(cache, "third", 40)
+        self.assertIsNotNone(cache.lookup("first"))
+        self.assertIsNone(cache.lookup("second"))
+        use_file.close()
+        os.utime(self.root / "first", (0, 0))
+        self.make_entry(cache, "fourth", 40)
+        self.assertIsNone(cache.lookup("first"))
+        self.assertIsNotNone(cache.lookup("third"))
+        self.assertFalse((self.root / ".use-first").exists())
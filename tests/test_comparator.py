@@ -0,0 +1,49 @@
+from boj_checker.comparator import CapturedOutput, OutputComparator
+
+import io
+import unittest
+
+
+class TestComparator(unittest.TestCase):
+    def compare(self, expected: str, chunks) -> OutputComparator:
+        comparator = OutputComparator(expected)
+        for chunk in chunks:
+            comparator.feed(chunk)
+        comparator.finish()
+        return comparator
+
+    def test_chunks(self):
+        self.assertTrue(self.compare("1 2\n3 4\n", [b"1 ", b"2\n3", b" 4"]).matched)
+        self.assertTrue(self.compare("1\n\n2\n", [b"1\n", b"\n", b"2\n\n\n"]).matched)
+        self.assertTrue(self.compare("1\r\n2\r\n", [b"1  \r\n2"]).matched)
+        comparator = self.compare("1\n2\n3\n", [b"1\n", b"5\n", b"3\n"])
+        self.assertFalse(comparator.matched)
+        self.assertEqual(comparator.mismatch_line, 2)
+
+    def test_line_count(self):
+        comparator = self.compare("1\n2\n", [b"1\n"])
+        self.assertFalse(comparator.matched)
+        self.assertEqual(comparator.mismatch_line, 2)
+        comparator = self.compare("1\n", [b"1\n2\n"])
+        self.assertFalse(comparator.matched)
+        self.assertEqual(comparator.mismatch_line, 2)
+        self.assertFalse(self.compare("1\n", [b"1\n\n2"]).matched)
+
+    def test_expected_file(self):
+        comparator = OutputComparator(io.BytesIO(b"1\r\n2  \n\n"))
+        comparator.feed(b"1\n2\n")
+        self.assertTrue(comparator.finish())
+        comparator = OutputComparator(io.BytesIO(b"1\n2\n3\n4\n"))
+        comparator.feed(b"1\n2\n")
+        comparator.feed(b"3\n5\n")
+        self.assertFalse(comparator.finish())
+        self.assertEqual(comparator.mismatch_line, 4)
+
+    def test_captured_output(self):
+        output = CapturedOutput(max_memory=4)
+        output.write(b"1 2\r\n")
+        output.write(b"3 4\n5")
+        self.assertEqual(output.size, 10)
+        self.assertEqual(output.read(), "1 2\r\n3 4\n5")
+        self.assertListEqual(list(output.lines()), ["1 2", "3 4", "5"])
+        output.close()
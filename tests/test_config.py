@@ -1,5 +1,5 @@
 from pathlib import Path
-from boj_checker.config import LanguageConfig
+from boj_checker.config import CheckerConfig, LanguageConfig
 
 import unittest
 
@@ -47,3 +47,38 @@ class TestConfig(unittest.TestCase):
             langcfg2.run_command(Path("./t.cc"), Path("./a.out")),
             [str(Path("./a.out").absolute())],
         )
+
+    def test_profiles(self):
+        config = CheckerConfig("""{
+                "language_configs": [],
+                "profiles": [
+                    {
+                        "extension": "cc",
+                        "name": "O3",
+                        "config": {
+                            "language_type": "compiled",
+                            "compile_command": ["g++", "{source_path}", "-O3"],
+                            "run_command": ["{exec_path}"]
+                        }
+                    },
+                    {
+                        "extension": "py",
+                        "name": "pypy",
+                        "config": {
+                            "language_type": "scripted",
+                            "compile_command": [],
+                            "run_command": ["pypy3", "{source_path}"]
+                        }
+                    }
+                ]
+            }""")
+        self.assertEqual(sorted(config.profile_table), ["cc", "py"])
+        self.assertEqual(
+            config.profile_table["cc"]["O3"].compile_command_template,
+            ["g++", "{source_path}", "-O3"],
+        )
+        self.assertEqual(
+            config.profile_table["py"]["pypy"].run_command_template,
+            ["pypy3", "{source_path}"],
+        )
+        self.assertEqual(CheckerConfig.fromdefault().profile_table, dict())
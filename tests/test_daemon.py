@@ -0,0 +1,99 @@
+from pathlib import Path
+from boj_checker.cache import SampleCache
+from boj_checker.cli import EXIT_ERROR, client_main
+from boj_checker.config import CheckerConfig
+from boj_checker.daemon import (
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    NO_CASES,
+    NOT_CACHED,
+    UNKNOWN_LANGUAGE,
+    CheckerDaemon,
+    RPCError,
+    call,
+)
+
+from contextlib import redirect_stdout
+
+import io
+import tempfile
+import threading
+import unittest
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        cache = SampleCache(self.temp_path / "samples.db")
+        cache.put(
+            1000, [("1 2\n", "3\n"), ("2 2\n", "4\n")], time_limit=2, memory_limit=128
+        )
+        cache.put(1001, [], time_limit=2, memory_limit=128)
+        self.socket_path = self.temp_path / "daemon.sock"
+        self.daemon = CheckerDaemon(
+            CheckerConfig.fromdefault(),
+            self.socket_path,
+            self.temp_path,
+            use_cache=False,
+            use_pch=False,
+            jobs=2,
+            sample_cache=cache,
+        )
+        self.thread = threading.Thread(target=self.daemon.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        call(self.socket_path, "shutdown")
+        self.thread.join()
+        self.daemon.close()
+        self.temp_dir.cleanup()
+
+    def test_ping(self):
+        self.assertEqual(call(self.socket_path, "ping"), "pong")
+        with self.assertRaises(RPCError) as context:
+            call(self.socket_path, "unknown")
+        self.assertEqual(context.exception.code, METHOD_NOT_FOUND)
+        with self.assertRaises(RPCError) as context:
+            call(self.socket_path, "ping", {"unknown": 1})
+        self.assertEqual(context.exception.code, INVALID_PARAMS)
+
+    def test_check(self):
+        source = self.temp_path / "solution.py"
+        source.write_text(
+            "a, b = map(int, input().split())\nprint(a + b if a == 1 else a * b + 1)\n"
+        )
+        params = {"problem_id": 1000, "filepath": str(source), "offline": True}
+        result = call(self.socket_path, "check", params)
+        self.assertEqual(result["time_limit"], 2 * 3 + 2)
+        self.assertEqual(
+            [(x["name"], x["verdict"]) for x in result["cases"]],
+            [("sample #1", "AC"), ("sample #2", "WA")],
+        )
+        self.assertEqual(result["cases"][0]["diff"], None)
+        self.assertIn("- 5", result["cases"][1]["diff"])
+
+        with self.assertRaises(RPCError) as context:
+            call(self.socket_path, "check", dict(params, problem_id=1002))
+        self.assertEqual(context.exception.code, NOT_CACHED)
+        with self.assertRaises(RPCError) as context:
+            call(self.socket_path, "check", dict(params, filepath="solution.xyz"))
+        self.assertEqual(context.exception.code, UNKNOWN_LANGUAGE)
+
+    def test_check_no_cases(self):
+        source = self.temp_path / "solution.py"
+        source.write_text("print(1)\n")
+        with self.assertRaises(RPCError) as context:
+            call(
+                self.socket_path,
+                "check",
+                {"problem_id": 1001, "filepath": str(source), "offline": True},
+            )
+        self.assertEqual(context.exception.code, NO_CASES)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            exit_code = client_main(
+                ["1001", str(source), "--offline", "--socket", str(self.socket_path)]
+            )
+        self.assertEqual(exit_code, EXIT_ERROR)
+        self.assertIn("No cases to run for problem 1001", output.getvalue())
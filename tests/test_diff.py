@@ -0,0 +1,38 @@
+from boj_checker.diff import diff_opcodes, first_difference, render_diff
+
+import random
+import unittest
+
+
+class TestDiff(unittest.TestCase):
+    def test_first_difference(self):
+        self.assertEqual(first_difference(["1", "2"], ["1", "3"]), 1)
+        self.assertEqual(first_difference(["1", "2"], ["1", "2", "3"]), 2)
+        self.assertEqual(first_difference([], ["1"]), 0)
+
+    def test_diff_opcodes(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            a = [str(rng.randint(0, 3)) for _ in range(rng.randint(0, 12))]
+            b = [str(rng.randint(0, 3)) for _ in range(rng.randint(0, 12))]
+            i, j = 0, 0
+            patched = []
+            for tag, i1, i2, j1, j2 in diff_opcodes(a, b):
+                self.assertEqual((i1, j1), (i, j))
+                if tag == "equal":
+                    self.assertListEqual(a[i1:i2], b[j1:j2])
+                patched.extend(b[j1:j2])
+                i, j = i2, j2
+            self.assertEqual((i, j), (len(a), len(b)))
+            self.assertListEqual(patched, b)
+
+    def test_render_diff(self):
+        a = [str(x) for x in range(100000)]
+        b = list(a)
+        b[50000] = "x"
+        self.assertListEqual(
+            list(render_diff(a, b, context=1)),
+            ["@@ -50000,3 +50000,3 @@", "  49999", "- 50000", "+ x", "  50001"],
+        )
+        c = [str(-x) for x in range(1, 100000)]
+        self.assertEqual(len(list(render_diff(a, c, max_lines=10))), 11)
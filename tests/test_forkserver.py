@@ -0,0 +1,52 @@
+from pathlib import Path
+from boj_checker.forkserver import ForkServer, supported_interpreter
+from boj_checker.runner import Executable, run_executable
+
+import sys
+import tempfile
+import unittest
+
+
+class TestForkServer(unittest.TestCase):
+    def test_supported_interpreter(self):
+        self.assertTrue(supported_interpreter(["python3", "a.py"]))
+        self.assertTrue(supported_interpreter(["/usr/bin/pypy3", "a.py"]))
+        self.assertFalse(supported_interpreter(["python3", "-O", "a.py"]))
+        self.assertFalse(supported_interpreter(["ruby", "a.rb"]))
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as temp_dir, ForkServer(
+            [sys.executable]
+        ) as fork_server:
+            script = Path(temp_dir) / "a.py"
+            script.write_text(
+                "import sys\n"
+                "print(__name__, sys.argv[1:], input()[::-1])\n"
+                "sys.exit(int(sys.argv[1]))\n"
+            )
+            executable = Executable(
+                [sys.executable, str(script), "3"], None, fork_server=fork_server
+            )
+            result = run_executable(executable, "abc\n")
+            self.assertEqual(result.output.read(), "__main__ ['3'] cba\n")
+            self.assertEqual(result.exit_code, 3)
+            self.assertTrue(result.warm_start)
+
+            script.write_text("while True: pass\n")
+            executable = Executable(
+                [sys.executable, str(script)], None, fork_server=fork_server
+            )
+            result = run_executable(executable, "", time_limit=0.5)
+            self.assertTrue(result.timed_out)
+
+            script.write_text("raise ValueError\n")
+            result = run_executable(executable, "", discard_stderr=True)
+            self.assertEqual(result.exit_code, 1)
+
+            script.write_text("import random\nprint(random.random())\n")
+            outputs = set()
+            for _ in range(2):
+                result = run_executable(executable, "")
+                outputs.add(result.output.read())
+                result.output.close()
+            self.assertEqual(len(outputs), 2)
@@ -0,0 +1,72 @@
+from pathlib import Path
+from boj_checker.config import LanguageConfig
+from boj_checker.history import RunHistory, language_config_key
+
+import tempfile
+import unittest
+
+
+def case(verdict: str, wall_time: float, max_rss: int) -> dict:
+    return {
+        "name": "sample",
+        "verdict": verdict,
+        "wall_time": wall_time,
+        "max_rss": max_rss,
+    }
+
+
+class TestRunHistory(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "history.db"
+        self.source = Path(self.temp_dir.name) / "a.py"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_record_entries(self):
+        history = RunHistory(self.db_path)
+        history.record(1000, self.source, "hash1", "config", [case("AC", 0.5, 100)])
+        history.record(
+            1000,
+            self.source,
+            "hash2",
+            "config",
+            [case("AC", 0.25, 300), case("WA", 0.5, 200)],
+        )
+        history.record(1001, self.source, "hash2", "config", [], compiled=False)
+        history.close()
+
+        history = RunHistory(self.db_path)
+        entries = history.entries(1000)
+        self.assertEqual([x.source_hash for x in entries], ["hash1", "hash2"])
+        self.assertTrue(entries[0].passed)
+        self.assertFalse(entries[1].passed)
+        self.assertEqual(entries[1].verdicts, ["AC", "WA"])
+        self.assertEqual(entries[1].total_time, 0.75)
+        self.assertEqual(entries[1].max_time, 0.5)
+        self.assertEqual(entries[1].max_rss, 300)
+        self.assertEqual(entries[0].source, str(self.source.resolve()))
+
+        self.assertEqual(history.entries(1001)[0].verdicts, ["CE"])
+        self.assertEqual([x.problem_id for x in history.entries(limit=2)], [1000, 1001])
+        self.assertEqual(len(history.entries(source=self.source)), 3)
+        self.assertEqual(history.entries(source=Path("b.py")), [])
+
+        history.record(1002, self.source, "hash3", "config", [])
+        self.assertEqual(history.entries(1002)[0].verdicts, [])
+        self.assertFalse(history.entries(1002)[0].passed)
+
+    def test_language_config_key(self):
+        o2 = LanguageConfig(
+            "compiled", ["g++", "-O2", "{source_path}"], ["{exec_path}"]
+        )
+        o3 = LanguageConfig(
+            "compiled", ["g++", "-O3", "{source_path}"], ["{exec_path}"]
+        )
+        self.assertEqual(language_config_key(o2), language_config_key(o2))
+        self.assertNotEqual(language_config_key(o2), language_config_key(o3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,15 @@
+from boj_checker.languageinfo import extension_lookup, language_limits
+
+import unittest
+
+
+class TestLanguageInfo(unittest.TestCase):
+    def test_language_limits(self):
+        self.assertEqual(language_limits(extension_lookup["cc"], 1, 128), (1, 128))
+        self.assertEqual(language_limits(extension_lookup["py"], 1, 128), (5, 288))
+        self.assertEqual(
+            language_limits(extension_lookup["java"], 1, 128, False), (1, 128)
+        )
+        self.assertEqual(
+            language_limits(extension_lookup["java"], None, None), (None, None)
+        )
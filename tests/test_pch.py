@@ -0,0 +1,80 @@
+from pathlib import Path
+from boj_checker.cache import ArtifactCache
+from boj_checker.config import LanguageConfig
+from boj_checker.languageinfo import judge_extension_lookup
+from boj_checker.pch import (
+    header_flags,
+    precompiled_header_dir,
+    uses_precompiled_header,
+    with_include_dir,
+)
+
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class TestPrecompiledHeader(unittest.TestCase):
+    def test_uses_precompiled_header(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "a.cc"
+            source.write_text("#include <bits/stdc++.h>\nint main() {}\n")
+            self.assertTrue(uses_precompiled_header(source))
+            source.write_text("#include <iostream>\n// <bits/stdc++.h>\n")
+            self.assertFalse(uses_precompiled_header(source))
+
+    @unittest.skipIf(shutil.which("g++") == None, "g++ is not installed")
+    def test_header_flags(self):
+        config = LanguageConfig(
+            "compiled",
+            ["g++", "-O2", "{source_path}", "-o", "{exec_path}", "-std=c++17"],
+            ["{exec_path}"],
+        )
+        self.assertEqual(header_flags(config), ["g++", "-O2", "-std=c++17"])
+        config = LanguageConfig("scripted", [], ["python3", "{source_path}"])
+        self.assertIsNone(header_flags(config))
+        config = LanguageConfig(
+            "compiled", ["gcc", "{source_path}", "-o", "{exec_path}"], ["{exec_path}"]
+        )
+        self.assertIsNone(header_flags(config))
+
+    @unittest.skipIf(shutil.which("g++") == None, "g++ is not installed")
+    def test_header_flags_judge(self):
+        self.assertEqual(
+            header_flags(judge_extension_lookup["cc"]),
+            ["g++", "-O2", "-Wall", "-std=gnu++17", "-DONLINE_JUDGE", "-DBOJ"],
+        )
+        config = LanguageConfig(
+            "compiled",
+            ["g++", "{source_path}", "-L", "/opt/lib", "-lgmp", "-Wl,-O1", "-pipe"],
+            ["{exec_path}"],
+        )
+        self.assertEqual(header_flags(config), ["g++", "-pipe"])
+
+    @unittest.skipIf(shutil.which("g++") == None, "g++ is not installed")
+    def test_failed_build(self):
+        config = LanguageConfig(
+            "compiled",
+            ["g++", "{source_path}", "-o", "{exec_path}", "-fno-such-option"],
+            ["{exec_path}"],
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ArtifactCache(Path(temp_dir) / "pch")
+            self.assertIsNone(precompiled_header_dir(config, cache))
+            entries = [x for x in os.listdir(cache.root) if not x.startswith(".")]
+            self.assertEqual(len(entries), 1)
+            self.assertIsNone(precompiled_header_dir(config, cache))
+            self.assertEqual(
+                [x for x in os.listdir(cache.root) if not x.startswith(".")], entries
+            )
+
+    def test_with_include_dir(self):
+        config = LanguageConfig(
+            "compiled", ["g++", "{source_path}", "-o", "{exec_path}"], ["{exec_path}"]
+        )
+        config = with_include_dir(config, Path("/tmp/{pch}"))
+        self.assertEqual(
+            config.compile_command(Path("/a.cc"), Path("/a.out")),
+            ["g++", "-I", "/tmp/{pch}", "/a.cc", "-o", "/a.out"],
+        )
@@ -0,0 +1,97 @@
+from pathlib import Path
+from boj_checker.config import CheckerConfig, LanguageConfig
+from boj_checker.languageinfo import extension_lookup, judge_extension_lookup
+from boj_checker.profiles import build_profiles, lookup_profile, profile_names
+from boj_checker.runner import remove_work_dir, run_executable
+
+import json
+import sys
+import tempfile
+import unittest
+
+# A "compiler" copying the source, so that compiled profiles need no toolchain.
+COPY = LanguageConfig(
+    "compiled",
+    [
+        sys.executable,
+        "-c",
+        "import shutil, sys; shutil.copy(sys.argv[1], sys.argv[2])",
+        "{source_path}",
+        "{exec_path}",
+    ],
+    [sys.executable, "{exec_path}"],
+)
+BROKEN = LanguageConfig(
+    "compiled", [sys.executable, "-c", "raise SystemExit(1)"], ["{exec_path}"]
+)
+
+
+class TestProfiles(unittest.TestCase):
+    def setUp(self):
+        self.config = CheckerConfig(
+            json.dumps(
+                {
+                    "language_configs": [],
+                    "profiles": [
+                        {
+                            "extension": "py",
+                            "name": "copy",
+                            "config": {
+                                "language_type": COPY.language_type,
+                                "compile_command": COPY.compile_command_template,
+                                "run_command": COPY.run_command_template,
+                            },
+                        }
+                    ],
+                }
+            )
+        )
+
+    def test_lookup_profile(self):
+        source = Path("a.py")
+        self.assertIs(
+            lookup_profile(source, "default", self.config), extension_lookup["py"]
+        )
+        self.assertIs(
+            lookup_profile(source, "boj", self.config), judge_extension_lookup["py"]
+        )
+        self.assertEqual(
+            lookup_profile(source, "copy", self.config).compile_command_template,
+            COPY.compile_command_template,
+        )
+        with self.assertRaises(KeyError):
+            lookup_profile(source, "O3", self.config)
+        with self.assertRaises(NotImplementedError):
+            lookup_profile(Path("a.xyz"), "default", self.config)
+        self.assertEqual(profile_names(source, self.config), ["default", "boj", "copy"])
+        self.assertEqual(profile_names(Path("a.xyz"), self.config), ["default"])
+
+    def test_build_profiles(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "a.py"
+            source.write_text("print(input())\n")
+            builds = build_profiles(
+                source,
+                ["default", "copy", "broken"],
+                [extension_lookup["py"], COPY, BROKEN],
+                Path(temp_dir),
+            )
+            try:
+                self.assertEqual(
+                    [x.name for x in builds], ["default", "copy", "broken"]
+                )
+                self.assertIsNone(builds[0].compile_time)
+                self.assertGreater(builds[1].compile_time, 0)
+                self.assertIsNone(builds[2].executable)
+                for build in builds[:2]:
+                    result = run_executable(build.executable, "1\n", solution="1\n")
+                    self.assertEqual(result.output.read(), "1\n")
+                    result.output.close()
+            finally:
+                for build in builds:
+                    if build.executable != None:
+                        remove_work_dir(build.executable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+from boj_checker.boj_parser import Problem
+from boj_checker.check import CheckPlan
+from boj_checker.race import percentile, race
+from boj_checker.runner import Executable
+from boj_checker import testcases
+
+import sys
+import unittest
+
+PROBLEM = Problem(1000, [], None, None, True)
+CASES = [
+    testcases.TestCase("1", "1 2\n", "3\n"),
+    testcases.TestCase("2", "5 5\n", "10\n"),
+]
+
+
+def make_plan(code: str) -> CheckPlan:
+    executable = Executable([sys.executable, "-c", code], None)
+    return CheckPlan(PROBLEM, CASES, executable, None, None)
+
+
+class TestRace(unittest.TestCase):
+    def test_percentile(self):
+        values = [float(x) for x in range(1, 21)]
+        self.assertEqual(percentile(values, 0.95), 19)
+        self.assertEqual(percentile(values, 0.5), 10)
+        self.assertEqual(percentile([3.0], 0.95), 3)
+
+    def test_race(self):
+        plans = [
+            make_plan("print(sum(map(int, input().split())))"),
+            make_plan("a, b = map(int, input().split()); print(a + b + (a == 5))"),
+            make_plan("raise SystemExit(1)"),
+        ]
+        finished = []
+        results = race(plans, 2, progress=lambda x, _: finished.append(x))
+        self.assertEqual(finished, list(range(1, 13)))
+        self.assertEqual(
+            [x.verdicts for x in results],
+            [
+                ["AC", "AC"],
+                ["AC", "WA"],
+                ["RTE", "RTE"],
+            ],
+        )
+        self.assertEqual([x.passed for x in results], [True, False, False])
+        for result in results:
+            self.assertEqual(len(result.wall_times), 4)
+            self.assertLessEqual(result.min_time, result.median_time)
+            self.assertLessEqual(result.median_time, result.p95_time)
+            self.assertGreater(result.max_rss, 0)
@@ -0,0 +1,62 @@
+from pathlib import Path
+from boj_checker.report import check_report, junit_xml
+
+import unittest
+import xml.etree.ElementTree as ET
+
+
+def case(name: str, verdict: str, diff=None) -> dict:
+    return {
+        "name": name,
+        "verdict": verdict,
+        "exit_code": 0,
+        "wall_time": 0.5,
+        "max_rss": 100,
+        "diff": diff,
+    }
+
+
+class TestReport(unittest.TestCase):
+    def test_check_report(self):
+        report = check_report(1000, Path("a.py"), 1.0, 128, [case("1", "AC")])
+        self.assertTrue(report["passed"])
+        self.assertEqual(report["source"], "a.py")
+        report = check_report(1000, Path("a.py"), 1.0, 128, [case("1", "TLE")])
+        self.assertFalse(report["passed"])
+        report = check_report(1000, Path("a.py"), None, None, [], "Compilation Error")
+        self.assertFalse(report["passed"])
+        report = check_report(1000, Path("a.py"), 1.0, 128, [])
+        self.assertFalse(report["passed"])
+        self.assertEqual(report["error"], "No cases to run")
+
+    def test_junit_xml(self):
+        reports = [
+            check_report(
+                1000,
+                Path("a.py"),
+                1.0,
+                128,
+                [case("1", "AC"), case("2", "WA", ["- 2", "+ 3"]), case("3", "RTE")],
+            ),
+            check_report(1001, Path("b.cc"), None, None, [], "Compilation Error"),
+            check_report(1002, Path("c.py"), None, None, [], "Unknown language"),
+        ]
+        root = ET.fromstring(junit_xml(reports))
+        suites = root.findall("testsuite")
+        self.assertEqual(len(suites), 3)
+        self.assertEqual(suites[0].get("name"), "1000/a.py")
+        self.assertEqual(suites[0].get("tests"), "3")
+        self.assertEqual(suites[0].get("failures"), "1")
+        self.assertEqual(suites[0].get("errors"), "1")
+        failure = suites[0].find("testcase[@name='2']/failure")
+        self.assertEqual(failure.text, "- 2\n+ 3")
+        for suite, message in zip(
+            suites[1:], ["Compilation Error", "Unknown language"]
+        ):
+            self.assertEqual(suite.get("errors"), "1")
+            error = suite.find("testcase[@name='setup']/error")
+            self.assertEqual(error.get("message"), message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,22 @@
-from boj_checker.runner import check_output
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from boj_checker.cache import ArtifactCache
+from boj_checker.config import LanguageConfig
+from boj_checker.runner import (
+    CancelToken,
+    Executable,
+    artifact_key,
+    check_output,
+    compile_source_file,
+    judge,
+    remove_work_dir,
+    run_executable,
+    run_executable_parallel,
+)
 
+import sys
+import tempfile
+import threading
 import unittest
 
 
@@ -11,5 +28,164 @@ class TestRunner(unittest.TestCase):
         self.assertFalse(check_output("1 1\n", "1 2"))
         self.assertTrue(check_output("1\r\n2 3\r\n", "1\n2 3"))
         self.assertTrue(check_output("1\r\n2 3\r\n", "1\n2 3\n"))
+        self.assertFalse(check_output("1\r\n2 3\r\n", "1\n"))
+        self.assertFalse(check_output("1\r\n", "1\n2 3\n"))
         self.assertFalse(check_output("1\r\n2 3\r\n", "1\n 2 3\n"))
         self.assertFalse(check_output("1\r\n2 3\r\n", " 1\n2 3\n"))
+
+    def test_artifact_key(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_path = Path(temp_dir) / "main.c"
+            source_path.write_text("int main() { return 0; }\n")
+            gcc = LanguageConfig(
+                "compiled",
+                ["gcc", "{source_path}", "-o", "{exec_path}"],
+                ["{exec_path}"],
+            )
+            gcc_o2 = LanguageConfig(
+                "compiled",
+                ["gcc", "-O2", "{source_path}", "-o", "{exec_path}"],
+                ["{exec_path}"],
+            )
+            key = artifact_key(source_path, gcc)
+            self.assertEqual(key, artifact_key(source_path, gcc))
+            self.assertNotEqual(key, artifact_key(source_path, gcc_o2))
+            source_path.write_text("int main() { return 1; }\n")
+            self.assertNotEqual(key, artifact_key(source_path, gcc))
+
+    def test_run_executable_parallel(self):
+        executable = Executable([sys.executable, "-c", "print(input()[::-1])"], None)
+        inputs = [f"{i}abc\n" for i in range(8)]
+        results = list(run_executable_parallel(executable, inputs, 4))
+        self.assertListEqual(
+            [(x.output.read(), x.exit_code) for x in results],
+            [(f"cba{i}\n", 0) for i in range(8)],
+        )
+
+    def test_run_executable_time_limit(self):
+        executable = Executable([sys.executable, "-c", "while True: pass"], None)
+        result = run_executable(executable, "", time_limit=0.5)
+        self.assertTrue(result.timed_out)
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertEqual(judge("", result), "TLE")
+        self.assertGreater(result.user_time + result.sys_time, 0)
+
+        executable = Executable([sys.executable, "-c", "print(input())"], None)
+        result = run_executable(executable, "1\n", time_limit=10)
+        self.assertFalse(result.timed_out)
+        self.assertGreater(result.max_rss, 0)
+        self.assertEqual(judge("1", result), "AC")
+        self.assertEqual(judge("2", result), "WA")
+
+    def test_run_executable_cancel(self):
+        executable = Executable([sys.executable, "-c", "while True: pass"], None)
+        cancel = CancelToken()
+        threading.Timer(0.3, cancel.cancel).start()
+        result = run_executable(executable, "", time_limit=10, cancel=cancel)
+        self.assertFalse(result.timed_out)
+        self.assertLess(result.wall_time, 5)
+
+        result = run_executable(executable, "", time_limit=10, cancel=cancel)
+        self.assertLess(result.wall_time, 5)
+        self.assertNotEqual(result.exit_code, 0)
+
+    def test_judge_limits(self):
+        executable = Executable([sys.executable, "-c", "print(input())"], None)
+        result = run_executable(executable, "1\n", time_limit=10, memory_limit=1024)
+        self.assertEqual(judge("1", result, 10, 1024), "AC")
+        self.assertEqual(judge("1", result, 10, 1), "MLE")
+        self.assertEqual(judge("1", result, 0.0001, 1024), "TLE")
+
+    def test_run_executable_output(self):
+        executable = Executable([sys.executable, "-c", "print('1\\n2\\n3')"], None)
+        result = run_executable(executable, "", solution="1\n2\n3\n")
+        self.assertTrue(result.matched)
+        self.assertEqual(judge("", result), "AC")
+        result = run_executable(executable, "", solution="1\n2\n")
+        self.assertFalse(result.matched)
+        self.assertEqual(judge("", result), "WA")
+
+        executable = Executable(
+            [sys.executable, "-c", "while True: print('0' * 1000)"], None
+        )
+        result = run_executable(executable, "", solution="0", output_limit=1 << 20)
+        self.assertTrue(result.output_limit_exceeded)
+        self.assertLessEqual(result.output.size, 1 << 20)
+        self.assertEqual(judge("0", result), "OLE")
+
+    def test_run_executable_files(self):
+        executable = Executable(
+            [
+                sys.executable,
+                "-c",
+                "import sys; print(sum(map(int, sys.stdin.read().split())))",
+            ],
+            None,
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = Path(temp_dir) / "1.in"
+            output_path = Path(temp_dir) / "1.out"
+            input_path.write_text("1 2\n3 4\n")
+            output_path.write_text("10\n")
+            result = run_executable(executable, input_path, solution=output_path)
+            self.assertTrue(result.matched)
+            self.assertEqual(judge(output_path, result), "AC")
+            result = run_executable(executable, input_path)
+            self.assertEqual(judge(output_path, result), "AC")
+            self.assertEqual(judge(None, result), "OK")
+
+    def test_compile_concurrently(self):
+        # Copies the source as the binary, logging each compilation.
+        compile_script = (
+            "import shutil, sys, time\n"
+            "open(sys.argv[3], 'a').write('compiled\\n')\n"
+            "time.sleep(0.2)\n"
+            "shutil.copy(sys.argv[1], sys.argv[2])\n"
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            log_path = temp_path / "compile.log"
+            table = {
+                "pyc": LanguageConfig(
+                    "compiled",
+                    [
+                        sys.executable,
+                        "-c",
+                        compile_script,
+                        "{source_path}",
+                        "{exec_path}",
+                        str(log_path),
+                    ],
+                    [sys.executable, "{exec_path}"],
+                )
+            }
+            source = temp_path / "a.pyc"
+            source.write_text("print(input()[::-1])\n")
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                executables = list(
+                    executor.map(
+                        lambda _: compile_source_file(source, table, temp_path),
+                        range(4),
+                    )
+                )
+            self.assertEqual(len({x.work_dir for x in executables}), 4)
+            for executable in executables:
+                self.assertEqual(
+                    run_executable(executable, "abc\n").output.read(), "cba\n"
+                )
+                remove_work_dir(executable)
+                self.assertFalse(executable.work_dir.exists())
+
+            log_path.unlink()
+            cache = ArtifactCache(temp_path / "artifacts")
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                executables = list(
+                    executor.map(
+                        lambda _: compile_source_file(source, table, None, cache),
+                        range(4),
+                    )
+                )
+            self.assertEqual(log_path.read_text(), "compiled\n")
+            self.assertEqual(len({tuple(x.command) for x in executables}), 1)
+            self.assertIsNone(executables[0].work_dir)
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import os
+import subprocess
+import sys
+import unittest
+
+# Import time budget of the CLI in milliseconds, excluding the interpreter's
+# own startup. It is about a third of this on a typical machine, leaving room
+# for slow ones.
+IMPORT_TIME_BUDGET = 100
+# Modules that take long to import or are only needed on some code paths, and
+# must not be imported with the CLI.
+LAZY_MODULES = [
+    "requests",
+    "difflib",
+    "concurrent.futures",
+    "hashlib",
+    "socket",
+    "sqlite3",
+    "boj_checker.batch",
+    "boj_checker.bench",
+    "boj_checker.cache",
+    "boj_checker.check",
+    "boj_checker.daemon",
+    "boj_checker.forkserver",
+    "boj_checker.history",
+    "boj_checker.pch",
+    "boj_checker.profiles",
+    "boj_checker.race",
+    "boj_checker.runner",
+    "boj_checker.stress",
+    "boj_checker.sync",
+    "boj_checker.watch",
+]
+
+
+def import_cli(*options: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    src_dir = str(Path(__file__).resolve().parent.parent / "src")
+    env["PYTHONPATH"] = os.pathsep.join(
+        x for x in [src_dir, env.get("PYTHONPATH")] if x
+    )
+    return subprocess.run(
+        [
+            sys.executable,
+            *options,
+            "-c",
+            "import sys, boj_checker.cli; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+class TestStartup(unittest.TestCase):
+    def test_lazy_modules(self):
+        modules = import_cli().stdout.split()
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, modules)
+
+    def test_import_time(self):
+        # Lines of -X importtime read "import time: self | cumulative | name",
+        # with names indented by nesting level. The cumulative time of the top
+        # level import of boj_checker.cli covers everything it pulls in.
+        stderr = import_cli("-X", "importtime").stderr
+        total = None
+        for line in stderr.splitlines():
+            _, cumulative, name = line.split("|")
+            if name == " boj_checker.cli":
+                total = int(cumulative) / 1000
+        self.assertNotEqual(total, None)
+        self.assertLess(total, IMPORT_TIME_BUDGET)
@@ -0,0 +1,100 @@
+from boj_checker.cli import EXIT_ERROR, stress_main
+from boj_checker.runner import Executable
+from boj_checker.stress import StressCase, shrink_case, stress_test
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+
+GENERATOR = Executable(
+    [
+        sys.executable,
+        "-c",
+        "import sys; n = int(sys.argv[1]); print(*range(n % 7), sep='\\n')",
+    ],
+    None,
+)
+REFERENCE = Executable(
+    [
+        sys.executable,
+        "-c",
+        "import sys; print(sum(map(int, sys.stdin.read().split())))",
+    ],
+    None,
+)
+SOLUTION = Executable(
+    [
+        sys.executable,
+        "-c",
+        "import sys; xs = list(map(int, sys.stdin.read().split())); "
+        "print(sum(xs) + (5 in xs))",
+    ],
+    None,
+)
+
+
+class TestStress(unittest.TestCase):
+    def test_stress_test(self):
+        self.assertEqual(stress_test(GENERATOR, REFERENCE, REFERENCE, 10, 4), None)
+        case = stress_test(GENERATOR, REFERENCE, SOLUTION, 20, 4)
+        self.assertEqual(case.seed, 6)
+        self.assertEqual(case.verdict, "WA")
+        self.assertEqual(case.expected, "15\n")
+
+    def test_stress_test_failing_generator(self):
+        generator = Executable([sys.executable, "-c", "exit(1)"], None)
+        case = stress_test(generator, REFERENCE, SOLUTION, 5)
+        self.assertEqual(case.verdict, "GEN")
+
+    def test_shrink_case(self):
+        case = StressCase(1, "1\n2\n5\n3\n4\n", "15\n", "16\n", "WA")
+        shrunk = shrink_case(REFERENCE, SOLUTION, case)
+        self.assertEqual(shrunk.input, "5\n")
+        self.assertEqual(shrunk.verdict, "WA")
+
+    def test_stress_main_missing_compiler(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.json"
+            config_file.write_text(
+                json.dumps(
+                    {
+                        "language_configs": [
+                            {
+                                "extension": "nocc",
+                                "config": {
+                                    "language_type": "compiled",
+                                    "compile_command": [
+                                        "boj-checker-no-such-compiler",
+                                        "{source_path}",
+                                    ],
+                                    "run_command": ["{exec_path}"],
+                                },
+                            }
+                        ]
+                    }
+                )
+            )
+            generator = Path(temp_dir) / "gen.py"
+            generator.write_text("print(1)\n")
+            solution = Path(temp_dir) / "a.nocc"
+            solution.write_text("")
+            output = io.StringIO()
+            with redirect_stdout(output):
+                exit_code = stress_main(
+                    [
+                        str(generator),
+                        str(generator),
+                        str(solution),
+                        "--config-file",
+                        str(config_file),
+                        "--no-cache",
+                        "--temp-directory",
+                        temp_dir,
+                    ]
+                )
+        self.assertEqual(exit_code, EXIT_ERROR)
+        self.assertIn(f"Could not compile {solution}", output.getvalue())
@@ -0,0 +1,35 @@
+from pathlib import Path
+from boj_checker.cache import SampleCache
+from boj_checker.sync import RateLimiter, parse_problem_ids, sync_problems
+
+import tempfile
+import time
+import unittest
+
+
+class TestSync(unittest.TestCase):
+    def test_parse_problem_ids(self):
+        self.assertEqual(parse_problem_ids(["1000"]), [1000])
+        self.assertEqual(
+            parse_problem_ids(["1002-1004", "1000", "1003"]), [1002, 1003, 1004, 1000]
+        )
+        with self.assertRaises(ValueError):
+            parse_problem_ids(["1004-1002"])
+        with self.assertRaises(ValueError):
+            parse_problem_ids(["abc"])
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(50)
+        start_time = time.monotonic()
+        for _ in range(6):
+            limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.1)
+
+    def test_sync_skips_fresh(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = SampleCache(Path(temp_dir) / "samples.db")
+            cache.put(1000, [("1 2\n", "3\n")])
+            result = sync_problems([1000], cache)
+            self.assertEqual(result.skipped, [1000])
+            self.assertEqual(result.synced, [])
+            self.assertEqual(result.failed, [])
@@ -0,0 +1,27 @@
+from pathlib import Path
+from boj_checker.testcases import discover_tests, sample_cases
+
+import tempfile
+import unittest
+
+
+class TestTestCases(unittest.TestCase):
+    def test_sample_cases(self):
+        cases = list(sample_cases([("1 2\n", "3\n"), ("3 4\n", "7\n")]))
+        self.assertListEqual([x.name for x in cases], ["sample #1", "sample #2"])
+        self.assertEqual(cases[1].input, "3 4\n")
+        self.assertEqual(cases[1].output, "7\n")
+
+    def test_discover_tests(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            directory = Path(temp_dir)
+            for name in ["10", "2", "max"]:
+                (directory / f"{name}.in").write_text("1 2\n")
+            for name in ["10", "2"]:
+                (directory / f"{name}.out").write_text("3\n")
+            (directory / "notes.txt").write_text("")
+            cases = list(discover_tests(directory))
+            self.assertListEqual([x.name for x in cases], ["2", "10", "max"])
+            self.assertEqual(cases[0].input, directory / "2.in")
+            self.assertEqual(cases[0].output, directory / "2.out")
+            self.assertIsNone(cases[2].output)
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from boj_checker import tracing
+from boj_checker.runner import Executable, run_executable
+
+import json
+import sys
+import tempfile
+import unittest
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self):
+        tracing.stop_tracing()
+
+    def test_disabled(self):
+        tracer = tracing.start_tracing()
+        tracing.stop_tracing()
+        with tracing.span("compile", "runner", source="a.cc"):
+            pass
+        tracing.add_span("run", "runner", 0.0, 1.0)
+        self.assertEqual(tracer.events, [])
+
+    def test_spans(self):
+        tracer = tracing.start_tracing()
+        with tracing.span("check", "cli"):
+            for _ in range(2):
+                with tracing.span("compile", "runner", source="a.cc"):
+                    pass
+        tracing.add_span("run", "runner", 0.0, 0.0, pid=1)
+        events = tracer.events
+        self.assertEqual(
+            [x["name"] for x in events], ["compile", "compile", "check", "run"]
+        )
+        self.assertEqual(events[0]["args"], {"source": "a.cc"})
+        check = events[2]
+        for event in events[:2]:
+            self.assertGreaterEqual(event["ts"], check["ts"])
+            self.assertLessEqual(event["ts"] + event["dur"], check["ts"] + check["dur"])
+
+        stats = {x.name: x for x in tracer.summary()}
+        self.assertEqual(stats["compile"].count, 2)
+        self.assertEqual(stats["check"].count, 1)
+        self.assertEqual(tracer.summary()[0].name, "check")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "trace.json"
+            tracer.write(path)
+            with open(path) as f:
+                trace = json.load(f)
+        phases = [x["ph"] for x in trace["traceEvents"]]
+        self.assertEqual(phases.count("X"), 4)
+        self.assertIn("M", phases)
+
+    def test_run_executable(self):
+        tracer = tracing.start_tracing()
+        executable = Executable([sys.executable, "-c", "print(input())"], None)
+        result = run_executable(executable, "1\n", solution="1\n")
+        result.output.close()
+        names = [x["name"] for x in tracer.events]
+        for name in ["spawn", "run", "read output"]:
+            self.assertIn(name, names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+from pathlib import Path
+from boj_checker.watch import FileWatcher, watch_source
+
+import tempfile
+import threading
+import time
+import unittest
+
+
+class TestWatch(unittest.TestCase):
+    def test_file_watcher(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "a.py"
+            path.write_text("print(1)\n")
+            with FileWatcher(path, 0.05) as watcher:
+                self.assertFalse(watcher.wait(0.2))
+                (Path(temp_dir) / "b.py").write_text("print(2)\n")
+                self.assertFalse(watcher.wait(0.2))
+                path.write_text("print(3)\n")
+                self.assertTrue(watcher.wait(1))
+
+    def test_watch_source(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "a.py"
+            path.write_text("print(1)\n")
+            stop = threading.Event()
+
+            def edit():
+                time.sleep(0.3)
+                # A burst of writes, and a save not changing the content.
+                for i in range(5):
+                    path.write_text(f"print({i})\n")
+                time.sleep(0.5)
+                path.write_text("print(4)\n")
+                time.sleep(0.5)
+                path.write_text("print(5)\n")
+                time.sleep(0.5)
+                stop.set()
+
+            thread = threading.Thread(target=edit)
+            thread.start()
+            dirnames = list(watch_source(path, 0.1, stop, 0.05))
+            thread.join()
+            self.assertEqual(len(dirnames), 3)
+            self.assertEqual(len(set(dirnames)), 3)
+            self.assertTrue(all(x.startswith("a.py-") for x in dirnames))